@@ -0,0 +1,35 @@
+# migrations/env.py
+from alembic import context
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, pool
+
+from src.core.schema import SCHEMA_REVISION, store_schema_fingerprint
+from src.db import DATABASE_URL, Base
+import src.models  # noqa: F401  (registra las tablas en Base.metadata para --autogenerate)
+
+config = context.config
+target_metadata = Base.metadata
+
+def run_migrations_online() -> None:
+    head = ScriptDirectory.from_config(config).get_current_head()
+    if head != SCHEMA_REVISION:
+        raise RuntimeError(
+            f"El head de las migraciones es {head} pero src/core/schema.py espera {SCHEMA_REVISION}: "
+            "actualizar SCHEMA_REVISION junto con la migración nueva"
+        )
+
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+        # También tras stamp y downgrade: el arranque compara contra esta huella
+        revision = context.get_context().get_current_revision()
+        store_schema_fingerprint(connection, revision)
+        connection.commit()
+
+if context.is_offline_mode():
+    raise RuntimeError("Las migraciones revisan el esquema existente: no se soporta el modo --sql")
+
+run_migrations_online()
@@ -0,0 +1,698 @@
+-- Esquema inicial (revisión 0001), tomado del pg_dump SCRIPT_LUM.txt del 2025-09-08
+-- sin datos, salvo el catálogo de planes, ni dueños de objetos.
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto WITH SCHEMA public;
+
+CREATE FUNCTION public.set_updated_at() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$  
+begin  
+  new.updated_at = now();  
+  return new;  
+end;  
+$$;
+
+CREATE TABLE public.event_store (
+    id bigint NOT NULL,
+    topic text NOT NULL,
+    aggregate_type text,
+    aggregate_id uuid,
+    payload jsonb NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.event_store ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.event_store_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.images (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    owner_type text NOT NULL,
+    owner_id bigint NOT NULL,
+    object_key text NOT NULL,
+    variant text,
+    width integer,
+    height integer,
+    format text,
+    is_primary boolean DEFAULT false,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    deleted_at timestamp with time zone
+);
+
+ALTER TABLE public.images ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.images_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.order_items (
+    id bigint NOT NULL,
+    sub_order_id bigint NOT NULL,
+    product_id bigint NOT NULL,
+    product_variant_id bigint,
+    title text NOT NULL,
+    unit_price_cop bigint NOT NULL,
+    quantity bigint NOT NULL,
+    total_price_cop bigint NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    CONSTRAINT chk_item_totals CHECK (((total_price_cop = (unit_price_cop * quantity)) AND (unit_price_cop >= 0) AND (quantity > 0)))
+);
+
+ALTER TABLE public.order_items ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.order_items_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.order_messages (
+    id bigint NOT NULL,
+    order_id bigint NOT NULL,
+    from_user_id bigint,
+    to_user_id bigint,
+    body text NOT NULL,
+    attachments jsonb,
+    is_read boolean DEFAULT false,
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.order_messages ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.order_messages_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.orders (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    user_id bigint NOT NULL,
+    total_amount_cop bigint NOT NULL,
+    currency text DEFAULT 'COP'::text,
+    status text DEFAULT 'pending'::text NOT NULL,
+    shipping_address jsonb,
+    billing_address jsonb,
+    metadata jsonb,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.orders ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.orders_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.payment_intents (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    provider text NOT NULL,
+    provider_payment_id text,
+    provider_payload jsonb,
+    amount_cop bigint NOT NULL,
+    currency text DEFAULT 'COP'::text,
+    status text DEFAULT 'created'::text NOT NULL,
+    order_id bigint,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.payment_intents ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.payment_intents_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.payouts (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    sub_order_id bigint,
+    provider text,
+    provider_payout_id text,
+    amount_cop bigint NOT NULL,
+    fee_cop bigint DEFAULT 0,
+    status text DEFAULT 'pending'::text NOT NULL,
+    attempted_at timestamp with time zone,
+    processed_at timestamp with time zone,
+    provider_payload jsonb,
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.payouts ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.payouts_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.plans (
+    id bigint NOT NULL,
+    plan_key text NOT NULL,
+    display_name text NOT NULL,
+    monthly_price_cop bigint DEFAULT 0 NOT NULL,
+    annual_price_cop bigint,
+    commission_rate numeric(5,3) NOT NULL,
+    product_limit bigint,
+    subuser_limit bigint,
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.plans ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.plans_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.product_variants (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    product_id bigint NOT NULL,
+    sku text,
+    title text,
+    attributes jsonb,
+    price_cop bigint,
+    quantity bigint DEFAULT 0,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    deleted_at timestamp with time zone
+);
+
+ALTER TABLE public.product_variants ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.product_variants_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.product_versions (
+    id bigint NOT NULL,
+    product_id bigint NOT NULL,
+    snapshot jsonb NOT NULL,
+    changed_by_user_id bigint,
+    change_type text,
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.product_versions ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.product_versions_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.products (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    store_id bigint NOT NULL,
+    sku text,
+    title text NOT NULL,
+    description text,
+    condition text DEFAULT 'new'::text,
+    price_cop bigint NOT NULL,
+    currency text DEFAULT 'COP'::text,
+    is_published boolean DEFAULT false,
+    is_visible boolean DEFAULT true,
+    attributes jsonb,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    deleted_at timestamp with time zone
+);
+
+ALTER TABLE public.products ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.products_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.refunds (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    payment_intent_id bigint,
+    order_id bigint,
+    amount_cop bigint NOT NULL,
+    reason text,
+    fee_cop bigint DEFAULT 0,
+    status text DEFAULT 'requested'::text NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    processed_at timestamp with time zone
+);
+
+ALTER TABLE public.refunds ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.refunds_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.reservations (
+    id bigint NOT NULL,
+    product_variant_id bigint,
+    product_id bigint,
+    user_id bigint,
+    quantity bigint DEFAULT 1 NOT NULL,
+    expires_at timestamp with time zone NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    fulfilled boolean DEFAULT false
+);
+
+ALTER TABLE public.reservations ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.reservations_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.stores (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    owner_user_id bigint NOT NULL,
+    name text NOT NULL,
+    slug text NOT NULL,
+    description text,
+    logo_key text,
+    banner_key text,
+    country text DEFAULT 'CO'::text,
+    city text,
+    is_active boolean DEFAULT true,
+    plan text DEFAULT 'free'::text NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    deleted_at timestamp with time zone
+);
+
+CREATE TABLE public.subscriptions (
+    id bigint NOT NULL,
+    store_id bigint NOT NULL,
+    plan_id bigint NOT NULL,
+    starts_at timestamp with time zone DEFAULT now() NOT NULL,
+    ends_at timestamp with time zone,
+    status text DEFAULT 'active'::text NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+CREATE VIEW public.store_current_subscription AS
+ SELECT s.id AS store_id,
+    sub.id AS subscription_id,
+    sub.plan_id,
+    sub.starts_at,
+    sub.ends_at,
+    sub.status AS subscription_status,
+    sub.created_at AS subscription_created_at,
+    sub.updated_at AS subscription_updated_at
+   FROM (public.stores s
+     LEFT JOIN LATERAL ( SELECT ss.id,
+            ss.plan_id,
+            ss.starts_at,
+            ss.ends_at,
+            ss.status,
+            ss.created_at,
+            ss.updated_at
+           FROM public.subscriptions ss
+          WHERE (ss.store_id = s.id)
+          ORDER BY ss.starts_at DESC
+         LIMIT 1) sub ON (true));
+
+CREATE TABLE public.store_users (
+    id bigint NOT NULL,
+    store_id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    role text NOT NULL,
+    can_admin_products boolean DEFAULT false,
+    can_view_reports boolean DEFAULT false,
+    can_manage_inventory boolean DEFAULT false,
+    can_handle_messages boolean DEFAULT false,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    deleted_at timestamp with time zone,
+    CONSTRAINT store_users_role_check CHECK ((role = ANY (ARRAY['administrator'::text, 'seller'::text, 'operations_manager'::text])))
+);
+
+ALTER TABLE public.store_users ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.store_users_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+ALTER TABLE public.stores ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.stores_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.sub_orders (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    order_id bigint NOT NULL,
+    store_id bigint NOT NULL,
+    subtotal_cop bigint NOT NULL,
+    shipping_cop bigint DEFAULT 0,
+    marketplace_fee_cop bigint DEFAULT 0,
+    seller_net_cop bigint NOT NULL,
+    status text DEFAULT 'pending'::text NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+ALTER TABLE public.sub_orders ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.sub_orders_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+ALTER TABLE public.subscriptions ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.subscriptions_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+CREATE TABLE public.users (
+    id bigint NOT NULL,
+    external_id uuid NOT NULL,
+    email text NOT NULL,
+    password_hash text,
+    full_name text,
+    phone text,
+    is_verified boolean DEFAULT false,
+    can_sell boolean DEFAULT false,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    deleted_at timestamp with time zone
+);
+
+ALTER TABLE public.users ALTER COLUMN id ADD GENERATED ALWAYS AS IDENTITY (
+    SEQUENCE NAME public.users_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1
+);
+
+ALTER TABLE ONLY public.event_store
+    ADD CONSTRAINT event_store_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.images
+    ADD CONSTRAINT images_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.images
+    ADD CONSTRAINT images_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.order_items
+    ADD CONSTRAINT order_items_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.order_messages
+    ADD CONSTRAINT order_messages_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.orders
+    ADD CONSTRAINT orders_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.orders
+    ADD CONSTRAINT orders_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.payment_intents
+    ADD CONSTRAINT payment_intents_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.payment_intents
+    ADD CONSTRAINT payment_intents_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.payouts
+    ADD CONSTRAINT payouts_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.payouts
+    ADD CONSTRAINT payouts_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.plans
+    ADD CONSTRAINT plans_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.plans
+    ADD CONSTRAINT plans_plan_key_key UNIQUE (plan_key);
+
+ALTER TABLE ONLY public.product_variants
+    ADD CONSTRAINT product_variants_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.product_variants
+    ADD CONSTRAINT product_variants_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.product_versions
+    ADD CONSTRAINT product_versions_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.products
+    ADD CONSTRAINT products_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.products
+    ADD CONSTRAINT products_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.refunds
+    ADD CONSTRAINT refunds_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.refunds
+    ADD CONSTRAINT refunds_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.reservations
+    ADD CONSTRAINT reservations_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.store_users
+    ADD CONSTRAINT store_users_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.stores
+    ADD CONSTRAINT stores_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.stores
+    ADD CONSTRAINT stores_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.sub_orders
+    ADD CONSTRAINT sub_orders_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.sub_orders
+    ADD CONSTRAINT sub_orders_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.subscriptions
+    ADD CONSTRAINT subscriptions_pkey PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.users
+    ADD CONSTRAINT users_email_key UNIQUE (email);
+
+ALTER TABLE ONLY public.users
+    ADD CONSTRAINT users_external_id_key UNIQUE (external_id);
+
+ALTER TABLE ONLY public.users
+    ADD CONSTRAINT users_pkey PRIMARY KEY (id);
+
+CREATE INDEX event_store_aggregate_type_aggregate_id_idx ON public.event_store USING btree (aggregate_type, aggregate_id);
+
+CREATE INDEX event_store_topic_idx ON public.event_store USING btree (topic);
+
+CREATE INDEX images_object_key_idx ON public.images USING btree (object_key);
+
+CREATE INDEX images_owner_type_owner_id_idx ON public.images USING btree (owner_type, owner_id);
+
+CREATE INDEX order_items_product_id_idx ON public.order_items USING btree (product_id);
+
+CREATE INDEX order_items_sub_order_id_idx ON public.order_items USING btree (sub_order_id);
+
+CREATE INDEX order_messages_from_user_id_idx ON public.order_messages USING btree (from_user_id);
+
+CREATE INDEX order_messages_order_id_idx ON public.order_messages USING btree (order_id);
+
+CREATE INDEX order_messages_to_user_id_idx ON public.order_messages USING btree (to_user_id);
+
+CREATE INDEX orders_created_at_idx ON public.orders USING btree (created_at);
+
+CREATE INDEX orders_user_id_idx ON public.orders USING btree (user_id);
+
+CREATE INDEX payment_intents_order_id_idx ON public.payment_intents USING btree (order_id);
+
+CREATE INDEX payment_intents_provider_idx ON public.payment_intents USING btree (provider);
+
+CREATE INDEX payment_intents_status_idx ON public.payment_intents USING btree (status);
+
+CREATE INDEX payouts_status_idx ON public.payouts USING btree (status);
+
+CREATE INDEX payouts_sub_order_id_idx ON public.payouts USING btree (sub_order_id);
+
+CREATE INDEX product_variants_product_id_idx ON public.product_variants USING btree (product_id);
+
+CREATE INDEX product_versions_created_at_idx ON public.product_versions USING btree (created_at);
+
+CREATE INDEX product_versions_product_id_idx ON public.product_versions USING btree (product_id);
+
+CREATE INDEX products_store_id_idx ON public.products USING btree (store_id);
+
+CREATE UNIQUE INDEX products_store_sku_unique ON public.products USING btree (store_id, sku) WHERE ((sku IS NOT NULL) AND (deleted_at IS NULL));
+
+CREATE INDEX products_to_tsvector_idx ON public.products USING gin (to_tsvector('spanish'::regconfig, ((COALESCE(title, ''::text) || ' '::text) || COALESCE(description, ''::text))));
+
+CREATE INDEX refunds_order_id_idx ON public.refunds USING btree (order_id);
+
+CREATE INDEX refunds_payment_intent_id_idx ON public.refunds USING btree (payment_intent_id);
+
+CREATE INDEX reservations_expires_at_idx ON public.reservations USING btree (expires_at);
+
+CREATE INDEX reservations_product_id_idx ON public.reservations USING btree (product_id);
+
+CREATE INDEX reservations_product_variant_id_idx ON public.reservations USING btree (product_variant_id);
+
+CREATE INDEX store_users_role_idx ON public.store_users USING btree (role);
+
+CREATE UNIQUE INDEX store_users_store_id_user_id_idx ON public.store_users USING btree (store_id, user_id) WHERE (deleted_at IS NULL);
+
+CREATE UNIQUE INDEX stores_owner_user_id_slug_idx ON public.stores USING btree (owner_user_id, slug) WHERE (deleted_at IS NULL);
+
+CREATE INDEX stores_plan_idx ON public.stores USING btree (plan);
+
+CREATE INDEX sub_orders_order_id_idx ON public.sub_orders USING btree (order_id);
+
+CREATE INDEX sub_orders_store_id_idx ON public.sub_orders USING btree (store_id);
+
+CREATE INDEX subscriptions_status_idx ON public.subscriptions USING btree (status);
+
+CREATE INDEX subscriptions_store_id_idx ON public.subscriptions USING btree (store_id);
+
+CREATE INDEX users_created_at_idx ON public.users USING btree (created_at);
+
+CREATE INDEX users_email_idx ON public.users USING btree (email);
+
+CREATE TRIGGER orders_set_updated_at BEFORE UPDATE ON public.orders FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+CREATE TRIGGER payment_intents_set_updated_at BEFORE UPDATE ON public.payment_intents FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+CREATE TRIGGER product_variants_set_updated_at BEFORE UPDATE ON public.product_variants FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+CREATE TRIGGER products_set_updated_at BEFORE UPDATE ON public.products FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+CREATE TRIGGER stores_set_updated_at BEFORE UPDATE ON public.stores FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+CREATE TRIGGER subscriptions_set_updated_at BEFORE UPDATE ON public.subscriptions FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+CREATE TRIGGER users_set_updated_at BEFORE UPDATE ON public.users FOR EACH ROW EXECUTE FUNCTION public.set_updated_at();
+
+ALTER TABLE ONLY public.order_items
+    ADD CONSTRAINT order_items_product_id_fkey FOREIGN KEY (product_id) REFERENCES public.products(id);
+
+ALTER TABLE ONLY public.order_items
+    ADD CONSTRAINT order_items_product_variant_id_fkey FOREIGN KEY (product_variant_id) REFERENCES public.product_variants(id);
+
+ALTER TABLE ONLY public.order_items
+    ADD CONSTRAINT order_items_sub_order_id_fkey FOREIGN KEY (sub_order_id) REFERENCES public.sub_orders(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.order_messages
+    ADD CONSTRAINT order_messages_from_user_id_fkey FOREIGN KEY (from_user_id) REFERENCES public.users(id);
+
+ALTER TABLE ONLY public.order_messages
+    ADD CONSTRAINT order_messages_order_id_fkey FOREIGN KEY (order_id) REFERENCES public.orders(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.order_messages
+    ADD CONSTRAINT order_messages_to_user_id_fkey FOREIGN KEY (to_user_id) REFERENCES public.users(id);
+
+ALTER TABLE ONLY public.orders
+    ADD CONSTRAINT orders_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id);
+
+ALTER TABLE ONLY public.payment_intents
+    ADD CONSTRAINT payment_intents_order_id_fkey FOREIGN KEY (order_id) REFERENCES public.orders(id);
+
+ALTER TABLE ONLY public.payouts
+    ADD CONSTRAINT payouts_sub_order_id_fkey FOREIGN KEY (sub_order_id) REFERENCES public.sub_orders(id);
+
+ALTER TABLE ONLY public.product_variants
+    ADD CONSTRAINT product_variants_product_id_fkey FOREIGN KEY (product_id) REFERENCES public.products(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.product_versions
+    ADD CONSTRAINT product_versions_changed_by_user_id_fkey FOREIGN KEY (changed_by_user_id) REFERENCES public.users(id);
+
+ALTER TABLE ONLY public.product_versions
+    ADD CONSTRAINT product_versions_product_id_fkey FOREIGN KEY (product_id) REFERENCES public.products(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.products
+    ADD CONSTRAINT products_store_id_fkey FOREIGN KEY (store_id) REFERENCES public.stores(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.refunds
+    ADD CONSTRAINT refunds_order_id_fkey FOREIGN KEY (order_id) REFERENCES public.orders(id);
+
+ALTER TABLE ONLY public.refunds
+    ADD CONSTRAINT refunds_payment_intent_id_fkey FOREIGN KEY (payment_intent_id) REFERENCES public.payment_intents(id);
+
+ALTER TABLE ONLY public.reservations
+    ADD CONSTRAINT reservations_product_id_fkey FOREIGN KEY (product_id) REFERENCES public.products(id) ON DELETE SET NULL;
+
+ALTER TABLE ONLY public.reservations
+    ADD CONSTRAINT reservations_product_variant_id_fkey FOREIGN KEY (product_variant_id) REFERENCES public.product_variants(id) ON DELETE SET NULL;
+
+ALTER TABLE ONLY public.reservations
+    ADD CONSTRAINT reservations_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id);
+
+ALTER TABLE ONLY public.store_users
+    ADD CONSTRAINT store_users_store_id_fkey FOREIGN KEY (store_id) REFERENCES public.stores(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.store_users
+    ADD CONSTRAINT store_users_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.stores
+    ADD CONSTRAINT stores_owner_user_id_fkey FOREIGN KEY (owner_user_id) REFERENCES public.users(id);
+
+ALTER TABLE ONLY public.sub_orders
+    ADD CONSTRAINT sub_orders_order_id_fkey FOREIGN KEY (order_id) REFERENCES public.orders(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.sub_orders
+    ADD CONSTRAINT sub_orders_store_id_fkey FOREIGN KEY (store_id) REFERENCES public.stores(id);
+
+ALTER TABLE ONLY public.subscriptions
+    ADD CONSTRAINT subscriptions_plan_id_fkey FOREIGN KEY (plan_id) REFERENCES public.plans(id);
+
+ALTER TABLE ONLY public.subscriptions
+    ADD CONSTRAINT subscriptions_store_id_fkey FOREIGN KEY (store_id) REFERENCES public.stores(id) ON DELETE CASCADE;
+
+-- Catálogo de planes
+INSERT INTO public.plans (id, plan_key, display_name, monthly_price_cop, annual_price_cop, commission_rate, product_limit, subuser_limit, created_at) OVERRIDING SYSTEM VALUE VALUES
+    ('1', 'free', 'Free', '0', NULL, '0.090', '500', '1', '2025-09-05 16:08:59.422288-05'),
+    ('2', 'pro', 'Pro', '100000', '800000', '0.060', '500', '5', '2025-09-05 16:08:59.422288-05'),
+    ('3', 'business', 'Business', '300000', '3000000', '0.050', NULL, NULL, '2025-09-05 16:08:59.422288-05');
+
+SELECT pg_catalog.setval('public.plans_id_seq', 3, true);
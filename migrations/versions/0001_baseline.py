@@ -0,0 +1,26 @@
+"""Esquema inicial (SCRIPT_LUM.txt)
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-09-08
+
+Las bases que ya tienen este esquema se marcan con `alembic stamp 0001` antes de
+`alembic upgrade head`.
+"""
+from pathlib import Path
+
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BASELINE_SQL = Path(__file__).resolve().parent.parent / "sql" / "0001_baseline.sql"
+
+def upgrade() -> None:
+    # exec_driver_sql: el dump trae `::` y cuerpos $$ que text() interpretaría
+    op.get_bind().exec_driver_sql(BASELINE_SQL.read_text(encoding="utf-8"))
+
+def downgrade() -> None:
+    raise NotImplementedError("No se puede bajar de la revisión inicial")
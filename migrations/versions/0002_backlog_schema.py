@@ -0,0 +1,172 @@
+"""Tablas, columnas e índices agregados sobre el esquema inicial
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Todo es idempotente (IF NOT EXISTS): las bases que ya recibieron estas tablas con
+create_all se migran sin errores. Los índices sobre tablas existentes se crean con
+CONCURRENTLY para no bloquear escrituras.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, definición) de los índices nuevos sobre tablas que ya tienen datos
+CONCURRENT_INDEXES = [
+    # Paginación por cursor (created_at, id)
+    ("orders_created_at_id_idx", "orders", "(created_at, id)"),
+    ("orders_user_id_created_at_id_idx", "orders", "(user_id, created_at, id)"),
+    ("stores_created_at_id_idx", "stores", "(created_at, id)"),
+    ("stores_owner_user_id_created_at_id_idx", "stores", "(owner_user_id, created_at, id)"),
+    ("users_created_at_id_idx", "users", "(created_at, id)"),
+    # Historial de mensajes y no leídos
+    ("order_messages_order_id_id_idx", "order_messages", "(order_id, id)"),
+    ("order_messages_unread_idx", "order_messages", "(order_id, to_user_id, id) WHERE is_read = false"),
+    ("order_messages_to_user_unread_idx", "order_messages", "(to_user_id, order_id) WHERE is_read = false"),
+    # Catálogo de productos por tienda
+    (
+        "products_storefront_created_at_id_idx", "products",
+        "(store_id, created_at, id) WHERE is_published AND is_visible AND deleted_at IS NULL"
+    ),
+    (
+        "products_storefront_price_cop_id_idx", "products",
+        "(store_id, price_cop, id) WHERE is_published AND is_visible AND deleted_at IS NULL"
+    ),
+    ("products_store_id_created_at_id_idx", "products", "(store_id, created_at, id) WHERE deleted_at IS NULL"),
+    # Payouts: uno activo por sub-orden y búsqueda por lote
+    ("payouts_batch_id_idx", "payouts", "(batch_id)"),
+    ("payouts_sub_order_id_active_key", "payouts", "(sub_order_id) WHERE status <> 'failed'"),
+    # JWT de Auth0 -> usuario local
+    ("users_auth0_user_id_idx", "users", "(auth0_user_id) WHERE deleted_at IS NULL"),
+]
+
+UNIQUE_INDEXES = {"payouts_sub_order_id_active_key"}
+
+def _index_state(name: str):
+    """None si el índice no existe; si existe, (válido, definición)"""
+    return op.get_bind().execute(
+        sa.text("""
+            SELECT i.indisvalid, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace
+        """),
+        {"name": name}
+    ).first()
+
+def _create_index_concurrently(name: str, table: str, definition: str, unique: bool = False) -> None:
+    state = _index_state(name)
+    if state is not None and state[0]:
+        return
+    if state is not None:
+        # Quedó inválido por un CREATE INDEX CONCURRENTLY interrumpido
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY {name} ON {table} {definition}")
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("key", sa.Text(), primary_key=True),
+        sa.Column("method", sa.Text(), nullable=False),
+        sa.Column("path", sa.Text(), nullable=False),
+        sa.Column("request_hash", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False, server_default="in_progress"),
+        sa.Column("response_status", sa.Integer()),
+        sa.Column("response_content_type", sa.Text()),
+        sa.Column("response_headers", JSONB()),
+        sa.Column("response_body", sa.Text()),
+        sa.Column("locked_until", sa.DateTime(timezone=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("idempotency_keys_expires_at_idx", "idempotency_keys", ["expires_at"], if_not_exists=True)
+    # Tablas creadas con create_all antes de que se guardaran los headers de la respuesta
+    op.execute("ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS response_headers jsonb")
+
+    op.create_table(
+        "user_unread_counters",
+        sa.Column("user_id", sa.BigInteger(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("unread_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "user_order_unread_counters",
+        sa.Column("user_id", sa.BigInteger(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("order_id", sa.BigInteger(), sa.ForeignKey("orders.id"), primary_key=True),
+        sa.Column("unread_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "store_sales_daily",
+        sa.Column("store_id", sa.BigInteger(), sa.ForeignKey("stores.id"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", sa.Text(), primary_key=True),
+        sa.Column("sub_order_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("units", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("gmv_cop", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("shipping_cop", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("marketplace_fee_cop", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("seller_net_cop", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "auth0_outbox",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("auth0_user_id", sa.Text(), nullable=False),
+        sa.Column("operation", sa.Text(), nullable=False),
+        sa.Column("payload", JSONB()),
+        sa.Column("status", sa.Text(), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "auth0_outbox_pending_next_attempt_idx", "auth0_outbox", ["next_attempt_at", "id"],
+        postgresql_where=sa.text("status = 'pending'"), if_not_exists=True
+    )
+    op.create_index(
+        "auth0_outbox_pending_user_idx", "auth0_outbox", ["auth0_user_id", "id"],
+        postgresql_where=sa.text("status = 'pending'"), if_not_exists=True
+    )
+
+    op.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS auth0_user_id text")
+    op.execute("ALTER TABLE payouts ADD COLUMN IF NOT EXISTS batch_id uuid")
+
+    # Con payouts activos duplicados el índice único fallaría a mitad de un CREATE INDEX
+    # CONCURRENTLY y quedaría inválido: mejor detenerse antes con las sub-órdenes a revisar
+    duplicated = op.get_bind().execute(sa.text("""
+        SELECT sub_order_id FROM payouts WHERE status <> 'failed' AND sub_order_id IS NOT NULL
+        GROUP BY sub_order_id HAVING count(*) > 1 ORDER BY sub_order_id LIMIT 20
+    """)).scalars().all()
+    if duplicated:
+        raise RuntimeError(
+            "Hay sub-órdenes con más de un payout activo; márquelos como 'failed' o elimínelos "
+            f"antes de migrar (payouts_sub_order_id_active_key). Sub-órdenes: {duplicated}"
+        )
+
+    with op.get_context().autocommit_block():
+        for name, table, definition in CONCURRENT_INDEXES:
+            _create_index_concurrently(name, table, definition, unique=name in UNIQUE_INDEXES)
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in CONCURRENT_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    op.execute("ALTER TABLE payouts DROP COLUMN IF EXISTS batch_id")
+    # users.auth0_user_id se conserva: el código anterior ya la usaba
+    for table in ("auth0_outbox", "store_sales_daily", "user_order_unread_counters", "user_unread_counters", "idempotency_keys"):
+        op.drop_table(table, if_exists=True)
@@ -0,0 +1,52 @@
+"""Índice de búsqueda de productos con COALESCE
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+Las bases creadas con create_all antes de corregir el modelo tienen
+products_to_tsvector_idx sobre `title || ' ' || description`, sin COALESCE. Esa
+expresión no coincide con la de la búsqueda (PRODUCT_SEARCH_DOCUMENT en
+product_repository), así que Postgres nunca usa el índice. Se reemplaza por el del
+esquema inicial. Las bases migradas desde 0001 ya lo tienen y no cambian.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+SEARCH_INDEX = "products_to_tsvector_idx"
+# Igual que en migrations/sql/0001_baseline.sql y en el modelo Product
+SEARCH_INDEX_DEFINITION = (
+    "USING gin (to_tsvector('spanish'::regconfig, "
+    "((COALESCE(title, ''::text) || ' '::text) || COALESCE(description, ''::text))))"
+)
+
+def _index_state():
+    """None si el índice no existe; si existe, (válido, definición)"""
+    return op.get_bind().execute(
+        sa.text("""
+            SELECT i.indisvalid, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace
+        """),
+        {"name": SEARCH_INDEX}
+    ).first()
+
+def upgrade() -> None:
+    state = _index_state()
+    if state is not None and state[0] and state[1].endswith(SEARCH_INDEX_DEFINITION):
+        return
+
+    with op.get_context().autocommit_block():
+        # Sin índice válido la búsqueda hace seq scan mientras se construye el nuevo,
+        # igual que ya pasaba con el índice que no coincidía
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {SEARCH_INDEX}")
+        op.execute(f"CREATE INDEX CONCURRENTLY {SEARCH_INDEX} ON products {SEARCH_INDEX_DEFINITION}")
+
+def downgrade() -> None:
+    # El índice sin COALESCE nunca se usó: no se restaura
+    pass
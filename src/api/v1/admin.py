@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+
+from ...db import get_db, get_pool_stats, replica_set
+from ...repositories.auth0_outbox_repository import Auth0OutboxRepository
+from ...repositories.payout_repository import PayoutRepository
+from ...schemas.auth0_outbox import Auth0OutboxStatsOut
+from ...schemas.db_pool import DbPoolStatsOut, ReplicaStatsOut
+from ...schemas.payout import PayoutRunOut
+from ...services.auth import PAYOUTS_RUN_PERMISSION, require_permission
+from ...services.auth0_sync import auth0_sync_worker
+from ...services.cache import cache_stats
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.post(
+    "/payouts/run",
+    response_model=PayoutRunOut,
+    dependencies=[Depends(require_permission(PAYOUTS_RUN_PERMISSION))]
+)
+def run_payouts(
+    batch_size: int = Query(1000, ge=1, le=10000, description="Sub-órdenes por transacción"),
+    max_batches: Optional[int] = Query(None, ge=1, description="Máximo de lotes en esta corrida"),
+    db: Session = Depends(get_db)
+):
+    """Generar los payouts de las sub-órdenes entregadas que aún no tienen uno.
+
+    Mueve dinero: requiere un token con el permiso PAYOUTS_RUN_PERMISSION.
+    """
+    payout_repo = PayoutRepository(db)
+    return payout_repo.run_payouts(batch_size=batch_size, max_batches=max_batches)
+
+@router.get("/cache/stats")
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Aciertos, fallos, desalojos e invalidaciones de los cachés de este proceso"""
+    return cache_stats()
+
+@router.get("/auth0-outbox", response_model=Auth0OutboxStatsOut)
+def get_auth0_outbox_stats(db: Session = Depends(get_db)):
+    """Profundidad y demora de la cola de sincronización con Auth0"""
+    return Auth0OutboxStatsOut(**Auth0OutboxRepository(db).get_stats(), **auth0_sync_worker.get_stats())
+
+@router.get("/db-pool", response_model=Dict[str, DbPoolStatsOut])
+async def get_db_pool_stats():
+    """Conexiones en uso, overflow e histograma de espera de los pools de este proceso (sync, async y réplicas)"""
+    return {name: stats for name, stats in get_pool_stats().items() if stats is not None}
+
+@router.get("/db-replicas", response_model=List[ReplicaStatsOut])
+async def get_db_replicas():
+    """Salud, retraso y uso de las réplicas de lectura"""
+    return replica_set.get_stats()
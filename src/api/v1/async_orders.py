@@ -0,0 +1,175 @@
+# src/api/v1/async_orders.py
+# Lecturas de órdenes con AsyncSession (DB_API_MODE=async). Se registran antes que las rutas
+# sync de orders.py y las reemplazan; las escrituras siguen en orders.py. Los IDs usan el
+# convertidor :int para no capturar rutas fijas como /orders/summary o /orders/export.
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+
+from ...async_db import get_async_db
+from ...core.pagination import INVALID_CURSOR_ERROR, set_next_cursor
+from ...repositories.async_order_repository import AsyncOrderRepository
+from ...schemas.batch import MAX_BATCH_SIZE, parse_batch_ids
+from ...schemas.order import OrderOut, OrderSummaryOut, OrderBatchOut
+from .orders import ORDER_NOT_FOUND_ERROR
+
+router = APIRouter(prefix="/orders", tags=["orders"])
+
+@router.get("/summary", response_model=List[OrderSummaryOut])
+async def list_order_summaries(
+    response: Response,
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario"),
+    status: Optional[str] = Query(None, description="Filtrar por estado"),
+    store_id: Optional[int] = Query(None, description="Filtrar por tienda"),
+    limit: int = Query(50, ge=1, le=200, description="Límite de resultados"),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Listar órdenes en su versión resumida (estado, total, fecha y cantidad de items)"""
+    order_repo = AsyncOrderRepository(db)
+    try:
+        summaries = await order_repo.get_order_summaries(
+            user_id=user_id,
+            status=status,
+            store_id=store_id,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, summaries, limit)
+    return summaries
+
+@router.get("/user/{user_id:int}/summary", response_model=List[OrderSummaryOut])
+async def get_user_order_summaries(
+    user_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener el historial resumido de órdenes de un usuario"""
+    order_repo = AsyncOrderRepository(db)
+    try:
+        summaries = await order_repo.get_order_summaries(user_id=user_id, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, summaries, limit)
+    return summaries
+
+@router.get("/batch", response_model=OrderBatchOut)
+async def get_orders_batch(
+    ids: str = Query(..., description=f"IDs separados por coma (máximo {MAX_BATCH_SIZE})"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener varias órdenes por ID en una sola consulta"""
+    try:
+        order_ids = parse_batch_ids(ids)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Parámetro ids inválido: {str(e)}"
+        )
+
+    order_repo = AsyncOrderRepository(db)
+    orders = {order.id: order for order in await order_repo.get_orders_by_ids(order_ids)}
+    return OrderBatchOut(
+        items=orders,
+        missing=[order_id for order_id in order_ids if order_id not in orders]
+    )
+
+@router.get("/{order_id:int}", response_model=OrderOut)
+async def get_order(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener una orden por ID"""
+    order_repo = AsyncOrderRepository(db)
+    order = await order_repo.get_order_by_id(order_id)
+
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ORDER_NOT_FOUND_ERROR
+        )
+
+    return order
+
+@router.get("/external/{external_id}", response_model=OrderOut)
+async def get_order_by_external_id(
+    external_id: UUID,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener una orden por external_id"""
+    order_repo = AsyncOrderRepository(db)
+    order = await order_repo.get_order_by_external_id(str(external_id))
+
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ORDER_NOT_FOUND_ERROR
+        )
+
+    return order
+
+@router.get("", response_model=List[OrderOut])
+async def list_orders(
+    response: Response,
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario"),
+    status: Optional[str] = Query(None, description="Filtrar por estado"),
+    store_id: Optional[int] = Query(None, description="Filtrar por tienda"),
+    limit: int = Query(50, ge=1, le=200, description="Límite de resultados"),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Listar órdenes con filtros opcionales"""
+    order_repo = AsyncOrderRepository(db)
+    try:
+        orders = await order_repo.get_orders_with_filters(
+            user_id=user_id,
+            status=status,
+            store_id=store_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, orders, limit)
+    return orders
+
+@router.get("/user/{user_id:int}", response_model=List[OrderOut])
+async def get_user_orders(
+    user_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener órdenes de un usuario específico"""
+    order_repo = AsyncOrderRepository(db)
+    try:
+        orders = await order_repo.get_orders_by_user(user_id, limit, offset, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, orders, limit)
+    return orders
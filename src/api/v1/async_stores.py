@@ -0,0 +1,138 @@
+# src/api/v1/async_stores.py
+# Lecturas de tiendas con AsyncSession (DB_API_MODE=async). Se registran antes que las rutas
+# sync de stores.py y las reemplazan; las escrituras, productos y ventas siguen en stores.py.
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+
+from ...async_db import get_async_db
+from ...core.pagination import INVALID_CURSOR_ERROR, set_next_cursor
+from ...repositories.async_store_repository import AsyncStoreRepository
+from ...schemas.batch import BatchIdsIn
+from ...schemas.store import StoreOut, StoreBatchOut
+from .stores import STORE_NOT_FOUND_ERROR
+
+router = APIRouter(prefix="/stores", tags=["stores"])
+
+@router.post("/batch", response_model=StoreBatchOut)
+async def get_stores_batch(
+    payload: BatchIdsIn,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener varias tiendas por ID en una sola consulta"""
+    store_ids = list(dict.fromkeys(payload.ids))
+    store_repo = AsyncStoreRepository(db)
+    stores = {store.id: store for store in await store_repo.get_stores_by_ids(store_ids)}
+    return StoreBatchOut(
+        items=stores,
+        missing=[store_id for store_id in store_ids if store_id not in stores]
+    )
+
+@router.get("/{store_id:int}", response_model=StoreOut)
+async def get_store(
+    store_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener una tienda por ID"""
+    store_repo = AsyncStoreRepository(db)
+    store = await store_repo.get_store_by_id(store_id)
+
+    if not store:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=STORE_NOT_FOUND_ERROR
+        )
+
+    return store
+
+@router.get("/external/{external_id}", response_model=StoreOut)
+async def get_store_by_external_id(
+    external_id: UUID,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener una tienda por external_id"""
+    store_repo = AsyncStoreRepository(db)
+    store = await store_repo.get_cached_store_by_external_id(str(external_id))
+
+    if not store:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=STORE_NOT_FOUND_ERROR
+        )
+
+    return store
+
+@router.get("/slug/{slug}", response_model=StoreOut)
+async def get_store_by_slug(
+    slug: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener una tienda por slug"""
+    store_repo = AsyncStoreRepository(db)
+    store = await store_repo.get_cached_store_by_slug(slug)
+
+    if not store:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=STORE_NOT_FOUND_ERROR
+        )
+
+    return store
+
+@router.get("", response_model=List[StoreOut])
+async def list_stores(
+    response: Response,
+    owner_user_id: Optional[int] = Query(None, description="Filtrar por propietario"),
+    plan: Optional[str] = Query(None, description="Filtrar por plan"),
+    is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
+    country: Optional[str] = Query(None, description="Filtrar por país"),
+    limit: int = Query(50, ge=1, le=200, description="Límite de resultados"),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Listar tiendas con filtros opcionales"""
+    store_repo = AsyncStoreRepository(db)
+    try:
+        stores = await store_repo.get_stores_with_filters(
+            owner_user_id=owner_user_id,
+            plan=plan,
+            is_active=is_active,
+            country=country,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, stores, limit)
+    return stores
+
+@router.get("/owner/{owner_user_id:int}", response_model=List[StoreOut])
+async def get_owner_stores(
+    owner_user_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Obtener tiendas de un propietario específico"""
+    store_repo = AsyncStoreRepository(db)
+    try:
+        stores = await store_repo.get_stores_with_filters(
+            owner_user_id=owner_user_id, limit=limit, offset=offset, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, stores, limit)
+    return stores
@@ -1,18 +1,34 @@
 # src/api/v1/orders.py
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from ...db import get_db
+from ...db import get_db, get_read_db, SessionLocal
+from ...core.pagination import INVALID_CURSOR_ERROR, set_next_cursor
 
 # Constantes
 ORDER_NOT_FOUND_ERROR = "Orden no encontrada"
 from ...repositories.order_repository import OrderRepository
+from ...schemas.batch import MAX_BATCH_SIZE, parse_batch_ids
+from ...services.auth import (
+    ORDERS_BULK_STATUS_PERMISSION, ORDERS_EXPORT_PERMISSION, ORDERS_IMPORT_PERMISSION,
+    get_current_user_id, get_stream_user_id, require_permission
+)
+from ...services.order_import import import_ndjson_stream
+from ...services.order_export import EXPORT_FORMATS, export_orders, parquet_available
+from ...services.message_broker import (
+    message_broker, message_event, order_channel, user_channel, stream_message_events
+)
 from ...models.order import OrderMessage
 from ...schemas.order import (
-    OrderCreate, OrderOut, OrderUpdate,
-    OrderMessageCreate, OrderMessageOut, OrderMessageUpdate
+    OrderCreate, OrderOut, OrderSummaryOut, OrderBatchOut, OrderUpdate,
+    OrderMessageCreate, OrderMessageOut, OrderMessageUpdate,
+    OrderMessagesReadIn, OrderMessagesReadOut, OrderImportReport,
+    BulkStatusIn, BulkStatusOut
 )
 
 router = APIRouter(prefix="/orders", tags=["orders"])
@@ -25,7 +41,7 @@ def create_order(
     """Crear una nueva orden"""
     try:
         order_repo = OrderRepository(db)
-        order = order_repo.create_order(order_data)
+        order = order_repo.create_order_bulk(order_data)
         return order
     except Exception as e:
         raise HTTPException(
@@ -33,10 +49,155 @@ def create_order(
             detail=f"Error al crear la orden: {str(e)}"
         )
 
+@router.post(
+    "/import",
+    response_model=OrderImportReport,
+    dependencies=[Depends(require_permission(ORDERS_IMPORT_PERMISSION))]
+)
+async def import_orders(request: Request):
+    """Importar órdenes históricas desde un stream NDJSON (un OrderCreate por línea).
+
+    Las líneas inválidas (incluidas las demasiado largas) no detienen la importación: se
+    reportan con su número de línea.
+    """
+    return await import_ndjson_stream(request.stream())
+
+@router.post(
+    "/bulk-status",
+    response_model=BulkStatusOut,
+    dependencies=[Depends(require_permission(ORDERS_BULK_STATUS_PERMISSION))]
+)
+def bulk_update_order_status(
+    bulk_data: BulkStatusIn,
+    db: Session = Depends(get_db)
+):
+    """Cambiar el estado de varias órdenes (y sus sub-órdenes) en una sola operación"""
+    order_repo = OrderRepository(db)
+    return order_repo.bulk_update_order_status(bulk_data.ids, bulk_data.status)
+
+@router.post(
+    "/sub-orders/bulk-status",
+    response_model=BulkStatusOut,
+    dependencies=[Depends(require_permission(ORDERS_BULK_STATUS_PERMISSION))]
+)
+def bulk_update_sub_order_status(
+    bulk_data: BulkStatusIn,
+    db: Session = Depends(get_db)
+):
+    """Cambiar el estado de varias sub-órdenes; el estado de cada orden se deriva de sus sub-órdenes"""
+    order_repo = OrderRepository(db)
+    return order_repo.bulk_update_sub_order_status(bulk_data.ids, bulk_data.status)
+
+@router.get("/summary", response_model=List[OrderSummaryOut])
+def list_order_summaries(
+    response: Response,
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario"),
+    status: Optional[str] = Query(None, description="Filtrar por estado"),
+    store_id: Optional[int] = Query(None, description="Filtrar por tienda"),
+    limit: int = Query(50, ge=1, le=200, description="Límite de resultados"),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    db: Session = Depends(get_read_db)
+):
+    """Listar órdenes en su versión resumida (estado, total, fecha y cantidad de items)"""
+    order_repo = OrderRepository(db)
+    try:
+        summaries = order_repo.get_order_summaries(
+            user_id=user_id,
+            status=status,
+            store_id=store_id,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, summaries, limit)
+    return summaries
+
+@router.get("/user/{user_id}/summary", response_model=List[OrderSummaryOut])
+def get_user_order_summaries(
+    user_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    db: Session = Depends(get_read_db)
+):
+    """Obtener el historial resumido de órdenes de un usuario"""
+    order_repo = OrderRepository(db)
+    try:
+        summaries = order_repo.get_order_summaries(user_id=user_id, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, summaries, limit)
+    return summaries
+
+@router.get("/export", dependencies=[Depends(require_permission(ORDERS_EXPORT_PERMISSION))])
+def export_order_rows(
+    export_format: str = Query("csv", alias="format", description=f"Formato: {', '.join(EXPORT_FORMATS)}"),
+    user_id: Optional[int] = Query(None, description="Filtrar por usuario"),
+    order_status: Optional[str] = Query(None, alias="status", description="Filtrar por estado"),
+    store_id: Optional[int] = Query(None, description="Filtrar por tienda"),
+    created_from: Optional[datetime] = Query(None, description="Órdenes creadas desde (inclusive)"),
+    created_to: Optional[datetime] = Query(None, description="Órdenes creadas hasta (exclusive)")
+):
+    """Exportar órdenes, sub-órdenes e items (una fila por item) como stream"""
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format debe ser uno de: {', '.join(EXPORT_FORMATS)}"
+        )
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El export en Parquet requiere instalar pyarrow"
+        )
+
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        export_orders(
+            export_format,
+            user_id=user_id,
+            status=order_status,
+            store_id=store_id,
+            created_from=created_from,
+            created_to=created_to
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="orders.{extension}"'}
+    )
+
+@router.get("/batch", response_model=OrderBatchOut)
+def get_orders_batch(
+    ids: str = Query(..., description=f"IDs separados por coma (máximo {MAX_BATCH_SIZE})"),
+    db: Session = Depends(get_read_db)
+):
+    """Obtener varias órdenes por ID en una sola consulta"""
+    try:
+        order_ids = parse_batch_ids(ids)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Parámetro ids inválido: {str(e)}"
+        )
+
+    order_repo = OrderRepository(db)
+    orders = {order.id: order for order in order_repo.get_orders_by_ids(order_ids)}
+    return OrderBatchOut(
+        items=orders,
+        missing=[order_id for order_id in order_ids if order_id not in orders]
+    )
+
 @router.get("/{order_id}", response_model=OrderOut)
 def get_order(
     order_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Obtener una orden por ID"""
     order_repo = OrderRepository(db)
@@ -53,7 +214,7 @@ def get_order(
 @router.get("/external/{external_id}", response_model=OrderOut)
 def get_order_by_external_id(
     external_id: UUID,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Obtener una orden por external_id"""
     order_repo = OrderRepository(db)
@@ -69,34 +230,55 @@ def get_order_by_external_id(
 
 @router.get("", response_model=List[OrderOut])
 def list_orders(
+    response: Response,
     user_id: Optional[int] = Query(None, description="Filtrar por usuario"),
     status: Optional[str] = Query(None, description="Filtrar por estado"),
     store_id: Optional[int] = Query(None, description="Filtrar por tienda"),
     limit: int = Query(50, ge=1, le=200, description="Límite de resultados"),
-    offset: int = Query(0, ge=0, description="Offset para paginación"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
+    db: Session = Depends(get_read_db)
 ):
     """Listar órdenes con filtros opcionales"""
     order_repo = OrderRepository(db)
-    orders = order_repo.get_orders_with_filters(
-        user_id=user_id,
-        status=status,
-        store_id=store_id,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        orders = order_repo.get_orders_with_filters(
+            user_id=user_id,
+            status=status,
+            store_id=store_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, orders, limit)
     return orders
 
 @router.get("/user/{user_id}", response_model=List[OrderOut])
 def get_user_orders(
     user_id: int,
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
+    db: Session = Depends(get_read_db)
 ):
     """Obtener órdenes de un usuario específico"""
     order_repo = OrderRepository(db)
-    orders = order_repo.get_orders_by_user(user_id, limit, offset)
+    try:
+        orders = order_repo.get_orders_by_user(user_id, limit, offset, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, orders, limit)
     return orders
 
 @router.put("/{order_id}", response_model=OrderOut)
@@ -137,14 +319,13 @@ def delete_order(
 def create_order_message(
     order_id: int,
     message_data: OrderMessageCreate,
-    from_user_id: int = Query(..., description="ID del usuario que envía el mensaje"),
+    from_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """Crear un mensaje en una orden"""
     # Verificar que la orden existe
     order_repo = OrderRepository(db)
-    order = order_repo.get_order_by_id(order_id)
-    if not order:
+    if not order_repo.order_exists(order_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ORDER_NOT_FOUND_ERROR
@@ -152,18 +333,118 @@ def create_order_message(
     
     message_data.order_id = order_id
     message = order_repo.create_order_message(message_data, from_user_id)
+    message_broker.publish(db, message)
     return message
 
+def _backfill_messages(after_id: int, order_id: Optional[int] = None, to_user_id: Optional[int] = None):
+    """Mensajes posteriores a after_id para reanudar un stream (sesión propia y corta)"""
+    db = SessionLocal()
+    try:
+        messages = OrderRepository(db).get_messages_after(after_id, order_id=order_id, to_user_id=to_user_id)
+        return [message_event(message) for message in messages]
+    finally:
+        db.close()
+
+def _load_message_event(message_id: int):
+    db = SessionLocal()
+    try:
+        message = OrderRepository(db).get_message_by_id(message_id)
+        return message_event(message) if message else None
+    finally:
+        db.close()
+
+def _order_participation(order_id: int, user_id: int) -> Optional[bool]:
+    db = SessionLocal()
+    try:
+        return OrderRepository(db).is_order_participant(order_id, user_id)
+    finally:
+        db.close()
+
+def _resume_id(last_event_id: Optional[int], last_event_id_header: Optional[str]) -> Optional[int]:
+    if last_event_id is not None:
+        return last_event_id
+    if last_event_id_header and last_event_id_header.isdigit():
+        return int(last_event_id_header)
+    return None
+
+@router.get("/messages/stream")
+async def stream_user_messages(
+    request: Request,
+    last_event_id: Optional[int] = Query(None, description="Reanudar después de este ID de mensaje"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    to_user_id: int = Depends(get_stream_user_id),
+):
+    """Stream SSE con los mensajes nuevos dirigidos al usuario autenticado"""
+    return StreamingResponse(
+        stream_message_events(
+            request,
+            user_channel(to_user_id),
+            _resume_id(last_event_id, last_event_id_header),
+            backfill=lambda after_id: _backfill_messages(after_id, to_user_id=to_user_id),
+            load_message=_load_message_event
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{order_id}/messages/stream")
+async def stream_order_messages(
+    order_id: int,
+    request: Request,
+    last_event_id: Optional[int] = Query(None, description="Reanudar después de este ID de mensaje"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    user_id: int = Depends(get_stream_user_id),
+):
+    """Stream SSE con los mensajes nuevos de una orden (solo para sus participantes)"""
+    participant = await run_in_threadpool(_order_participation, order_id, user_id)
+    if participant is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ORDER_NOT_FOUND_ERROR
+        )
+    if not participant:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Solo el comprador y las tiendas de la orden pueden ver sus mensajes"
+        )
+
+    return StreamingResponse(
+        stream_message_events(
+            request,
+            order_channel(order_id),
+            _resume_id(last_event_id, last_event_id_header),
+            backfill=lambda after_id: _backfill_messages(after_id, order_id=order_id),
+            load_message=_load_message_event
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{order_id}/messages", response_model=List[OrderMessageOut])
 def get_order_messages(
     order_id: int,
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=200, description="Límite de resultados"),
+    before_id: Optional[int] = Query(None, ge=1, description="Mensajes anteriores a este ID (páginas hacia atrás)"),
+    after_id: Optional[int] = Query(None, ge=0, description="Mensajes posteriores a este ID (páginas hacia adelante)"),
+    db: Session = Depends(get_read_db)
 ):
-    """Obtener mensajes de una orden"""
+    """Obtener mensajes de una orden, paginados por ID y en orden cronológico"""
     order_repo = OrderRepository(db)
-    messages = order_repo.get_order_messages(order_id)
+    messages = order_repo.get_order_messages(order_id, limit=limit, before_id=before_id, after_id=after_id)
     return messages
 
+@router.post("/{order_id}/messages/read", response_model=OrderMessagesReadOut)
+def mark_order_messages_as_read(
+    order_id: int,
+    payload: OrderMessagesReadIn,
+    to_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """Marcar como leídos los mensajes de una orden dirigidos al usuario del token, hasta un ID"""
+    order_repo = OrderRepository(db)
+    updated = order_repo.mark_messages_as_read(order_id, to_user_id, payload.up_to_id)
+    return OrderMessagesReadOut(updated=updated)
+
 @router.put("/messages/{message_id}", response_model=OrderMessageOut)
 def update_order_message(
     message_id: int,
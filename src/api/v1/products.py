@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from ...db import get_read_db
+from ...core.pagination import INVALID_CURSOR_ERROR, NEXT_CURSOR_HEADER
+from ...repositories.product_repository import ProductRepository
+from ...schemas.product import ProductSearchOut
+
+router = APIRouter(prefix="/products", tags=["products"])
+
+@router.get("/search", response_model=List[ProductSearchOut])
+def search_products(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200, description="Texto a buscar"),
+    store_id: Optional[int] = Query(None, description="Filtrar por tienda"),
+    min_price_cop: Optional[int] = Query(None, ge=0, description="Precio mínimo en centavos"),
+    max_price_cop: Optional[int] = Query(None, ge=0, description="Precio máximo en centavos"),
+    is_published: Optional[bool] = Query(True, description="Filtrar por publicados"),
+    limit: int = Query(20, ge=1, le=100, description="Límite de resultados"),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    db: Session = Depends(get_read_db)
+):
+    """Buscar productos por texto (español), ordenados por relevancia"""
+    product_repo = ProductRepository(db)
+    try:
+        page = product_repo.search_products_cached(
+            q,
+            limit=limit,
+            cursor=cursor,
+            store_id=store_id,
+            min_price_cop=min_price_cop,
+            max_price_cop=max_price_cop,
+            is_published=is_published
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    if page["next_cursor"]:
+        response.headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+    return page["items"]
@@ -1,11 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
-from ...db import get_db
+from ...db import get_db, get_read_db
+from ...core.pagination import INVALID_CURSOR_ERROR, set_next_cursor
 from ...repositories.store_repository import StoreRepository
-from ...schemas.store import StoreCreate, StoreOut, StoreUpdate
+from ...repositories.sales_rollup_repository import SalesRollupRepository
+from ...repositories.product_repository import ProductRepository
+from ...schemas.batch import BatchIdsIn
+from ...schemas.store import (
+    StoreCreate, StoreOut, StoreUpdate, StoreBatchOut, StoreSalesOut,
+    SALES_GRANULARITIES, MAX_SALES_RANGE_DAYS
+)
+from ...schemas.product import ProductOut, PRODUCT_SORTS
+from ...models.store_sales_daily import SALES_TIMEZONE
 
 # Constantes
 STORE_NOT_FOUND_ERROR = "Tienda no encontrada"
@@ -40,10 +51,24 @@ def create_store(
             detail=f"Error al crear la tienda: {str(e)}"
         )
 
+@router.post("/batch", response_model=StoreBatchOut)
+def get_stores_batch(
+    payload: BatchIdsIn,
+    db: Session = Depends(get_read_db)
+):
+    """Obtener varias tiendas por ID en una sola consulta"""
+    store_ids = list(dict.fromkeys(payload.ids))
+    store_repo = StoreRepository(db)
+    stores = {store.id: store for store in store_repo.get_stores_by_ids(store_ids)}
+    return StoreBatchOut(
+        items=stores,
+        missing=[store_id for store_id in store_ids if store_id not in stores]
+    )
+
 @router.get("/{store_id}", response_model=StoreOut)
 def get_store(
     store_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Obtener una tienda por ID"""
     store_repo = StoreRepository(db)
@@ -57,6 +82,75 @@ def get_store(
     
     return store
 
+@router.get("/{store_id:int}/products", response_model=List[ProductOut])
+def get_store_products(
+    store_id: int,
+    response: Response,
+    sort: str = Query("newest", description=f"Orden: {', '.join(PRODUCT_SORTS)}"),
+    is_published: Optional[bool] = Query(True, description="Filtrar por publicados"),
+    is_visible: Optional[bool] = Query(True, description="Filtrar por visibles"),
+    limit: int = Query(50, ge=1, le=200, description="Límite de resultados"),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    db: Session = Depends(get_read_db)
+):
+    """Catálogo de productos de una tienda, paginado por cursor"""
+    if sort not in PRODUCT_SORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"sort debe ser uno de: {', '.join(PRODUCT_SORTS)}"
+        )
+
+    product_repo = ProductRepository(db)
+    try:
+        products = product_repo.get_store_products(
+            store_id,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            is_published=is_published,
+            is_visible=is_visible
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, products, limit, PRODUCT_SORTS[sort][0])
+    return products
+
+@router.get("/{store_id:int}/sales", response_model=List[StoreSalesOut])
+def get_store_sales(
+    store_id: int,
+    date_from: Optional[date] = Query(None, alias="from", description="Fecha inicial (inclusive); por defecto hace 30 días"),
+    date_to: Optional[date] = Query(None, alias="to", description="Fecha final (inclusive); por defecto hoy"),
+    granularity: str = Query("day", description=f"Agrupación: {', '.join(SALES_GRANULARITIES)}"),
+    sub_order_status: Optional[List[str]] = Query(None, alias="status", description="Filtrar por estado de la sub-orden"),
+    db: Session = Depends(get_read_db)
+):
+    """Ventas de una tienda por periodo y estado (desde el rollup diario, en hora de Colombia)"""
+    if granularity not in SALES_GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"granularity debe ser uno de: {', '.join(SALES_GRANULARITIES)}"
+        )
+
+    date_to = date_to or datetime.now(ZoneInfo(SALES_TIMEZONE)).date()
+    date_from = date_from or date_to - timedelta(days=29)
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="La fecha inicial no puede ser posterior a la final"
+        )
+    if (date_to - date_from).days >= MAX_SALES_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El rango máximo es de {MAX_SALES_RANGE_DAYS} días"
+        )
+
+    rollup_repo = SalesRollupRepository(db)
+    return rollup_repo.get_sales(store_id, date_from, date_to, granularity, sub_order_status)
+
 @router.get("/external/{external_id}", response_model=StoreOut)
 def get_store_by_external_id(
     external_id: UUID,
@@ -64,7 +158,7 @@ def get_store_by_external_id(
 ):
     """Obtener una tienda por external_id"""
     store_repo = StoreRepository(db)
-    store = store_repo.get_store_by_external_id(str(external_id))
+    store = store_repo.get_cached_store_by_external_id(str(external_id))
     
     if not store:
         raise HTTPException(
@@ -81,7 +175,7 @@ def get_store_by_slug(
 ):
     """Obtener una tienda por slug"""
     store_repo = StoreRepository(db)
-    store = store_repo.get_store_by_slug(slug)
+    store = store_repo.get_cached_store_by_slug(slug)
     
     if not store:
         raise HTTPException(
@@ -93,36 +187,57 @@ def get_store_by_slug(
 
 @router.get("", response_model=List[StoreOut])
 def list_stores(
+    response: Response,
     owner_user_id: Optional[int] = Query(None, description="Filtrar por propietario"),
     plan: Optional[str] = Query(None, description="Filtrar por plan"),
     is_active: Optional[bool] = Query(None, description="Filtrar por estado activo"),
     country: Optional[str] = Query(None, description="Filtrar por país"),
     limit: int = Query(50, ge=1, le=200, description="Límite de resultados"),
-    offset: int = Query(0, ge=0, description="Offset para paginación"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
+    db: Session = Depends(get_read_db)
 ):
     """Listar tiendas con filtros opcionales"""
     store_repo = StoreRepository(db)
-    stores = store_repo.get_stores_with_filters(
-        owner_user_id=owner_user_id,
-        plan=plan,
-        is_active=is_active,
-        country=country,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        stores = store_repo.get_stores_with_filters(
+            owner_user_id=owner_user_id,
+            plan=plan,
+            is_active=is_active,
+            country=country,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, stores, limit)
     return stores
 
 @router.get("/owner/{owner_user_id}", response_model=List[StoreOut])
 def get_owner_stores(
     owner_user_id: int,
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
+    db: Session = Depends(get_read_db)
 ):
     """Obtener tiendas de un propietario específico"""
     store_repo = StoreRepository(db)
-    stores = store_repo.get_stores_by_owner(owner_user_id, limit, offset)
+    try:
+        stores = store_repo.get_stores_by_owner(owner_user_id, limit, offset, cursor=cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=INVALID_CURSOR_ERROR
+        )
+
+    set_next_cursor(response, stores, limit)
     return stores
 
 @router.put("/{store_id}", response_model=StoreOut)
@@ -1,15 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import any_
 from sqlalchemy.orm import Session
+from typing import Optional
 from uuid import uuid4
 from sqlalchemy.sql import func
 
-from ...db import get_db
+from ...db import get_db, get_read_db, bigint_array
+from ...core.pagination import INVALID_CURSOR_ERROR, apply_keyset_pagination, set_next_cursor
 from ...models.user import User
-from ...schemas.user import UserCreate, UserOut, UserUpdate
-from ...services.auth0 import update_auth0_user_metadata, create_auth0_user
+from ...schemas.batch import BatchIdsIn
+from ...repositories.auth0_outbox_repository import Auth0OutboxRepository
+from ...repositories.unread_counter_repository import UnreadCounterRepository
+from ...repositories.user_repository import UserRepository
+from ...schemas.user import UserCreate, UserOut, UserUpdate, UserBatchOut, UnreadCountsOut
+from ...services.auth0 import create_auth0_user
+from ...services.auth0_sync import auth0_sync_worker
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+def _auth0_metadata(user: User) -> dict:
+    return {
+        "numero": user.phone,
+        "id": user.id,
+        "is_verified": user.is_verified,
+        "can_sell": user.can_sell
+    }
+
 @router.post("", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 def create_user(payload: UserCreate, db: Session = Depends(get_db)):
     """Crear un nuevo usuario"""
@@ -48,41 +64,72 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db)):
     )
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
 
-    # Actualizar metadata en Auth0 (por si quieres guardar el id interno de tu BD)
+    # La metadata (con el id interno de la BD) se envía a Auth0 en segundo plano,
+    # desde el outbox escrito en la misma transacción que el usuario
     if auth0_user_id:
-        metadata = {
-            "numero": user.phone,
-            "id": user.id,
-            "is_verified": user.is_verified,
-            "can_sell": user.can_sell
-        }
-        try:
-            update_auth0_user_metadata(auth0_user_id, metadata)
-        except Exception as e:
-            print(f"Error actualizando metadata en Auth0: {e}")
+        Auth0OutboxRepository(db).enqueue_metadata(auth0_user_id, _auth0_metadata(user))
+
+    db.commit()
+    db.refresh(user)
+    auth0_sync_worker.wake()
 
     return user
 
+@router.post("/batch", response_model=UserBatchOut)
+def get_users_batch(payload: BatchIdsIn, db: Session = Depends(get_read_db)):
+    """Obtener varios usuarios por ID en una sola consulta"""
+    user_ids = list(dict.fromkeys(payload.ids))
+    users = {
+        user.id: user
+        for user in db.query(User)
+            .filter(User.id == any_(bigint_array(user_ids)))
+            .filter(User.deleted_at.is_(None))
+            .all()
+    }
+    return UserBatchOut(items=users, missing=[user_id for user_id in user_ids if user_id not in users])
+
 @router.get("/{user_id}", response_model=UserOut)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, db: Session = Depends(get_read_db)):
     """Obtener un usuario por ID"""
     user = db.query(User).filter(User.id == user_id).filter(User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
     return user
 
+@router.get("/{user_id}/unread-counts", response_model=UnreadCountsOut)
+def get_unread_counts(
+    user_id: int,
+    include_orders: bool = Query(True, description="Incluir el detalle por orden"),
+    db: Session = Depends(get_read_db)
+):
+    """Obtener los contadores de mensajes no leídos de un usuario"""
+    counter_repo = UnreadCounterRepository(db)
+    return UnreadCountsOut(
+        total=counter_repo.get_total(user_id),
+        orders=counter_repo.get_by_order(user_id) if include_orders else {}
+    )
+
 @router.get("", response_model=list[UserOut])
 def list_users(
-    db: Session = Depends(get_db),
+    response: Response,
+    db: Session = Depends(get_read_db),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor de paginación (cabecera X-Next-Cursor de la página anterior)"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Offset para paginación (obsoleto, usar cursor)"),
 ):
-    """Listar usuarios"""
-    q = db.query(User).filter(User.deleted_at.is_(None)).order_by(User.id).offset(offset).limit(limit)
-    return q.all()
+    """Listar usuarios (del más antiguo al más reciente)"""
+    q = db.query(User).filter(User.deleted_at.is_(None))
+    try:
+        users = apply_keyset_pagination(
+            q, User.created_at, User.id, limit, offset=offset, cursor=cursor, descending=False
+        ).all()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=INVALID_CURSOR_ERROR)
+
+    set_next_cursor(response, users, limit)
+    return users
 
 @router.put("/{user_id}", response_model=UserOut)
 def update_user(
@@ -95,27 +142,22 @@ def update_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
     
+    previous_auth0_user_id = user.auth0_user_id
     update_data = user_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
-
-    # Actualizar datos y metadata en Auth0 si el usuario tiene auth0_user_id
+    # Actualizar metadata en Auth0 si el usuario tiene auth0_user_id (vía outbox)
     auth0_user_id = user.auth0_user_id or getattr(user_data, 'auth0_user_id', None)
     if auth0_user_id:
-        metadata = {
-            "numero": user.phone,
-            "id": user.id,
-            "is_verified": user.is_verified,
-            "can_sell": user.can_sell
-        }
-        try:
-            update_auth0_user_metadata(auth0_user_id, metadata)
-            # Si se requiere actualizar email, nombre, etc. en Auth0, aquí puedes hacerlo
-        except Exception as e:
-            print(f"Error actualizando metadata en Auth0: {e}")
+        Auth0OutboxRepository(db).enqueue_metadata(auth0_user_id, _auth0_metadata(user))
+        # Si se requiere actualizar email, nombre, etc. en Auth0, aquí puedes hacerlo
+
+    db.commit()
+    db.refresh(user)
+    if user.auth0_user_id != previous_auth0_user_id:
+        UserRepository.invalidate_auth0_id(previous_auth0_user_id)
+    auth0_sync_worker.wake()
 
     return user
 
@@ -126,16 +168,14 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
 
-    # Eliminar en Auth0 si tiene auth0_user_id
+    # Eliminar en Auth0 si tiene auth0_user_id (vía outbox)
     if user.auth0_user_id:
-        try:
-            from ...services.auth0_delete import delete_auth0_user
-            delete_auth0_user(user.auth0_user_id)
-        except Exception as e:
-            print(f"Error eliminando usuario en Auth0: {e}")
+        Auth0OutboxRepository(db).enqueue_delete(user.auth0_user_id)
 
     user.deleted_at = func.now()
     db.commit()
+    UserRepository.invalidate_auth0_id(user.auth0_user_id)
+    auth0_sync_worker.wake()
 
 
 
@@ -0,0 +1,39 @@
+# src/async_db.py
+# Motor asyncpg para las rutas async. Se importa solo con DB_API_MODE=async: requiere
+# los paquetes asyncpg y greenlet, que los despliegues sync no necesitan.
+import os
+from fastapi import Request
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from .core.config import settings
+from .core.pool import InstrumentedAsyncQueuePool
+from .db import DATABASE_URL, POOL_OPTIONS, route_statement_timeout
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    poolclass=InstrumentedAsyncQueuePool,
+    # asyncpg no acepta `options`: el statement_timeout por defecto va en server_settings
+    connect_args=(
+        {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        if settings.DB_STATEMENT_TIMEOUT_MS else {}
+    ),
+    **POOL_OPTIONS
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        timeout_ms = route_statement_timeout(request)
+        if timeout_ms is not None:
+            db.info["statement_timeout_ms"] = timeout_ms
+        yield db
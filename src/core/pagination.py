@@ -0,0 +1,86 @@
+# src/core/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Tuple
+from fastapi import Response
+from sqlalchemy import desc, tuple_
+
+# Constantes
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+INVALID_CURSOR_ERROR = "Cursor de paginación inválido"
+
+def encode_cursor(*values: Any) -> str:
+    """Codificar los valores de la llave de ordenamiento en un cursor opaco"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *types: Callable[[Any], Any]) -> Tuple[Any, ...]:
+    """Decodificar un cursor opaco; lanza ValueError si no es válido"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(INVALID_CURSOR_ERROR)
+        return tuple(cast(value) for cast, value in zip(types, values))
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise ValueError(INVALID_CURSOR_ERROR) from e
+
+def apply_keyset_pagination(
+    query,
+    created_at_column,
+    id_column,
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    descending: bool = True
+):
+    """Paginar por (created_at, id) usando keyset; offset queda como respaldo obsoleto.
+
+    Funciona tanto con Query del ORM como con select() de Core.
+    """
+    if not cursor and offset:
+        query = apply_sort_keyset(query, created_at_column, id_column, limit, descending=descending)
+        return query.offset(offset)
+
+    return apply_sort_keyset(
+        query, created_at_column, id_column, limit,
+        cursor=cursor, descending=descending, parse=datetime.fromisoformat
+    )
+
+def apply_sort_keyset(
+    query,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    parse: Callable[[Any], Any] = int
+):
+    """Paginar por (sort_column, id) usando keyset; `parse` convierte el valor del cursor"""
+    if descending:
+        query = query.order_by(desc(sort_column), desc(id_column))
+    else:
+        query = query.order_by(sort_column, id_column)
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, parse, int)
+        key = tuple_(sort_column, id_column)
+        query = query.filter(key < (sort_value, last_id) if descending else key > (sort_value, last_id))
+
+    return query.limit(limit)
+
+def next_cursor(items: Sequence[Any], limit: int, sort_attribute: str = "created_at") -> Optional[str]:
+    """Cursor de la página siguiente, o None si ya no hay más resultados"""
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, sort_attribute), last.id)
+
+def set_next_cursor(response: Response, items: Sequence[Any], limit: int, sort_attribute: str = "created_at") -> None:
+    """Publicar el cursor de la página siguiente en la cabecera X-Next-Cursor"""
+    cursor = next_cursor(items, limit, sort_attribute)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
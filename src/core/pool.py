@@ -0,0 +1,102 @@
+# src/core/pool.py
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Límites superiores (ms) de los buckets del histograma de espera; el último es +inf
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+class PoolWaitStats:
+    """Histograma del tiempo que tarda en obtenerse una conexión del pool.
+
+    Incluye la espera en la cola, la apertura de conexiones de overflow y el pre-ping.
+    """
+
+    def __init__(self, buckets_ms: List[float] = WAIT_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(buckets_ms) + 1)
+        self._sum = 0.0
+        self._max = 0.0
+        self._timeouts = 0
+        self._waiting = 0
+
+    def enter(self) -> None:
+        with self._lock:
+            self._waiting += 1
+
+    def exit(self, seconds: float, timed_out: bool = False) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            self._waiting -= 1
+            self._counts[bisect_left(self.buckets_ms, ms)] += 1
+            self._sum += ms
+            self._max = max(self._max, ms)
+            if timed_out:
+                self._timeouts += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = sum(self._counts)
+            return {
+                "waiting": self._waiting,
+                "checkouts": count,
+                "timeouts": self._timeouts,
+                "wait_avg_ms": self._sum / count if count else 0.0,
+                "wait_max_ms": self._max,
+                "wait_histogram": [
+                    {"le_ms": le_ms, "count": n}
+                    for le_ms, n in zip(self.buckets_ms + [None], self._counts)
+                ],
+            }
+
+class InstrumentedPoolMixin:
+    """Mide cada checkout del pool y expone el estado del pool junto al histograma"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self):
+        self.wait_stats.enter()
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.wait_stats.exit(time.perf_counter() - start, timed_out)
+
+    def recreate(self):
+        # engine.dispose() reemplaza el pool: se conservan las métricas acumuladas
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            # overflow() es negativo mientras no se usan todas las conexiones base
+            "overflow": max(self.overflow(), 0),
+            "timeout_seconds": self.timeout(),
+            **self.wait_stats.get_stats(),
+        }
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_stats(pool) -> Optional[Dict[str, Any]]:
+    """Estado de un pool instrumentado (None si el motor usa otro pool)"""
+    return pool.get_stats() if isinstance(pool, InstrumentedPoolMixin) else None
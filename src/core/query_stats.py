@@ -0,0 +1,85 @@
+# src/core/query_stats.py
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Placeholders de psycopg2 (%(name)s, %s) y de asyncpg ($1)
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+# Listas de placeholders, p. ej. un IN expandido con un largo distinto en cada petición
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+# El SQL compilado se repite entre peticiones: la normalización se cachea por texto
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """Sentencia sin parámetros: dos ejecuciones con distintos valores tienen la misma forma"""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("?, ...", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+class QueryStats:
+    """Sentencias SQL ejecutadas durante una petición.
+
+    Se cuenta cada ejecución (un executemany cuenta una vez), el tiempo en la base, las
+    filas que reporta el driver y cuántas veces se repite cada forma de sentencia: la
+    misma forma muchas veces en una petición suele ser un N+1 (p. ej. una relación lazy
+    cargada dentro de un loop).
+    """
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.shapes: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, seconds: float, rows: int) -> None:
+        self.db_seconds += seconds
+        if rows > 0:
+            self.rows += rows
+        shape = self.shapes.setdefault(statement_shape(statement), [0, 0.0])
+        shape[0] += 1
+        shape[1] += seconds
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        """Formas ejecutadas al menos `threshold` veces, de la más repetida a la menos"""
+        if threshold <= 0:
+            return []
+        return [
+            {"statement": shape, "count": count, "db_ms": round(seconds * 1000, 3)}
+            for shape, (count, seconds) in sorted(self.shapes.items(), key=lambda item: -item[1][0])
+            if count >= threshold
+        ]
+
+    def get_stats(self, repeated_threshold: int = 0) -> Dict[str, Any]:
+        return {
+            "statements": self.statements,
+            "db_ms": round(self.db_seconds * 1000, 3),
+            "rows": self.rows,
+            "distinct_statements": len(self.shapes),
+            "repeated": self.repeated(repeated_threshold),
+        }
+
+# Estadísticas de la petición en curso. Las rutas sync corren en el threadpool con una
+# copia del contexto, que apunta al mismo QueryStats.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+# Sobre la clase Engine: cubre el motor sync, las réplicas y el sync_engine del motor async.
+# Las sentencias fuera de una petición (workers, jobs) no se registran.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        context._query_started_at = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if stats is not None and started_at is not None:
+        stats.record(statement, time.perf_counter() - started_at, cursor.rowcount)
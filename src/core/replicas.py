@@ -0,0 +1,123 @@
+# src/core/replicas.py
+import itertools
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .pool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+# Retraso de la réplica en segundos. Si ya aplicó todo el WAL recibido el retraso es 0,
+# aunque pg_last_xact_replay_timestamp() sea viejo porque el primario no tuvo escrituras.
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class Replica:
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.sessions = 0
+        self.evictions = 0
+
+class ReplicaSet:
+    """Réplicas de lectura elegidas en round-robin entre las sanas.
+
+    Una réplica sale de la rotación cuando falla una conexión o cuando su retraso supera
+    `max_lag`; un hilo la revisa cada `check_interval` y la reincorpora cuando responde
+    y está al día. Sin réplicas sanas, `choose` retorna una lista vacía y se lee del primario.
+    """
+
+    def __init__(self, replicas: List[Replica], max_lag: float, check_interval: float):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def start(self) -> None:
+        if not self.replicas or self.check_interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            for replica in self.replicas:
+                self.check(replica)
+
+    def check(self, replica: Replica) -> bool:
+        """Medir el retraso de una réplica y sacarla o reincorporarla según el resultado"""
+        try:
+            with replica.engine.connect() as connection:
+                lag = float(connection.execute(REPLICA_LAG_QUERY).scalar())
+        except Exception as e:
+            self.mark_down(replica, str(e))
+            return False
+
+        replica.lag_seconds = lag
+        if lag > self.max_lag:
+            self.mark_down(replica, f"Retraso de {lag:.1f}s (máximo {self.max_lag:.1f}s)")
+            return False
+        if not replica.healthy:
+            logger.info("Réplica %s reincorporada", replica.name)
+        replica.healthy = True
+        replica.last_error = None
+        return True
+
+    def mark_down(self, replica: Replica, error: str) -> None:
+        with self._lock:
+            if replica.healthy:
+                replica.evictions += 1
+                logger.warning("Réplica %s fuera de rotación: %s", replica.name, error)
+            replica.healthy = False
+            replica.last_error = error
+
+    def record_session(self, replica: Replica) -> None:
+        with self._lock:
+            replica.sessions += 1
+
+    def choose(self) -> List[Replica]:
+        """Réplicas sanas en el orden en que deben intentarse para esta sesión"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return []
+        start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "last_error": replica.last_error,
+                "sessions": replica.sessions,
+                "evictions": replica.evictions,
+                "pool": pool_stats(replica.engine.pool),
+            }
+            for replica in self.replicas
+        ]
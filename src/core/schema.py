@@ -0,0 +1,102 @@
+# src/core/schema.py
+import logging
+from typing import Optional
+
+from sqlalchemy import exc, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Revisión de Alembic que espera este código. Se actualiza junto con cada migración nueva:
+# migrations/env.py se niega a correr si no coincide con el head de migrations/versions.
+SCHEMA_REVISION = "0003"
+
+# Huella del esquema vivo: columnas (tipo, nulabilidad, default, identity), índices y
+# restricciones del esquema actual, sin las tablas de control de las migraciones, en un
+# md5. Se calcula en el servidor con una sola consulta al catálogo, sin traer la
+# descripción de cada tabla como create_all.
+SCHEMA_FINGERPRINT_SQL = """
+    SELECT md5(coalesce(string_agg(item, E'\\n' ORDER BY item), ''))
+    FROM (
+        SELECT format(
+            'column %s.%s %s notnull=%s default=%s identity=%s',
+            c.relname, a.attname, format_type(a.atttypid, a.atttypmod), a.attnotnull,
+            pg_get_expr(d.adbin, d.adrelid), a.attidentity
+        ) AS item
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+        WHERE c.relnamespace = current_schema()::regnamespace
+          AND c.relkind IN ('r', 'p', 'v', 'm')
+          AND a.attnum > 0 AND NOT a.attisdropped
+          AND c.relname NOT IN ('alembic_version', 'schema_fingerprint')
+        UNION ALL
+        SELECT 'index ' || pg_get_indexdef(i.indexrelid) || ' valid=' || i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indrelid
+        WHERE c.relnamespace = current_schema()::regnamespace
+          AND c.relname NOT IN ('alembic_version', 'schema_fingerprint')
+        UNION ALL
+        SELECT format('constraint %s.%s %s', c.relname, con.conname, pg_get_constraintdef(con.oid))
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        WHERE con.connamespace = current_schema()::regnamespace
+          AND c.relname NOT IN ('alembic_version', 'schema_fingerprint')
+    ) items
+"""
+
+class SchemaMismatchError(RuntimeError):
+    """La base no está en la revisión que espera el código o cambió fuera de las migraciones"""
+
+def compute_schema_fingerprint(connection: Connection) -> str:
+    return connection.execute(text(SCHEMA_FINGERPRINT_SQL)).scalar()
+
+def store_schema_fingerprint(connection: Connection, revision: Optional[str]) -> str:
+    """Guardar la huella del esquema tras correr las migraciones (lo llama migrations/env.py)"""
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_fingerprint (
+            id boolean PRIMARY KEY DEFAULT true CHECK (id),
+            revision text,
+            fingerprint text NOT NULL,
+            recorded_at timestamp with time zone NOT NULL DEFAULT now()
+        )
+    """))
+    fingerprint = compute_schema_fingerprint(connection)
+    connection.execute(
+        text("""
+            INSERT INTO schema_fingerprint (id, revision, fingerprint) VALUES (true, :revision, :fingerprint)
+            ON CONFLICT (id) DO UPDATE
+            SET revision = excluded.revision, fingerprint = excluded.fingerprint, recorded_at = now()
+        """),
+        {"revision": revision, "fingerprint": fingerprint}
+    )
+    return fingerprint
+
+def check_schema(engine: Engine, strict: bool = True) -> None:
+    """Verificación de arranque: una consulta compara la revisión y la huella guardadas
+    con las del esquema vivo. Con `strict` lanza SchemaMismatchError; si no, solo avisa."""
+    try:
+        with engine.connect() as connection:
+            row = connection.execute(text(f"""
+                SELECT
+                    (SELECT version_num FROM alembic_version) AS revision,
+                    (SELECT fingerprint FROM schema_fingerprint) AS stored,
+                    ({SCHEMA_FINGERPRINT_SQL}) AS live
+            """)).one()
+    except exc.ProgrammingError:
+        message = "la base no tiene migraciones aplicadas (falta alembic_version o schema_fingerprint); ejecutar `alembic upgrade head`"
+    else:
+        if row.revision != SCHEMA_REVISION:
+            message = f"la base está en la revisión {row.revision} y el código espera {SCHEMA_REVISION}; ejecutar `alembic upgrade head`"
+        elif row.stored != row.live:
+            message = (
+                "el esquema cambió fuera de las migraciones (la huella no coincide); llevar el cambio a una "
+                "migración, o aceptar el esquema actual con `alembic stamp head`"
+            )
+        else:
+            return
+
+    message = f"Esquema incompatible: {message}"
+    if strict:
+        raise SchemaMismatchError(message)
+    logger.warning(message)
@@ -0,0 +1,53 @@
+# src/jobs/check_search_index.py
+"""Verificar con EXPLAIN que la búsqueda de productos usa products_to_tsvector_idx.
+
+Pensado para correr después de migraciones o cambios en la consulta; termina con
+código 1 si el plan no usa el índice.
+Uso: python -m src.jobs.check_search_index [--q "zapatos de cuero"]
+"""
+import argparse
+import sys
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal
+from ..models.product import Product
+from ..repositories.product_repository import PRODUCT_SEARCH_DOCUMENT, SEARCH_CONFIG
+
+SEARCH_INDEX = "products_to_tsvector_idx"
+
+def search_plan(db: Session, q: str) -> str:
+    """Plan (EXPLAIN) de la condición de búsqueda de productos, con seq scan desactivado.
+
+    Sin seq scan se verifica que la expresión coincide con el índice, sin depender de
+    las estadísticas ni del tamaño de la tabla. Deja `enable_seqscan = off` hasta el
+    final de la transacción de `db`.
+    """
+    query = select(Product.id).where(
+        PRODUCT_SEARCH_DOCUMENT.op("@@")(func.plainto_tsquery(SEARCH_CONFIG, q))
+    )
+    sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    return "\n".join(row[0] for row in db.execute(text(f"EXPLAIN {sql}")))
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificar que la búsqueda usa el índice GIN")
+    parser.add_argument("--q", default="zapatos de cuero", help="Texto de prueba")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        plan = search_plan(db, args.q)
+    finally:
+        db.close()
+
+    print(plan)
+    if SEARCH_INDEX not in plan:
+        print(f"La búsqueda no usa {SEARCH_INDEX}", file=sys.stderr)
+        sys.exit(1)
+    print(f"OK: la búsqueda usa {SEARCH_INDEX}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# src/jobs/drain_auth0_outbox.py
+"""Enviar a Auth0 los cambios pendientes del outbox.
+
+Útil con AUTH0_OUTBOX_WORKERS=0 (sin hilos en la API) o para vaciar la cola a mano.
+Se puede correr en paralelo con los workers de la API: cada usuario lo procesa uno solo.
+Uso: python -m src.jobs.drain_auth0_outbox [--max-users N] [--requeue-failed]
+"""
+import argparse
+
+from ..db import SessionLocal
+from ..repositories.auth0_outbox_repository import Auth0OutboxRepository
+from ..services.auth0_sync import Auth0SyncWorker
+
+def main():
+    parser = argparse.ArgumentParser(description="Sincronizar con Auth0 los eventos pendientes del outbox")
+    parser.add_argument("--max-users", type=int, default=None, help="Máximo de usuarios a procesar")
+    parser.add_argument("--requeue-failed", action="store_true", help="Reintentar también los eventos fallidos")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        repo = Auth0OutboxRepository(db)
+        if args.requeue_failed:
+            print(f"Eventos fallidos reencolados: {repo.requeue_failed()}")
+
+        worker = Auth0SyncWorker(workers=0)
+        processed = worker.drain(max_users=args.max_users)
+        stats = worker.get_stats()
+        print(f"Usuarios procesados: {processed}, llamadas exitosas: {stats['calls']}, "
+              f"eventos combinados: {stats['coalesced']}, reintentos: {stats['retries']}, "
+              f"fallidos: {stats['failed_events']}")
+        print(f"Pendientes: {repo.get_stats()}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
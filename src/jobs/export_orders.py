@@ -0,0 +1,57 @@
+# src/jobs/export_orders.py
+"""Exportar órdenes, sub-órdenes e items (una fila por item) a CSV, NDJSON o Parquet.
+
+Uso: python -m src.jobs.export_orders ordenes.csv --created-from 2024-01-01 --created-to 2024-02-01
+     python -m src.jobs.export_orders - --format ndjson --store-id 3 > ordenes.ndjson
+"""
+import argparse
+import resource
+import sys
+import time
+from datetime import datetime
+
+from ..services.order_export import EXPORT_FORMATS, export_orders, parquet_available
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportar órdenes con un cursor del lado del servidor")
+    parser.add_argument("path", help="Archivo de salida, o - para stdout")
+    parser.add_argument("--format", dest="export_format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--status")
+    parser.add_argument("--store-id", type=int)
+    parser.add_argument("--created-from", type=datetime.fromisoformat, help="Fecha ISO (inclusive)")
+    parser.add_argument("--created-to", type=datetime.fromisoformat, help="Fecha ISO (exclusive)")
+    args = parser.parse_args()
+
+    if args.export_format == "parquet" and not parquet_available():
+        parser.error("El export en Parquet requiere instalar pyarrow")
+
+    started = time.perf_counter()
+    chunks = export_orders(
+        args.export_format,
+        user_id=args.user_id,
+        status=args.status,
+        store_id=args.store_id,
+        created_from=args.created_from,
+        created_to=args.created_to
+    )
+    output = sys.stdout.buffer if args.path == "-" else open(args.path, "wb")
+    written = 0
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+            written += len(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    # ru_maxrss está en KiB en Linux
+    peak_rss_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{written / 1024 / 1024:.1f} MiB escritos en {time.perf_counter() - started:.1f}s "
+        f"(RSS máximo {peak_rss_mib:.0f} MiB)",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
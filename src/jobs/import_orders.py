@@ -0,0 +1,36 @@
+# src/jobs/import_orders.py
+"""Importar órdenes históricas desde un archivo NDJSON (un OrderCreate por línea).
+
+Uso: python -m src.jobs.import_orders ordenes.ndjson [--chunk-size 5000]
+     cat ordenes.ndjson | python -m src.jobs.import_orders -
+"""
+import argparse
+import sys
+import time
+
+from ..services.order_import import CHUNK_SIZE, import_ndjson_lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Importar órdenes desde NDJSON usando COPY")
+    parser.add_argument("path", help="Archivo NDJSON, o - para leer de stdin")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Órdenes por transacción")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.path == "-":
+        report = import_ndjson_lines(sys.stdin.buffer, args.chunk_size)
+    else:
+        with open(args.path, "rb") as lines:
+            report = import_ndjson_lines(lines, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    print(report.model_dump_json(indent=2))
+    print(
+        f"{report.imported} órdenes importadas, {report.failed} líneas rechazadas "
+        f"en {elapsed:.1f}s ({report.imported / elapsed if elapsed else 0:.0f} órdenes/s)",
+        file=sys.stderr
+    )
+    sys.exit(1 if report.failed else 0)
+
+if __name__ == "__main__":
+    main()
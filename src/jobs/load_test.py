@@ -0,0 +1,131 @@
+# src/jobs/load_test.py
+"""Prueba de carga de las lecturas en modo sync y async (DB_API_MODE).
+
+Por cada modo lanza uvicorn con un worker, espera /health, calienta con pocas
+conexiones y luego mantiene --connections conexiones keep-alive haciendo GET sobre
+--paths durante --duration segundos. Reporta peticiones por segundo, p50/p99 y
+errores (timeouts y conexiones rechazadas) por modo. Usa la base del entorno
+(DATABASE_URL o DB_*), que debe tener datos para las rutas elegidas.
+
+Uso: python -m src.jobs.load_test [--modes sync,async] [--connections 500] [--duration 20]
+         [--paths /api/v1/orders/1,/api/v1/stores/1,/api/v1/orders/summary?limit=20]
+     python -m src.jobs.load_test --url http://127.0.0.1:8000   (servidor ya levantado)
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .measure_cold_start import _wait_for
+
+DEFAULT_PATHS = "/api/v1/orders/1,/api/v1/stores/1,/api/v1/orders/summary?limit=20"
+
+class LoadResult:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Dict[int, int] = {}
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def percentile_ms(self, fraction: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    def summary(self) -> str:
+        rps = len(self.latencies) / self.elapsed if self.elapsed else 0
+        p50, p99 = self.percentile_ms(0.5), self.percentile_ms(0.99)
+        latency = f"p50={p50:.0f}ms p99={p99:.0f}ms" if self.latencies else "sin respuestas"
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(self.statuses.items()))
+        return f"{len(self.latencies)} respuestas, {rps:.0f} req/s, {latency}, errores={self.errors} ({statuses})"
+
+async def _connection(host: str, port: int, paths: List[str], stop_at: float, timeout: float, result: LoadResult) -> None:
+    """Una conexión keep-alive que encadena peticiones hasta `stop_at`"""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        result.errors += 1
+        return
+    try:
+        while time.perf_counter() < stop_at:
+            path = random.choice(paths)
+            started = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+                length = 0
+                for line in head.split(b"\r\n")[1:]:
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                await asyncio.wait_for(reader.readexactly(length), timeout)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError):
+                # La conexión quedó en un estado desconocido: no se reutiliza
+                result.errors += 1
+                return
+            result.latencies.append(time.perf_counter() - started)
+            status = int(head.split(b" ", 2)[1])
+            result.statuses[status] = result.statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def _run_load(host: str, port: int, paths: List[str], connections: int, duration: float, timeout: float) -> LoadResult:
+    result = LoadResult()
+    started = time.perf_counter()
+    stop_at = started + duration
+    await asyncio.gather(*(_connection(host, port, paths, stop_at, timeout, result) for _ in range(connections)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+def run_load(base_url: str, paths: List[str], connections: int, duration: float, timeout: float) -> LoadResult:
+    url = urlsplit(base_url)
+    return asyncio.run(_run_load(url.hostname, url.port or 80, paths, connections, duration, timeout))
+
+def measure_mode(mode: str, port: int, args, paths: List[str]) -> LoadResult:
+    """Levantar la API con DB_API_MODE=`mode` y medirla"""
+    base_url = f"http://127.0.0.1:{port}"
+    # Sin workers del outbox: no compiten por CPU ni conexiones con la carga
+    env = {**os.environ, "DB_API_MODE": mode, "AUTH0_OUTBOX_WORKERS": "0"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+    try:
+        _wait_for(base_url + "/health", time.monotonic() + 60)
+        run_load(base_url, paths, args.warmup_connections, args.warmup, args.timeout)
+        return run_load(base_url, paths, args.connections, args.duration, args.timeout)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar lecturas sync y async bajo carga")
+    parser.add_argument("--modes", default="sync,async", help="Modos DB_API_MODE a medir, separados por coma")
+    parser.add_argument("--connections", type=int, default=500, help="Conexiones keep-alive concurrentes")
+    parser.add_argument("--duration", type=float, default=20, help="Segundos de carga por modo")
+    parser.add_argument("--paths", default=DEFAULT_PATHS, help="Rutas GET, separadas por coma (se eligen al azar)")
+    parser.add_argument("--timeout", type=float, default=40, help="Segundos máximos por respuesta")
+    parser.add_argument("--warmup", type=float, default=3, help="Segundos de calentamiento")
+    parser.add_argument("--warmup-connections", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--url", help="Medir un servidor ya levantado en vez de lanzar uno por modo")
+    args = parser.parse_args()
+    paths = args.paths.split(",")
+
+    if args.url:
+        result = run_load(args.url, paths, args.connections, args.duration, args.timeout)
+        print(f"{args.url}: {result.summary()}")
+        return
+
+    for mode in args.modes.split(","):
+        result = measure_mode(mode, args.port, args, paths)
+        print(f"{mode} ({args.connections} conexiones, {args.duration:.0f}s): {result.summary()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# src/jobs/measure_cold_start.py
+"""Medir el arranque en frío de la API hasta la primera respuesta.
+
+Cada corrida importa la app en un proceso nuevo con `-X importtime` (uvicorn la carga
+con importlib, que no pasa por -X importtime) y luego lanza uvicorn. Reporta la
+importación de los modelos (src.models) y de la app con sus routers (src.main), el tiempo
+hasta que /health responde (incluye el lifespan: verificación de esquema, workers) y
+hasta la primera respuesta de --path. Usa la configuración del entorno: con
+SCHEMA_CHECK=create se mide el arranque con create_all para comparar.
+
+Uso: python -m src.jobs.measure_cold_start [--runs 5] [--port 8765] [--path /api/v1/stores?limit=1]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+POLL_SECONDS = 0.005
+
+def _get(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            response.read()
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError):
+        return False
+
+def _wait_for(url: str, deadline: float) -> float:
+    while time.monotonic() < deadline:
+        if _get(url):
+            return time.monotonic()
+        time.sleep(POLL_SECONDS)
+    raise TimeoutError(f"{url} no respondió a tiempo")
+
+def _import_times_ms(importtime_log: str, modules) -> dict:
+    """Tiempo acumulado de importación (ms) de cada módulo, según -X importtime"""
+    times = {}
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if name in modules and cumulative.strip().isdigit():
+            times[name] = int(cumulative) / 1000
+    return times
+
+def measure(port: int, path: str, timeout: float) -> dict:
+    probe = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        capture_output=True, text=True, timeout=timeout, check=True
+    )
+    imports = _import_times_ms(probe.stderr, {"src.models", "src.main"})
+
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"]
+    )
+    try:
+        deadline = start + timeout
+        ready = _wait_for(base_url + "/health", deadline)
+        first = _wait_for(base_url + path, deadline)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    return {
+        "import_models_ms": imports.get("src.models"),
+        "import_app_ms": imports.get("src.main"),
+        "ready_ms": (ready - start) * 1000,
+        "first_request_ms": (first - start) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Medir el arranque en frío hasta la primera respuesta")
+    parser.add_argument("--runs", type=int, default=5, help="Procesos a lanzar")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", default="/health", help="Ruta de la primera petición")
+    parser.add_argument("--timeout", type=float, default=60, help="Segundos máximos por corrida")
+    args = parser.parse_args()
+
+    runs = []
+    for i in range(args.runs):
+        result = measure(args.port, args.path, args.timeout)
+        runs.append(result)
+        print(f"corrida {i + 1}: " + ", ".join(
+            f"{key}={value:.1f}" for key, value in result.items() if value is not None
+        ))
+
+    print("mediana: " + ", ".join(
+        f"{key}={statistics.median(run[key] for run in runs):.1f}"
+        for key in runs[0] if runs[0][key] is not None
+    ))
+
+if __name__ == "__main__":
+    main()
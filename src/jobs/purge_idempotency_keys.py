@@ -0,0 +1,24 @@
+# src/jobs/purge_idempotency_keys.py
+"""Eliminar las Idempotency-Key vencidas.
+
+Uso: python -m src.jobs.purge_idempotency_keys --batch-size 1000
+"""
+import argparse
+
+from ..db import SessionLocal
+from ..repositories.idempotency_repository import IdempotencyRepository
+
+def main():
+    parser = argparse.ArgumentParser(description="Eliminar las Idempotency-Key vencidas")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Llaves por transacción")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        purged = IdempotencyRepository(db).purge_expired(batch_size=args.batch_size)
+        print(f"Se eliminaron {purged} llaves vencidas")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
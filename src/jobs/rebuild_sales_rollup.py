@@ -0,0 +1,25 @@
+# src/jobs/rebuild_sales_rollup.py
+"""Reconstruir el rollup de ventas diarias por tienda desde sub_orders.
+
+Uso: python -m src.jobs.rebuild_sales_rollup [--store-id 1 --store-id 2] [--batch-size 100]
+"""
+import argparse
+
+from ..db import SessionLocal
+from ..repositories.sales_rollup_repository import SalesRollupRepository
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruir el rollup de ventas por tienda")
+    parser.add_argument("--store-id", type=int, action="append", help="Solo estas tiendas (por defecto todas)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Tiendas por transacción")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuilt = SalesRollupRepository(db).rebuild(store_ids=args.store_id, batch_size=args.batch_size)
+        print(f"Rollup de ventas reconstruido para {rebuilt} tiendas")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
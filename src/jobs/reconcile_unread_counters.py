@@ -0,0 +1,24 @@
+# src/jobs/reconcile_unread_counters.py
+"""Recalcular los contadores de mensajes no leídos desde order_messages.
+
+Uso: python -m src.jobs.reconcile_unread_counters --batch-size 1000
+"""
+import argparse
+
+from ..db import SessionLocal
+from ..repositories.unread_counter_repository import UnreadCounterRepository
+
+def main():
+    parser = argparse.ArgumentParser(description="Recalcular los contadores de mensajes no leídos")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Usuarios por transacción")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        reconciled = UnreadCounterRepository(db).reconcile(batch_size=args.batch_size)
+        print(f"Contadores recalculados para {reconciled} usuarios")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
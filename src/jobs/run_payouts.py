@@ -0,0 +1,27 @@
+# src/jobs/run_payouts.py
+"""Generar los payouts de las sub-órdenes entregadas que aún no tienen uno.
+
+Se puede correr en paralelo y volver a correr tras una falla.
+Uso: python -m src.jobs.run_payouts [--batch-size 1000] [--max-batches N]
+"""
+import argparse
+
+from ..db import SessionLocal
+from ..repositories.payout_repository import PayoutRepository
+
+def main():
+    parser = argparse.ArgumentParser(description="Generar payouts de sub-órdenes entregadas")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Sub-órdenes por transacción")
+    parser.add_argument("--max-batches", type=int, default=None, help="Máximo de lotes en esta corrida")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        run = PayoutRepository(db).run_payouts(batch_size=args.batch_size, max_batches=args.max_batches)
+        print(run.model_dump_json(indent=2))
+        print(f"Corrida {run.batch_id}: {run.payouts} payouts por {run.amount_cop} centavos en {len(run.stores)} tiendas")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
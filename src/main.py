@@ -1,32 +1,96 @@
 # src/main.py
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from .db import engine, Base
+from .db import engine, Base, DB_API_MODE, get_pool_stats, replica_set
+from .core.config import settings
+from .core.schema import check_schema
+from .core.pagination import NEXT_CURSOR_HEADER
 from .models import user as users_model, order as orders_model  
 from .api.v1.users import router as users_router
 from .api.v1.orders import router as orders_router
 from .api.v1.stores import router as stores_router
+from .api.v1.products import router as products_router
+from .api.v1.admin import router as admin_router
+from .services.idempotency import IdempotencyMiddleware, REPLAYED_HEADER
+from .services.read_routing import ReadYourWritesMiddleware
+from .services.sql_instrumentation import SQLInstrumentationMiddleware
+from .services.message_broker import message_broker
+from .services.auth0_sync import auth0_sync_worker
+from .services.auth import token_verifier
 from fastapi.middleware.cors import CORSMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    # El esquema lo manejan las migraciones (alembic upgrade head); aquí solo se verifica
+    if settings.SCHEMA_CHECK == "create":
+        Base.metadata.create_all(bind=engine)
+    elif settings.SCHEMA_CHECK != "off":
+        check_schema(engine, strict=settings.SCHEMA_CHECK == "strict")
+    message_broker.start()
+    auth0_sync_worker.start()
+    token_verifier.jwks.start()
+    replica_set.start()
     yield
+    if DB_API_MODE == "async":
+        from .async_db import async_engine
+        await async_engine.dispose()
+    replica_set.stop()
+    token_verifier.jwks.stop()
+    auth0_sync_worker.stop()
+    message_broker.stop()
 
 app = FastAPI(title="LUM Backend", lifespan=lifespan)
 
+# Reintentos de POST con Idempotency-Key repiten la respuesta guardada
+app.add_middleware(
+    IdempotencyMiddleware,
+    paths=["/api/v1/orders", "/api/v1/stores", "/api/v1/users"],
+)
+
+# Lecturas al primario por unos segundos después de escribir (solo con réplicas)
+app.add_middleware(
+    ReadYourWritesMiddleware,
+    read_only_paths=["/api/v1/stores/batch", "/api/v1/users/batch"],
+)
+
+# Sentencias SQL por petición: Server-Timing, log y presupuesto por ruta. Va por fuera
+# de los demás middlewares para contar también sus consultas (p. ej. idempotencia).
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(SQLInstrumentationMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],  # Cambia esto por el dominio de tu frontend en producción
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, REPLAYED_HEADER],
 )
 
+if DB_API_MODE == "async":
+    # Las lecturas async de órdenes y tiendas se registran primero: reemplazan a las sync
+    from .api.v1.async_orders import router as async_orders_router
+    from .api.v1.async_stores import router as async_stores_router
+    app.include_router(async_orders_router, prefix="/api/v1")
+    app.include_router(async_stores_router, prefix="/api/v1")
+
 app.include_router(users_router, prefix="/api/v1")
 app.include_router(orders_router, prefix="/api/v1")
 app.include_router(stores_router, prefix="/api/v1")
+app.include_router(products_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
+
+# Campos del pool que se reportan en /health (el histograma completo está en /admin/db-pool)
+HEALTH_POOL_FIELDS = ("size", "checked_out", "overflow", "waiting", "timeouts", "wait_max_ms")
 
+# async: responde aunque el threadpool esté ocupado esperando conexiones
 @app.get("/health")
-def health():
-    return {"status": "ok"}
\ No newline at end of file
+async def health():
+    pools = {
+        name: {field: stats[field] for field in HEALTH_POOL_FIELDS}
+        for name, stats in get_pool_stats().items() if stats is not None
+    }
+    health = {"status": "ok", "db_pool": pools}
+    if replica_set:
+        health["replicas"] = {replica.name: replica.healthy for replica in replica_set.replicas}
+    return health
\ No newline at end of file
@@ -1,4 +1,3 @@
-
 from .user import User
 from .order import Order, SubOrder, OrderItem, OrderMessage
 from .payment_intent import PaymentIntent
@@ -13,6 +12,10 @@ from .reservation import Reservation
 from .product_version import ProductVersion
 from .image import Image
 from .event_store import EventStore
+from .unread_counter import UserUnreadCounter, UserOrderUnreadCounter
+from .idempotency_key import IdempotencyKey
+from .store_sales_daily import StoreSalesDaily
+from .auth0_outbox import Auth0OutboxEvent
 
 __all__ = [
     "User",
@@ -32,4 +35,9 @@ __all__ = [
     "ProductVersion",
     "Image",
     "EventStore",
+    "UserUnreadCounter",
+    "UserOrderUnreadCounter",
+    "IdempotencyKey",
+    "StoreSalesDaily",
+    "Auth0OutboxEvent",
 ]
\ No newline at end of file
@@ -0,0 +1,34 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from ..db import Base
+
+class Auth0OutboxEvent(Base):
+    """Cambios pendientes de sincronizar con Auth0, escritos en la misma transacción que el usuario"""
+    __tablename__ = "auth0_outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    auth0_user_id = Column(Text, nullable=False)
+    operation = Column(Text, nullable=False)  # update_metadata | delete
+    payload = Column(JSONB)
+    status = Column(Text, nullable=False, server_default="pending")  # pending | failed
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # Solo los pendientes: los eventos enviados se eliminan
+        Index(
+            "auth0_outbox_pending_next_attempt_idx",
+            "next_attempt_at",
+            "id",
+            postgresql_where=text("status = 'pending'")
+        ),
+        Index(
+            "auth0_outbox_pending_user_idx",
+            "auth0_user_id",
+            "id",
+            postgresql_where=text("status = 'pending'")
+        ),
+    )
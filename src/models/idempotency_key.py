@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Index, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from ..db import Base
+
+class IdempotencyKey(Base):
+    """Respuestas guardadas por cabecera Idempotency-Key para reintentos de POST"""
+    __tablename__ = "idempotency_keys"
+
+    # Hash de la llave del cliente junto con su dueño, el método y la ruta
+    key = Column(Text, primary_key=True)
+    method = Column(Text, nullable=False)
+    path = Column(Text, nullable=False)
+    request_hash = Column(Text, nullable=False)
+    status = Column(Text, nullable=False, server_default="in_progress")  # in_progress | completed
+    response_status = Column(Integer)
+    response_content_type = Column(Text)
+    # Headers de la respuesta como lista de [nombre, valor] (admite repetidos, p. ej. Set-Cookie)
+    response_headers = Column(JSONB)
+    response_body = Column(Text)
+    locked_until = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("idempotency_keys_expires_at_idx", "expires_at"),
+    )
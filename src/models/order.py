@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, Boolean, Column, DateTime, Text, Index, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Text, Index, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,7 +20,8 @@ class Order(Base):
     status = Column(Text, nullable=False, server_default="pending")
     shipping_address = Column(JSONB)
     billing_address = Column(JSONB)
-    order_metadata = Column(JSONB)  # Cambiado de metadataimg a order_metadata
+    # La columna es `metadata`; el atributo no puede llamarse así en un modelo declarativo
+    order_metadata = Column("metadata", JSONB)
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
@@ -34,6 +35,9 @@ class Order(Base):
     __table_args__ = (
         Index("orders_user_id_idx", "user_id"),
         Index("orders_created_at_idx", "created_at"),
+        # Índices para la paginación por cursor (created_at, id)
+        Index("orders_created_at_id_idx", "created_at", "id"),
+        Index("orders_user_id_created_at_id_idx", "user_id", "created_at", "id"),
     )
 
 class SubOrder(Base):
@@ -106,4 +110,16 @@ class OrderMessage(Base):
         Index("order_messages_order_id_idx", "order_id"),
         Index("order_messages_from_user_id_idx", "from_user_id"),
         Index("order_messages_to_user_id_idx", "to_user_id"),
+        # Paginación del historial por (order_id, id)
+        Index("order_messages_order_id_id_idx", "order_id", "id"),
+        # Marcado masivo de leídos por (order_id, to_user_id) sobre los no leídos
+        Index(
+            "order_messages_unread_idx", "order_id", "to_user_id", "id",
+            postgresql_where=text("is_read = false")
+        ),
+        # Recalculo de contadores de no leídos por destinatario
+        Index(
+            "order_messages_to_user_unread_idx", "to_user_id", "order_id",
+            postgresql_where=text("is_read = false")
+        ),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, Column, DateTime, Text, ForeignKey
+from sqlalchemy import BigInteger, Column, DateTime, Index, Text, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,8 +14,20 @@ class Payout(Base):
     status = Column(Text, nullable=False, server_default="pending")
     provider = Column(Text)
     provider_payout_id = Column(Text)
+    batch_id = Column(UUID(as_uuid=True))  # Corrida de liquidación que generó el payout
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     processed_at = Column(DateTime(timezone=True))
 
     # Relaciones
-    sub_order = relationship("SubOrder", back_populates="payouts")
\ No newline at end of file
+    sub_order = relationship("SubOrder", back_populates="payouts")
+
+    __table_args__ = (
+        # Un solo payout vigente por sub-orden; uno fallido se puede volver a generar
+        Index(
+            "payouts_sub_order_id_active_key",
+            "sub_order_id",
+            unique=True,
+            postgresql_where=text("status <> 'failed'")
+        ),
+        Index("payouts_batch_id_idx", "batch_id"),
+    )
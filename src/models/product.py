@@ -1,7 +1,12 @@
-from sqlalchemy import BigInteger, Column, Text, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Index, Text, ForeignKey, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from ..db import Base
 
+# Productos que se muestran en el catálogo público de una tienda
+STOREFRONT_PRODUCTS_WHERE = text("is_published AND is_visible AND deleted_at IS NULL")
+
 class Product(Base):
     __tablename__ = "products"
 
@@ -14,13 +19,36 @@ class Product(Base):
     condition = Column(Text, default='new')
     price_cop = Column(BigInteger, nullable=False)
     currency = Column(Text, default='COP')
-    is_published = Column(BigInteger, default=False)
-    is_visible = Column(BigInteger, default=True)
-    attributes = Column(Text)  # jsonb, pero para SQLAlchemy simple puede ser Text
-    created_at = Column(Text)  # timestamp with time zone, para SQLAlchemy simple puede ser Text
-    updated_at = Column(Text)  # timestamp with time zone
-    deleted_at = Column(Text)
+    is_published = Column(Boolean, nullable=False, server_default="false")
+    is_visible = Column(Boolean, nullable=False, server_default="true")
+    attributes = Column(JSONB)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    deleted_at = Column(DateTime(timezone=True))
 
     # Relación inversa
     order_items = relationship("OrderItem", back_populates="product")
-    store = relationship("Store", back_populates="products")
\ No newline at end of file
+    store = relationship("Store", back_populates="products")
+
+    __table_args__ = (
+        # Catálogo de la tienda paginado por (created_at, id) o por (price_cop, id)
+        Index(
+            "products_storefront_created_at_id_idx", "store_id", "created_at", "id",
+            postgresql_where=STOREFRONT_PRODUCTS_WHERE
+        ),
+        Index(
+            "products_storefront_price_cop_id_idx", "store_id", "price_cop", "id",
+            postgresql_where=STOREFRONT_PRODUCTS_WHERE
+        ),
+        # Búsqueda de texto completo (GET /products/search consulta esta misma expresión)
+        Index(
+            "products_to_tsvector_idx",
+            text("to_tsvector('spanish', COALESCE(title, '') || ' ' || COALESCE(description, ''))"),
+            postgresql_using="gin"
+        ),
+        # Listados que incluyen productos no publicados u ocultos
+        Index(
+            "products_store_id_created_at_id_idx", "store_id", "created_at", "id",
+            postgresql_where=text("deleted_at IS NULL")
+        ),
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Text
+from sqlalchemy.sql import func
+from ..db import Base
+
+# Zona horaria en la que se agrupan las ventas por día
+SALES_TIMEZONE = "America/Bogota"
+
+class StoreSalesDaily(Base):
+    """Ventas pre-agregadas por tienda, día (hora de Colombia) y estado de la sub-orden"""
+    __tablename__ = "store_sales_daily"
+
+    store_id = Column(BigInteger, ForeignKey("stores.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(Text, primary_key=True)
+    sub_order_count = Column(BigInteger, nullable=False, server_default="0")
+    units = Column(BigInteger, nullable=False, server_default="0")
+    gmv_cop = Column(BigInteger, nullable=False, server_default="0")
+    shipping_cop = Column(BigInteger, nullable=False, server_default="0")
+    marketplace_fee_cop = Column(BigInteger, nullable=False, server_default="0")
+    seller_net_cop = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -34,4 +34,7 @@ class Store(Base):
     __table_args__ = (
         Index("stores_owner_user_id_slug_idx", "owner_user_id", "slug"),
         Index("stores_plan_idx", "plan"),
+        # Índices para la paginación por cursor (created_at, id)
+        Index("stores_created_at_id_idx", "created_at", "id"),
+        Index("stores_owner_user_id_created_at_id_idx", "owner_user_id", "created_at", "id"),
     )
@@ -0,0 +1,20 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from ..db import Base
+
+class UserUnreadCounter(Base):
+    """Total de mensajes no leídos por usuario (badge del inbox)"""
+    __tablename__ = "user_unread_counters"
+
+    user_id = Column(BigInteger, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+class UserOrderUnreadCounter(Base):
+    """Mensajes no leídos por usuario y orden"""
+    __tablename__ = "user_order_unread_counters"
+
+    user_id = Column(BigInteger, ForeignKey("users.id"), primary_key=True)
+    order_id = Column(BigInteger, ForeignKey("orders.id"), primary_key=True)
+    unread_count = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
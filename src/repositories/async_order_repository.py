@@ -0,0 +1,95 @@
+from typing import Dict, List, Optional
+from sqlalchemy import any_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.pagination import apply_keyset_pagination
+from ..db import bigint_array
+from ..models.order import Order
+from ..schemas.order import OrderSummaryOut
+from .order_repository import (
+    ORDER_LOADING, order_filters, order_graph_options, order_item_counts_query, order_summary_query
+)
+
+class AsyncOrderRepository:
+    """Lecturas de órdenes sobre AsyncSession (asyncpg), con las mismas consultas que OrderRepository.
+
+    Con AsyncSession no hay carga perezosa: todo lo que serializa OrderOut se carga con
+    las estrategias de ORDER_LOADING, igual que en la versión sync.
+    """
+
+    def __init__(self, db: AsyncSession, loading: Optional[Dict[str, str]] = None):
+        self.db = db
+        self.loading = {**ORDER_LOADING, **(loading or {})}
+
+    def _select_orders(self):
+        return select(Order).options(order_graph_options(self.loading))
+
+    async def get_order_by_id(self, order_id: int) -> Optional[Order]:
+        """Obtener una orden por ID con todas sus relaciones"""
+        result = await self.db.execute(self._select_orders().where(Order.id == order_id))
+        return result.scalars().first()
+
+    async def get_order_by_external_id(self, external_id: str) -> Optional[Order]:
+        """Obtener una orden por external_id"""
+        result = await self.db.execute(self._select_orders().where(Order.external_id == external_id))
+        return result.scalars().first()
+
+    async def get_orders_by_ids(self, order_ids: List[int]) -> List[Order]:
+        """Obtener varias órdenes por ID en una sola consulta (WHERE id = ANY(:ids))"""
+        result = await self.db.execute(self._select_orders().where(Order.id == any_(bigint_array(order_ids))))
+        return result.scalars().all()
+
+    async def get_orders_by_user(
+        self,
+        user_id: int,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[Order]:
+        """Obtener órdenes de un usuario específico"""
+        query = self._select_orders().where(Order.user_id == user_id)
+        result = await self.db.execute(
+            apply_keyset_pagination(query, Order.created_at, Order.id, limit, offset=offset, cursor=cursor)
+        )
+        return result.scalars().all()
+
+    async def get_orders_with_filters(
+        self,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        store_id: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[Order]:
+        """Obtener órdenes con filtros múltiples (paginación por cursor sobre created_at, id)"""
+        query = self._select_orders().where(*order_filters(user_id, status, store_id))
+        result = await self.db.execute(
+            apply_keyset_pagination(query, Order.created_at, Order.id, limit, offset=offset, cursor=cursor)
+        )
+        return result.scalars().all()
+
+    async def get_order_summaries(
+        self,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        store_id: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[OrderSummaryOut]:
+        """Resumen de órdenes como filas de Core, con los conteos de items en una sola consulta"""
+        result = await self.db.execute(
+            order_summary_query(order_filters(user_id, status, store_id), limit, offset=offset, cursor=cursor)
+        )
+        rows = result.mappings().all()
+
+        if not rows:
+            return []
+
+        counts = await self.db.execute(order_item_counts_query([row["id"] for row in rows]))
+        item_counts = dict(counts.all())
+
+        return [
+            OrderSummaryOut(**row, item_count=item_counts.get(row["id"], 0))
+            for row in rows
+        ]
@@ -0,0 +1,73 @@
+from typing import List, Optional
+from sqlalchemy import any_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.pagination import apply_keyset_pagination
+from ..db import bigint_array
+from ..models.stores import Store
+from ..schemas.store import StoreOut
+from .store_repository import _external_id_key, _slug_key, store_cache, store_filters
+
+class AsyncStoreRepository:
+    """Lecturas de tiendas sobre AsyncSession (asyncpg).
+
+    StoreOut no incluye relaciones, así que no se cargan owner ni store_users.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _first(self, *conditions) -> Optional[Store]:
+        result = await self.db.execute(select(Store).where(Store.deleted_at.is_(None), *conditions))
+        return result.scalars().first()
+
+    async def get_store_by_id(self, store_id: int) -> Optional[Store]:
+        """Obtener una tienda por ID"""
+        return await self._first(Store.id == store_id)
+
+    async def get_store_by_external_id(self, external_id: str) -> Optional[Store]:
+        """Obtener una tienda por external_id"""
+        return await self._first(Store.external_id == external_id)
+
+    async def get_store_by_slug(self, slug: str) -> Optional[Store]:
+        """Obtener una tienda por slug"""
+        return await self._first(Store.slug == slug)
+
+    async def _load_store_out(self, *conditions) -> Optional[StoreOut]:
+        store = await self._first(*conditions)
+        return StoreOut.model_validate(store) if store else None
+
+    async def get_cached_store_by_slug(self, slug: str) -> Optional[StoreOut]:
+        """Obtener una tienda por slug pasando por el caché de lectura (el mismo de StoreRepository)"""
+        return await store_cache.get_or_load_async(
+            _slug_key(slug), lambda: self._load_store_out(Store.slug == slug)
+        )
+
+    async def get_cached_store_by_external_id(self, external_id: str) -> Optional[StoreOut]:
+        """Obtener una tienda por external_id pasando por el caché de lectura"""
+        return await store_cache.get_or_load_async(
+            _external_id_key(external_id), lambda: self._load_store_out(Store.external_id == external_id)
+        )
+
+    async def get_stores_by_ids(self, store_ids: List[int]) -> List[Store]:
+        """Obtener varias tiendas por ID en una sola consulta (WHERE id = ANY(:ids))"""
+        result = await self.db.execute(
+            select(Store).where(Store.id == any_(bigint_array(store_ids)), Store.deleted_at.is_(None))
+        )
+        return result.scalars().all()
+
+    async def get_stores_with_filters(
+        self,
+        owner_user_id: Optional[int] = None,
+        plan: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        country: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[Store]:
+        """Obtener tiendas con filtros múltiples (paginación por cursor sobre created_at, id)"""
+        query = select(Store).where(*store_filters(owner_user_id, plan, is_active, country))
+        result = await self.db.execute(
+            apply_keyset_pagination(query, Store.created_at, Store.id, limit, offset=offset, cursor=cursor)
+        )
+        return result.scalars().all()
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import any_, delete, exists, func, select, update
+from ..db import bigint_array
+from ..models.auth0_outbox import Auth0OutboxEvent
+
+# Primer argumento de pg_try_advisory_xact_lock para no chocar con otros locks advisory
+OUTBOX_LOCK_NAMESPACE = 20190
+# Usuarios candidatos que se revisan por cada intento de tomar trabajo
+CLAIM_CANDIDATES = 20
+
+class Auth0OutboxRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue_metadata(self, auth0_user_id: str, metadata: Dict[str, Any]) -> None:
+        """Encolar una actualización de user_metadata (sin commit: va en la transacción del usuario)"""
+        self.db.add(Auth0OutboxEvent(auth0_user_id=auth0_user_id, operation="update_metadata", payload=metadata))
+
+    def enqueue_delete(self, auth0_user_id: str) -> None:
+        """Encolar la eliminación del usuario en Auth0 (sin commit)"""
+        self.db.add(Auth0OutboxEvent(auth0_user_id=auth0_user_id, operation="delete"))
+
+    def claim_user(self, lease_seconds: float) -> Optional[Tuple[str, List[Auth0OutboxEvent]]]:
+        """Tomar todos los eventos pendientes del usuario con el evento vencido más antiguo.
+
+        Los eventos tomados quedan con un lease: `next_attempt_at` pasa a now() +
+        `lease_seconds`, de modo que el worker puede hacer commit y llamar a Auth0 sin
+        retener la transacción. Si el worker muere, los eventos vuelven a estar vencidos
+        al terminar el lease. Un usuario con algún evento en lease o esperando un
+        reintento no se toma: los eventos nuevos esperan y salen junto con esos, en orden.
+
+        Un lock advisory por usuario (liberado al hacer commit o rollback) evita que dos
+        workers, de cualquier proceso, tomen al mismo usuario a la vez.
+        """
+        waiting = aliased(Auth0OutboxEvent)
+        candidates = self.db.execute(
+            select(Auth0OutboxEvent.auth0_user_id)
+            .where(
+                Auth0OutboxEvent.status == "pending",
+                Auth0OutboxEvent.next_attempt_at <= func.now(),
+                ~exists().where(
+                    waiting.auth0_user_id == Auth0OutboxEvent.auth0_user_id,
+                    waiting.status == "pending",
+                    waiting.next_attempt_at > func.now()
+                )
+            )
+            .group_by(Auth0OutboxEvent.auth0_user_id)
+            .order_by(func.min(Auth0OutboxEvent.id))
+            .limit(CLAIM_CANDIDATES)
+        ).scalars().all()
+
+        for auth0_user_id in candidates:
+            locked = self.db.execute(
+                select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_NAMESPACE, func.hashtext(auth0_user_id)))
+            ).scalar()
+            if not locked:
+                continue
+
+            rows = self.db.execute(
+                select(Auth0OutboxEvent, Auth0OutboxEvent.next_attempt_at <= func.now())
+                .where(Auth0OutboxEvent.auth0_user_id == auth0_user_id, Auth0OutboxEvent.status == "pending")
+                .order_by(Auth0OutboxEvent.id)
+                .with_for_update(of=Auth0OutboxEvent)
+            ).all()
+            # Otro worker pudo tomarlo (y hacer commit) entre la consulta de candidatos y el lock
+            if not rows or not all(due for _, due in rows):
+                continue
+
+            events = [event for event, _ in rows]
+            self.db.execute(
+                update(Auth0OutboxEvent)
+                .where(Auth0OutboxEvent.id == any_(bigint_array(event.id for event in events)))
+                .values(next_attempt_at=func.now() + timedelta(seconds=lease_seconds))
+                .execution_options(synchronize_session=False)
+            )
+            return auth0_user_id, events
+
+        return None
+
+    def mark_sent(self, event_ids: List[int]) -> None:
+        """Eliminar los eventos ya aplicados en Auth0"""
+        self.db.execute(delete(Auth0OutboxEvent).where(Auth0OutboxEvent.id == any_(bigint_array(event_ids))))
+
+    def mark_failed(self, event_ids: List[int], error: str, retry_at: Optional[datetime]) -> None:
+        """Registrar un intento fallido; sin `retry_at` los eventos quedan como fallidos definitivamente"""
+        values = {
+            "attempts": Auth0OutboxEvent.attempts + 1,
+            "last_error": error,
+        }
+        if retry_at is None:
+            values["status"] = "failed"
+        else:
+            values["next_attempt_at"] = retry_at
+
+        self.db.execute(
+            update(Auth0OutboxEvent)
+            .where(Auth0OutboxEvent.id == any_(bigint_array(event_ids)))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    def requeue_failed(self) -> int:
+        """Volver a encolar los eventos fallidos definitivamente; retorna cuántos"""
+        result = self.db.execute(
+            update(Auth0OutboxEvent)
+            .where(Auth0OutboxEvent.status == "failed")
+            .values(status="pending", attempts=0, next_attempt_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Profundidad de la cola y antigüedad del evento pendiente más viejo"""
+        pending = Auth0OutboxEvent.status == "pending"
+        row = self.db.execute(
+            select(
+                func.count().filter(pending).label("pending"),
+                func.count().filter(pending, Auth0OutboxEvent.next_attempt_at <= func.now()).label("due"),
+                func.count(func.distinct(Auth0OutboxEvent.auth0_user_id)).filter(pending).label("pending_users"),
+                func.count().filter(Auth0OutboxEvent.status == "failed").label("failed"),
+                func.coalesce(
+                    func.extract("epoch", func.now() - func.min(Auth0OutboxEvent.created_at).filter(pending)), 0
+                ).label("oldest_pending_seconds"),
+            )
+        ).one()
+        return {
+            "pending": row.pending,
+            "due": row.due,
+            "pending_users": row.pending_users,
+            "failed": row.failed,
+            "oldest_pending_seconds": float(row.oldest_pending_seconds),
+        }
@@ -0,0 +1,132 @@
+from datetime import timedelta
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..models.idempotency_key import IdempotencyKey
+
+class IdempotencyRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(
+        self,
+        key: str,
+        method: str,
+        path: str,
+        request_hash: str,
+        ttl: timedelta,
+        lock_timeout: timedelta
+    ) -> bool:
+        """Reservar una llave para procesar la petición.
+
+        Retorna True si esta petición quedó a cargo (llave nueva, vencida o con un
+        procesamiento abandonado); False si ya existe otra en curso o completada.
+        """
+        # Las llaves vencidas se tratan como inexistentes
+        self.db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.expires_at < func.now())
+        )
+
+        claimed = self.db.execute(
+            pg_insert(IdempotencyKey)
+            .values(
+                key=key,
+                method=method,
+                path=path,
+                request_hash=request_hash,
+                status="in_progress",
+                locked_until=func.now() + lock_timeout,
+                expires_at=func.now() + ttl
+            )
+            .on_conflict_do_nothing(index_elements=["key"])
+            .returning(IdempotencyKey.key)
+        ).first()
+
+        if not claimed:
+            # Retomar una petición en curso cuyo proceso murió sin liberar la llave
+            claimed = self.db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.request_hash == request_hash,
+                    IdempotencyKey.status == "in_progress",
+                    or_(IdempotencyKey.locked_until.is_(None), IdempotencyKey.locked_until < func.now())
+                )
+                .values(locked_until=func.now() + lock_timeout)
+                .returning(IdempotencyKey.key)
+                .execution_options(synchronize_session=False)
+            ).first()
+
+        self.db.commit()
+        return claimed is not None
+
+    def extend(self, key: str, lock_timeout: timedelta) -> bool:
+        """Renovar la reserva de una petición que sigue en curso.
+
+        Retorna False si la llave ya no está en curso (completada o liberada).
+        """
+        extended = self.db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.status == "in_progress")
+            .values(locked_until=func.now() + lock_timeout)
+            .returning(IdempotencyKey.key)
+            .execution_options(synchronize_session=False)
+        ).first()
+        self.db.commit()
+        return extended is not None
+
+    def get(self, key: str) -> Optional[IdempotencyKey]:
+        """Obtener el estado actual de una llave (sin caché de la sesión)"""
+        return self.db.execute(
+            select(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+
+    def complete(
+        self,
+        key: str,
+        response_status: int,
+        content_type: Optional[str],
+        headers: List[List[str]],
+        body: str
+    ) -> None:
+        """Guardar la respuesta para repetirla en los reintentos"""
+        self.db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(
+                status="completed",
+                response_status=response_status,
+                response_content_type=content_type,
+                response_headers=headers,
+                response_body=body,
+                locked_until=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def release(self, key: str) -> None:
+        """Liberar una llave cuyo procesamiento falló, para que un reintento la vuelva a procesar"""
+        self.db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.status == "in_progress")
+        )
+        self.db.commit()
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """Eliminar llaves vencidas por lotes; retorna cuántas se eliminaron"""
+        purged = 0
+        while True:
+            expired = select(IdempotencyKey.key)\
+                .where(IdempotencyKey.expires_at < func.now())\
+                .limit(batch_size)\
+                .scalar_subquery()
+            result = self.db.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired)))
+            self.db.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                return purged
@@ -1,14 +1,141 @@
 # src/repositories/order_repository.py
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Iterator
+from sqlalchemy.orm import Session, joinedload, selectinload, subqueryload
+from sqlalchemy import and_, or_, desc, insert, select, update, func, any_, case, Row
 from uuid import uuid4
+from ..core.pagination import apply_keyset_pagination
+from ..db import bigint_array
 from ..models.order import Order, SubOrder, OrderItem, OrderMessage
-from ..schemas.order import OrderCreate, OrderUpdate, SubOrderCreate, OrderItemCreate, OrderMessageCreate
+from ..models.stores import Store
+from ..models.store_user import StoreUser
+from .unread_counter_repository import UnreadCounterRepository
+from .sales_rollup_repository import SalesRollupRepository
+from ..schemas.order import (
+    OrderCreate, OrderUpdate, SubOrderCreate, OrderItemCreate, OrderMessageCreate,
+    OrderOut, OrderSummaryOut, SubOrderOut, OrderItemOut, BulkStatusOut,
+    ALLOWED_STATUS_PREDECESSORS
+)
+
+# Estrategias de carga disponibles para las relaciones de una orden
+LOADER_STRATEGIES = {
+    "selectin": selectinload,
+    "subquery": subqueryload,
+    "joined": joinedload,
+}
+
+# Estrategia por relación del grafo que expone OrderOut (sub-órdenes -> items).
+# selectin evita el producto cartesiano de los joins y el subquery alrededor del LIMIT.
+ORDER_LOADING = {
+    "sub_orders": os.getenv("ORDER_SUB_ORDERS_LOADING", "selectin"),
+    "order_items": os.getenv("ORDER_ITEMS_LOADING", "selectin"),
+}
+
+# Columnas del export plano: una fila por item, con los datos de su sub-orden y orden
+EXPORT_COLUMNS = [
+    Order.id.label("order_id"),
+    Order.external_id.label("order_external_id"),
+    Order.user_id,
+    Order.status.label("order_status"),
+    Order.currency,
+    Order.total_amount_cop,
+    Order.created_at.label("order_created_at"),
+    SubOrder.id.label("sub_order_id"),
+    SubOrder.store_id,
+    SubOrder.status.label("sub_order_status"),
+    SubOrder.subtotal_cop,
+    SubOrder.shipping_cop,
+    SubOrder.marketplace_fee_cop,
+    SubOrder.seller_net_cop,
+    OrderItem.id.label("order_item_id"),
+    OrderItem.product_id,
+    OrderItem.product_variant_id,
+    OrderItem.title,
+    OrderItem.unit_price_cop,
+    OrderItem.quantity,
+    OrderItem.total_price_cop,
+]
+# Filas por lote del cursor del lado del servidor
+EXPORT_BATCH_SIZE = 5000
+
+# Avance de cada estado, para derivar el estado de una orden desde sus sub-órdenes: la orden
+# queda en el estado menos avanzado de sus sub-órdenes. cancelled tiene el rango más alto
+# para que solo se propague cuando todas las sub-órdenes están canceladas.
+STATUS_RANK = {
+    "pending": 0,
+    "confirmed": 1,
+    "processing": 2,
+    "shipped": 3,
+    "delivered": 4,
+    "refunded": 5,
+    "cancelled": 6,
+}
+
+def order_graph_options(loading: Dict[str, str]):
+    """Opciones de carga para sub-órdenes e items (lo único que usa OrderOut)"""
+    sub_orders_loader = LOADER_STRATEGIES[loading["sub_orders"]]
+    order_items_loader = LOADER_STRATEGIES[loading["order_items"]]
+    return sub_orders_loader(Order.sub_orders).options(order_items_loader(SubOrder.order_items))
+
+def order_filters(
+    user_id: Optional[int] = None,
+    status: Optional[str] = None,
+    store_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> list:
+    """Condiciones WHERE comunes a los listados de órdenes"""
+    conditions = []
+
+    if user_id:
+        conditions.append(Order.user_id == user_id)
+
+    if status:
+        conditions.append(Order.status == status)
+
+    if store_id:
+        # Subconsulta en lugar de JOIN para no duplicar filas de la orden
+        conditions.append(
+            Order.id.in_(select(SubOrder.order_id).where(SubOrder.store_id == store_id))
+        )
+
+    if created_from:
+        conditions.append(Order.created_at >= created_from)
+
+    if created_to:
+        conditions.append(Order.created_at < created_to)
+
+    return conditions
+
+def order_summary_query(filters: list, limit: int, offset: int = 0, cursor: Optional[str] = None):
+    """Columnas del resumen de órdenes, paginadas por (created_at, id)"""
+    query = select(
+        Order.id,
+        Order.external_id,
+        Order.user_id,
+        Order.status,
+        Order.total_amount_cop,
+        Order.currency,
+        Order.created_at
+    ).where(*filters)
+    return apply_keyset_pagination(query, Order.created_at, Order.id, limit, offset=offset, cursor=cursor)
+
+def order_item_counts_query(order_ids: List[int]):
+    """Cantidad de items por orden, en una sola consulta agregada para toda la página"""
+    return select(SubOrder.order_id, func.count(OrderItem.id))\
+        .join(OrderItem, OrderItem.sub_order_id == SubOrder.id)\
+        .where(SubOrder.order_id.in_(order_ids))\
+        .group_by(SubOrder.order_id)
 
 class OrderRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, loading: Optional[Dict[str, str]] = None):
         self.db = db
+        self.loading = {**ORDER_LOADING, **(loading or {})}
+
+    def _order_graph_options(self):
+        return order_graph_options(self.loading)
 
     def create_order(self, order_data: OrderCreate) -> Order:
         """Crear una nueva orden con sus sub-órdenes e items"""
@@ -28,6 +155,7 @@ class OrderRepository:
         self.db.flush()  # Para obtener el ID de la orden
         
         # Crear sub-órdenes
+        sub_order_ids = []
         for sub_order_data in order_data.sub_orders:
             sub_order = SubOrder(
                 external_id=uuid4(),
@@ -42,6 +170,7 @@ class OrderRepository:
             
             self.db.add(sub_order)
             self.db.flush()  # Para obtener el ID del sub-orden
+            sub_order_ids.append(sub_order.id)
             
             # Crear items del sub-orden
             for item_data in sub_order_data.order_items:
@@ -56,50 +185,155 @@ class OrderRepository:
                 )
                 self.db.add(order_item)
         
+        self.db.flush()
+        SalesRollupRepository(self.db).apply(sub_order_ids)
         self.db.commit()
         self.db.refresh(order)
         return order
 
+    def create_order_bulk(self, order_data: OrderCreate) -> OrderOut:
+        """Crear una orden con sus sub-órdenes e items en tres INSERT ... RETURNING.
+
+        Las sub-órdenes y los items se insertan con un único INSERT multi-fila cada uno
+        (insertmanyvalues), así el número de round trips no depende de cuántas tiendas
+        tenga la orden. La respuesta se arma con las filas devueltas, sin volver a consultar.
+        """
+        orders_table = Order.__table__
+        sub_orders_table = SubOrder.__table__
+        order_items_table = OrderItem.__table__
+
+        # Crear la orden principal
+        order_row = self.db.execute(
+            insert(orders_table).returning(*orders_table.c),
+            {
+                "external_id": uuid4(),
+                "user_id": order_data.user_id,
+                "total_amount_cop": order_data.total_amount_cop,
+                "currency": order_data.currency,
+                "status": order_data.status,
+                "shipping_address": order_data.shipping_address,
+                "billing_address": order_data.billing_address,
+                # Core usa el nombre de la columna (ver Order.order_metadata)
+                "metadata": order_data.order_metadata,
+            }
+        ).mappings().one()
+
+        # Crear todas las sub-órdenes en un solo INSERT
+        sub_order_rows = self.db.execute(
+            insert(sub_orders_table).returning(*sub_orders_table.c, sort_by_parameter_order=True),
+            [
+                {
+                    "external_id": uuid4(),
+                    "order_id": order_row["id"],
+                    "store_id": sub_order_data.store_id,
+                    "subtotal_cop": sub_order_data.subtotal_cop,
+                    "shipping_cop": sub_order_data.shipping_cop,
+                    "marketplace_fee_cop": sub_order_data.marketplace_fee_cop,
+                    "seller_net_cop": sub_order_data.seller_net_cop,
+                    "status": sub_order_data.status,
+                }
+                for sub_order_data in order_data.sub_orders
+            ]
+        ).mappings().all()
+
+        # Crear todos los items en un solo INSERT; el orden de las filas devueltas
+        # coincide con el de los parámetros gracias a sort_by_parameter_order
+        item_rows = self.db.execute(
+            insert(order_items_table).returning(*order_items_table.c, sort_by_parameter_order=True),
+            [
+                {
+                    "sub_order_id": sub_order_row["id"],
+                    "product_id": item_data.product_id,
+                    "product_variant_id": item_data.product_variant_id,
+                    "title": item_data.title,
+                    "unit_price_cop": item_data.unit_price_cop,
+                    "quantity": item_data.quantity,
+                    "total_price_cop": item_data.unit_price_cop * item_data.quantity,
+                }
+                for sub_order_row, sub_order_data in zip(sub_order_rows, order_data.sub_orders)
+                for item_data in sub_order_data.order_items
+            ]
+        ).mappings().all()
+
+        SalesRollupRepository(self.db).apply([sub_order_row["id"] for sub_order_row in sub_order_rows])
+        self.db.commit()
+
+        items_by_sub_order: Dict[int, List[OrderItemOut]] = defaultdict(list)
+        for item_row in item_rows:
+            items_by_sub_order[item_row["sub_order_id"]].append(OrderItemOut.model_validate(dict(item_row)))
+
+        return OrderOut.model_validate({
+            **order_row,
+            "order_metadata": order_row["metadata"],
+            "sub_orders": [
+                SubOrderOut.model_validate({**sub_order_row, "order_items": items_by_sub_order[sub_order_row["id"]]})
+                for sub_order_row in sub_order_rows
+            ],
+        })
+
     def get_order_by_id(self, order_id: int) -> Optional[Order]:
         """Obtener una orden por ID con todas sus relaciones"""
         return self.db.query(Order)\
-            .options(
-                joinedload(Order.sub_orders).joinedload(SubOrder.order_items),
-                joinedload(Order.user),
-                joinedload(Order.order_messages)
-            )\
+            .options(self._order_graph_options())\
             .filter(Order.id == order_id)\
             .first()
 
     def get_order_by_external_id(self, external_id: str) -> Optional[Order]:
         """Obtener una orden por external_id"""
         return self.db.query(Order)\
-            .options(
-                joinedload(Order.sub_orders).joinedload(SubOrder.order_items),
-                joinedload(Order.user),
-                joinedload(Order.order_messages)
-            )\
+            .options(self._order_graph_options())\
             .filter(Order.external_id == external_id)\
             .first()
 
-    def get_orders_by_user(self, user_id: int, limit: int = 50, offset: int = 0) -> List[Order]:
-        """Obtener órdenes de un usuario específico"""
+    def get_orders_by_ids(self, order_ids: List[int]) -> List[Order]:
+        """Obtener varias órdenes por ID en una sola consulta (WHERE id = ANY(:ids))"""
         return self.db.query(Order)\
-            .options(
-                joinedload(Order.sub_orders).joinedload(SubOrder.order_items)
-            )\
-            .filter(Order.user_id == user_id)\
-            .order_by(desc(Order.created_at))\
-            .offset(offset)\
-            .limit(limit)\
+            .options(self._order_graph_options())\
+            .filter(Order.id == any_(bigint_array(order_ids)))\
             .all()
 
+    def order_exists(self, order_id: int) -> bool:
+        """Verificar que una orden existe sin cargar sus relaciones"""
+        return self.db.query(Order.id).filter(Order.id == order_id).first() is not None
+
+    def is_order_participant(self, order_id: int, user_id: int) -> Optional[bool]:
+        """Si el usuario es el comprador de la orden, dueño o miembro de una de sus tiendas.
+        None si la orden no existe."""
+        seller = select(SubOrder.id)\
+            .join(Store, Store.id == SubOrder.store_id)\
+            .where(
+                SubOrder.order_id == Order.id,
+                or_(
+                    Store.owner_user_id == user_id,
+                    Store.id.in_(
+                        select(StoreUser.store_id).where(StoreUser.user_id == user_id, StoreUser.deleted_at.is_(None))
+                    )
+                )
+            )
+        return self.db.execute(
+            select(or_(Order.user_id == user_id, seller.exists())).where(Order.id == order_id)
+        ).scalar()
+
+    def get_orders_by_user(
+        self,
+        user_id: int,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[Order]:
+        """Obtener órdenes de un usuario específico"""
+        query = self.db.query(Order)\
+            .options(self._order_graph_options())\
+            .filter(Order.user_id == user_id)
+
+        return apply_keyset_pagination(
+            query, Order.created_at, Order.id, limit, offset=offset, cursor=cursor
+        ).all()
+
     def get_orders_by_status(self, status: str, limit: int = 50, offset: int = 0) -> List[Order]:
         """Obtener órdenes por estado"""
         return self.db.query(Order)\
-            .options(
-                joinedload(Order.sub_orders).joinedload(SubOrder.order_items)
-            )\
+            .options(self._order_graph_options())\
             .filter(Order.status == status)\
             .order_by(desc(Order.created_at))\
             .offset(offset)\
@@ -135,6 +369,110 @@ class OrderRepository:
         self.db.commit()
         return True
 
+    def bulk_update_order_status(self, order_ids: List[int], new_status: str) -> BulkStatusOut:
+        """Cambiar el estado de varias órdenes (y sus sub-órdenes) en una sola transacción.
+
+        Solo cambian las órdenes cuyo estado actual permite la transición; el resto se
+        reporta en `skipped`.
+        """
+        predecessors = ALLOWED_STATUS_PREDECESSORS[new_status]
+        self._lock_orders(order_ids)
+        updated = self.db.execute(
+            update(Order)
+            .where(Order.id == any_(bigint_array(order_ids)), Order.status.in_(predecessors))
+            .values(status=new_status)
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
+        if updated:
+            # Las sub-órdenes acompañan a la orden para que su estado derivado coincida
+            self._transition_sub_orders(SubOrder.order_id == any_(bigint_array(updated)), new_status)
+        self.db.commit()
+
+        updated_ids = set(updated)
+        return BulkStatusOut(
+            status=new_status,
+            updated=[order_id for order_id in order_ids if order_id in updated_ids],
+            skipped=[order_id for order_id in order_ids if order_id not in updated_ids],
+            orders=sorted(updated_ids)
+        )
+
+    def bulk_update_sub_order_status(self, sub_order_ids: List[int], new_status: str) -> BulkStatusOut:
+        """Cambiar el estado de varias sub-órdenes y recalcular el estado de sus órdenes"""
+        # La orden de una sub-orden no cambia: se puede leer sin lock antes de bloquearlas
+        self._lock_orders(self.db.execute(
+            select(SubOrder.order_id).where(SubOrder.id == any_(bigint_array(sub_order_ids))).distinct()
+        ).scalars().all())
+        rows = self._transition_sub_orders(SubOrder.id == any_(bigint_array(sub_order_ids)), new_status)
+        orders = sorted(self._derive_order_status(sorted({row.order_id for row in rows}))) if rows else []
+        self.db.commit()
+
+        updated_ids = {row.id for row in rows}
+        return BulkStatusOut(
+            status=new_status,
+            updated=[sub_order_id for sub_order_id in sub_order_ids if sub_order_id in updated_ids],
+            skipped=[sub_order_id for sub_order_id in sub_order_ids if sub_order_id not in updated_ids],
+            orders=orders
+        )
+
+    def _lock_orders(self, order_ids: List[int]) -> None:
+        """Bloquear órdenes en orden de ID antes de tocar sus sub-órdenes.
+
+        Ambas transiciones masivas bloquean primero las órdenes y luego las sub-órdenes,
+        siempre en orden de ID: dos llamadas concurrentes sobre las mismas órdenes se
+        esperan en vez de bloquearse mutuamente (deadlock).
+        """
+        if order_ids:
+            self.db.execute(
+                select(Order.id).where(Order.id == any_(bigint_array(order_ids))).order_by(Order.id).with_for_update()
+            )
+
+    def _transition_sub_orders(self, condition, new_status: str):
+        """Mover sub-órdenes a new_status manteniendo el rollup de ventas; retorna (id, order_id)"""
+        # Bloquear primero para que el estado restado del rollup sea el que se reemplaza
+        locked = self.db.execute(
+            select(SubOrder.id)
+            .where(condition, SubOrder.status.in_(ALLOWED_STATUS_PREDECESSORS[new_status]))
+            .order_by(SubOrder.id)
+            .with_for_update()
+        ).scalars().all()
+        if not locked:
+            return []
+
+        rollup = SalesRollupRepository(self.db)
+        rollup.apply(locked, sign=-1)
+        rows = self.db.execute(
+            update(SubOrder)
+            .where(SubOrder.id == any_(bigint_array(locked)))
+            .values(status=new_status)
+            .returning(SubOrder.id, SubOrder.order_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        rollup.apply(locked)
+        return rows
+
+    def _derive_order_status(self, order_ids: List[int]) -> List[int]:
+        """Recalcular el estado de las órdenes desde sus sub-órdenes; retorna las que cambiaron.
+
+        Las órdenes ya están bloqueadas (_lock_orders): una transacción concurrente sobre
+        sub-órdenes hermanas esperó ese lock y ve los cambios de esta.
+        """
+        ids = bigint_array(order_ids)
+        derived = select(SubOrder.order_id, func.min(case(STATUS_RANK, value=SubOrder.status)).label("rank"))\
+            .where(SubOrder.order_id == any_(ids))\
+            .group_by(SubOrder.order_id)\
+            .subquery()
+        derived_status = case({rank: status for status, rank in STATUS_RANK.items()}, value=derived.c.rank)
+
+        return self.db.execute(
+            update(Order)
+            .where(Order.id == derived.c.order_id, Order.status != derived_status)
+            .values(status=derived_status)
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
     def create_order_message(self, message_data: OrderMessageCreate, from_user_id: int) -> OrderMessage:
         """Crear un mensaje en una orden"""
         message = OrderMessage(
@@ -146,50 +484,167 @@ class OrderRepository:
         )
         
         self.db.add(message)
+        if message.to_user_id:
+            UnreadCounterRepository(self.db).increment(message.to_user_id, message.order_id)
         self.db.commit()
         self.db.refresh(message)
         return message
 
-    def get_order_messages(self, order_id: int) -> List[OrderMessage]:
-        """Obtener mensajes de una orden"""
-        return self.db.query(OrderMessage)\
-            .filter(OrderMessage.order_id == order_id)\
-            .order_by(OrderMessage.created_at)\
-            .all()
+    def get_order_messages(
+        self,
+        order_id: int,
+        limit: int = 50,
+        before_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> List[OrderMessage]:
+        """Obtener una página de mensajes de una orden, en orden cronológico.
+
+        Con after_id se avanza hacia mensajes más nuevos; con before_id (o sin cursor)
+        se obtienen los `limit` mensajes más recientes anteriores a ese ID.
+        """
+        query = self.db.query(OrderMessage).filter(OrderMessage.order_id == order_id)
+
+        if after_id is not None:
+            return query.filter(OrderMessage.id > after_id)\
+                .order_by(OrderMessage.id)\
+                .limit(limit)\
+                .all()
+
+        if before_id is not None:
+            query = query.filter(OrderMessage.id < before_id)
+
+        messages = query.order_by(desc(OrderMessage.id)).limit(limit).all()
+        messages.reverse()
+        return messages
+
+    def get_messages_after(
+        self,
+        after_id: int,
+        order_id: Optional[int] = None,
+        to_user_id: Optional[int] = None,
+        limit: int = 200
+    ) -> List[OrderMessage]:
+        """Obtener los mensajes posteriores a un ID, de una orden o de un destinatario"""
+        query = self.db.query(OrderMessage).filter(OrderMessage.id > after_id)
+
+        if order_id:
+            query = query.filter(OrderMessage.order_id == order_id)
+
+        if to_user_id:
+            query = query.filter(OrderMessage.to_user_id == to_user_id)
+
+        return query.order_by(OrderMessage.id).limit(limit).all()
+
+    def get_message_by_id(self, message_id: int) -> Optional[OrderMessage]:
+        """Obtener un mensaje por ID"""
+        return self.db.query(OrderMessage).filter(OrderMessage.id == message_id).first()
 
     def mark_message_as_read(self, message_id: int) -> bool:
         """Marcar un mensaje como leído"""
-        message = self.db.query(OrderMessage).filter(OrderMessage.id == message_id).first()
-        if not message:
-            return False
-        
-        message.is_read = True
+        changed = self.db.execute(
+            update(OrderMessage)
+            .where(OrderMessage.id == message_id, OrderMessage.is_read.is_(False))
+            .values(is_read=True)
+            .returning(OrderMessage.to_user_id, OrderMessage.order_id)
+            .execution_options(synchronize_session=False)
+        ).first()
+
+        if not changed:
+            # Ya estaba leído (o no existe): no hay contadores que ajustar
+            return self.get_message_by_id(message_id) is not None
+
+        if changed.to_user_id:
+            UnreadCounterRepository(self.db).decrement(changed.to_user_id, changed.order_id)
         self.db.commit()
         return True
 
+    def mark_messages_as_read(self, order_id: int, to_user_id: int, up_to_id: int) -> int:
+        """Marcar como leídos, en un solo UPDATE, los mensajes de una orden para un
+        destinatario hasta up_to_id inclusive. Retorna la cantidad de filas cambiadas."""
+        result = self.db.execute(
+            update(OrderMessage)
+            .where(
+                OrderMessage.order_id == order_id,
+                OrderMessage.to_user_id == to_user_id,
+                OrderMessage.id <= up_to_id,
+                OrderMessage.is_read.is_(False)
+            )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        UnreadCounterRepository(self.db).decrement(to_user_id, order_id, result.rowcount)
+        self.db.commit()
+        return result.rowcount
+
     def get_orders_with_filters(
         self, 
         user_id: Optional[int] = None,
         status: Optional[str] = None,
         store_id: Optional[int] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[Order]:
-        """Obtener órdenes con filtros múltiples"""
-        query = self.db.query(Order).options(
-            joinedload(Order.sub_orders).joinedload(SubOrder.order_items)
-        )
-        
-        if user_id:
-            query = query.filter(Order.user_id == user_id)
-        
-        if status:
-            query = query.filter(Order.status == status)
-        
-        if store_id:
-            query = query.join(SubOrder).filter(SubOrder.store_id == store_id)
-        
-        return query.order_by(desc(Order.created_at))\
-            .offset(offset)\
-            .limit(limit)\
-            .all()
\ No newline at end of file
+        """Obtener órdenes con filtros múltiples (paginación por cursor sobre created_at, id)"""
+        query = self.db.query(Order)\
+            .options(self._order_graph_options())\
+            .filter(*order_filters(user_id, status, store_id))
+
+        return apply_keyset_pagination(
+            query, Order.created_at, Order.id, limit, offset=offset, cursor=cursor
+        ).all()
+
+    def get_order_summaries(
+        self,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        store_id: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[OrderSummaryOut]:
+        """Obtener el resumen de órdenes como filas de Core, sin construir el grafo ORM.
+
+        Se seleccionan solo las columnas del resumen y los conteos de items salen de
+        una única consulta agregada para toda la página.
+        """
+        rows = self.db.execute(
+            order_summary_query(order_filters(user_id, status, store_id), limit, offset=offset, cursor=cursor)
+        ).mappings().all()
+
+        if not rows:
+            return []
+
+        item_counts = dict(self.db.execute(order_item_counts_query([row["id"] for row in rows])).all())
+
+        return [
+            OrderSummaryOut(**row, item_count=item_counts.get(row["id"], 0))
+            for row in rows
+        ]
+
+    def stream_order_export_rows(
+        self,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        store_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[List[Row]]:
+        """Filas planas (orden, sub-orden, item) por lotes, con un cursor del lado del servidor.
+
+        yield_per usa un cursor con nombre en Postgres: solo hay `batch_size` filas en
+        memoria a la vez, sin importar el tamaño del export.
+        """
+        query = select(*EXPORT_COLUMNS)\
+            .select_from(Order)\
+            .join(SubOrder, SubOrder.order_id == Order.id)\
+            .join(OrderItem, OrderItem.sub_order_id == SubOrder.id)\
+            .where(*order_filters(user_id, status, store_id, created_from, created_to))\
+            .order_by(Order.id, SubOrder.id, OrderItem.id)
+
+        result = self.db.execute(query.execution_options(yield_per=batch_size))
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
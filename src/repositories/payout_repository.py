@@ -0,0 +1,120 @@
+from typing import List, Optional
+from uuid import UUID, uuid4
+from sqlalchemy.orm import Session
+from sqlalchemy import any_, exists, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..db import bigint_array
+from ..models.order import SubOrder
+from ..models.payout import Payout
+from ..models.refund import Refund
+from ..schemas.payout import PayoutRunOut, PayoutStoreTotal
+
+# Estados de reembolso que no se descuentan de la liquidación
+REFUND_EXCLUDED_STATUSES = ["failed", "rejected", "cancelled"]
+
+class PayoutRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _claim_sub_orders(self, after_id: int, batch_size: int) -> List[int]:
+        """Bloquear el siguiente lote de sub-órdenes entregadas sin payout vigente.
+
+        SKIP LOCKED permite que varias corridas trabajen a la vez sobre lotes distintos.
+        """
+        return self.db.execute(
+            select(SubOrder.id)
+            .where(
+                SubOrder.id > after_id,
+                SubOrder.status == "delivered",
+                ~exists().where(Payout.sub_order_id == SubOrder.id, Payout.status != "failed")
+            )
+            .order_by(SubOrder.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+
+    def _insert_payouts(self, sub_order_ids: List[int], batch_id: UUID) -> int:
+        """Crear los payouts de un lote con un solo INSERT ... SELECT.
+
+        El monto es seller_net_cop menos la parte de los reembolsos de la orden que le
+        corresponde a la sub-orden, en proporción a su subtotal.
+        """
+        ids = bigint_array(sub_order_ids)
+        order_ids = select(SubOrder.order_id).where(SubOrder.id == any_(ids))
+
+        refunds = select(Refund.order_id, func.sum(Refund.amount_cop).label("refunded_cop"))\
+            .where(Refund.order_id.in_(order_ids), Refund.status.notin_(REFUND_EXCLUDED_STATUSES))\
+            .group_by(Refund.order_id)\
+            .subquery()
+        order_subtotals = select(SubOrder.order_id, func.sum(SubOrder.subtotal_cop).label("subtotal_cop"))\
+            .where(SubOrder.order_id.in_(order_ids))\
+            .group_by(SubOrder.order_id)\
+            .subquery()
+
+        # Si los subtotales de la orden suman 0 no hay proporción: NULLIF evita la división
+        # por cero (que abortaría el lote en cada corrida) y el reembolso no se descuenta
+        refund_share = func.coalesce(
+            refunds.c.refunded_cop * SubOrder.subtotal_cop // func.nullif(order_subtotals.c.subtotal_cop, 0), 0
+        )
+        source = select(
+            func.gen_random_uuid(),
+            SubOrder.id,
+            func.greatest(SubOrder.seller_net_cop - refund_share, 0),
+            literal(batch_id, Payout.batch_id.type),
+        )\
+            .select_from(SubOrder)\
+            .join(order_subtotals, order_subtotals.c.order_id == SubOrder.order_id)\
+            .outerjoin(refunds, refunds.c.order_id == SubOrder.order_id)\
+            .where(SubOrder.id == any_(ids))
+
+        # El índice único parcial es la última defensa si otra corrida ya creó el payout
+        result = self.db.execute(
+            pg_insert(Payout)
+            .from_select(["external_id", "sub_order_id", "amount_cop", "batch_id"], source)
+            .on_conflict_do_nothing(
+                index_elements=["sub_order_id"],
+                index_where=text("status <> 'failed'")
+            )
+        )
+        return result.rowcount
+
+    def run_payouts(self, batch_size: int = 1000, max_batches: Optional[int] = None) -> PayoutRunOut:
+        """Generar payouts para las sub-órdenes entregadas pendientes, por lotes.
+
+        Cada lote es una transacción: si el proceso se cae, lo confirmado queda y una
+        nueva corrida continúa con las sub-órdenes que siguen sin payout.
+        """
+        batch_id = uuid4()
+        last_id = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            sub_order_ids = self._claim_sub_orders(last_id, batch_size)
+            if not sub_order_ids:
+                self.db.rollback()
+                break
+
+            self._insert_payouts(sub_order_ids, batch_id)
+            self.db.commit()
+
+            last_id = sub_order_ids[-1]
+            batches += 1
+
+        return self.get_run_summary(batch_id)
+
+    def get_run_summary(self, batch_id: UUID) -> PayoutRunOut:
+        """Totales por tienda de una corrida"""
+        rows = self.db.execute(
+            select(SubOrder.store_id, func.count().label("payouts"), func.sum(Payout.amount_cop).label("amount_cop"))
+            .join(SubOrder, SubOrder.id == Payout.sub_order_id)
+            .where(Payout.batch_id == batch_id)
+            .group_by(SubOrder.store_id)
+            .order_by(SubOrder.store_id)
+        ).all()
+
+        stores = [PayoutStoreTotal(store_id=row.store_id, payouts=row.payouts, amount_cop=row.amount_cop) for row in rows]
+        return PayoutRunOut(
+            batch_id=batch_id,
+            payouts=sum(store.payouts for store in stores),
+            amount_cop=sum(store.amount_cop for store in stores),
+            stores=stores
+        )
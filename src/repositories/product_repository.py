@@ -0,0 +1,128 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import REAL, cast, func, literal, literal_column, select, tuple_
+from ..core.pagination import apply_sort_keyset, decode_cursor, encode_cursor
+from ..models.product import Product
+from ..schemas.product import PRODUCT_SORTS, ProductOut
+from ..services.cache import ReadThroughCache, register_cache, shared_backend
+
+# Misma expresión del índice GIN products_to_tsvector_idx: si no coincide, Postgres no lo usa.
+# COALESCE evita que un producto sin descripción quede con documento NULL (sin resultados).
+PRODUCT_SEARCH_DOCUMENT = literal_column(
+    "to_tsvector('spanish', COALESCE(products.title, '') || ' ' || COALESCE(products.description, ''))"
+)
+SEARCH_CONFIG = literal_column("'spanish'")
+
+# Resultados de búsqueda por consulta normalizada, con un TTL corto
+search_cache = register_cache(ReadThroughCache(
+    "product_search",
+    serialize=json.dumps,
+    deserialize=json.loads,
+    maxsize=int(os.getenv("PRODUCT_SEARCH_CACHE_MAXSIZE", "5000")),
+    local_ttl=float(os.getenv("PRODUCT_SEARCH_CACHE_TTL_SECONDS", "30")),
+    shared_ttl=int(os.getenv("PRODUCT_SEARCH_CACHE_TTL_SECONDS", "30")),
+    backend=shared_backend
+))
+
+def normalize_search_query(q: str) -> str:
+    """Minúsculas y espacios colapsados, para que variantes triviales compartan caché"""
+    return " ".join(q.lower().split())
+
+class ProductRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_store_products(
+        self,
+        store_id: int,
+        sort: str = "newest",
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        is_published: Optional[bool] = True,
+        is_visible: Optional[bool] = True
+    ) -> List[Product]:
+        """Catálogo de una tienda paginado por keyset sobre (created_at, id) o (price_cop, id).
+
+        Con los filtros por defecto (publicados y visibles) la consulta usa los índices
+        parciales del catálogo, así cada página cuesta lo mismo sin importar el tamaño
+        de la tienda.
+        """
+        sort_attribute, descending = PRODUCT_SORTS[sort]
+        query = self.db.query(Product)\
+            .filter(Product.store_id == store_id)\
+            .filter(Product.deleted_at.is_(None))
+
+        if is_published is not None:
+            query = query.filter(Product.is_published == is_published)
+
+        if is_visible is not None:
+            query = query.filter(Product.is_visible == is_visible)
+
+        parse = datetime.fromisoformat if sort_attribute == "created_at" else int
+        return apply_sort_keyset(
+            query, getattr(Product, sort_attribute), Product.id, limit,
+            cursor=cursor, descending=descending, parse=parse
+        ).all()
+
+    def search_products(
+        self,
+        q: str,
+        store_id: Optional[int] = None,
+        min_price_cop: Optional[int] = None,
+        max_price_cop: Optional[int] = None,
+        is_published: Optional[bool] = True,
+        is_visible: Optional[bool] = True,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Búsqueda de texto completo en español, ordenada por relevancia (ts_rank, id)"""
+        tsquery = func.plainto_tsquery(SEARCH_CONFIG, q)
+        rank = func.ts_rank(PRODUCT_SEARCH_DOCUMENT, tsquery, type_=REAL)
+
+        query = select(Product, rank.label("rank"))\
+            .where(PRODUCT_SEARCH_DOCUMENT.op("@@")(tsquery))\
+            .where(Product.deleted_at.is_(None))
+
+        if store_id:
+            query = query.where(Product.store_id == store_id)
+
+        if min_price_cop is not None:
+            query = query.where(Product.price_cop >= min_price_cop)
+
+        if max_price_cop is not None:
+            query = query.where(Product.price_cop <= max_price_cop)
+
+        if is_published is not None:
+            query = query.where(Product.is_published == is_published)
+
+        if is_visible is not None:
+            query = query.where(Product.is_visible == is_visible)
+
+        if cursor:
+            last_rank, last_id = decode_cursor(cursor, float, int)
+            # El rank del cursor se compara como REAL, el mismo tipo que devuelve ts_rank
+            query = query.where(tuple_(rank, Product.id) < tuple_(cast(literal(last_rank), REAL), literal(last_id)))
+
+        rows = self.db.execute(
+            query.order_by(rank.desc(), Product.id.desc()).limit(limit)
+        ).all()
+
+        return [
+            {**ProductOut.model_validate(product).model_dump(mode="json"), "rank": product_rank}
+            for product, product_rank in rows
+        ]
+
+    def search_products_cached(self, q: str, limit: int = 20, cursor: Optional[str] = None, **filters) -> Dict[str, Any]:
+        """Página de búsqueda (items y cursor siguiente) pasando por el caché de resultados"""
+        q = normalize_search_query(q)
+        key = json.dumps([q, limit, cursor, sorted(filters.items())], separators=(",", ":"))
+
+        def load() -> Dict[str, Any]:
+            items = self.search_products(q, limit=limit, cursor=cursor, **filters)
+            last = items[-1] if len(items) == limit else None
+            return {"items": items, "next_cursor": encode_cursor(last["rank"], last["id"]) if last else None}
+
+        return search_cache.get_or_load(key, load)
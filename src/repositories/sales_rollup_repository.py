@@ -0,0 +1,142 @@
+from datetime import date
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import any_, delete, func, literal_column, select, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..db import bigint_array
+from ..models.order import SubOrder, OrderItem
+from ..models.store_sales_daily import StoreSalesDaily, SALES_TIMEZONE
+
+# Métricas acumuladas en el rollup, en el orden de las columnas de la consulta de origen
+METRIC_COLUMNS = ["sub_order_count", "units", "gmv_cop", "shipping_cop", "marketplace_fee_cop", "seller_net_cop"]
+
+class SalesRollupRepository:
+    """Ventas diarias por tienda mantenidas de forma incremental.
+
+    apply() no confirma la transacción: se llama dentro de la misma transacción que
+    crea las sub-órdenes o cambia su estado.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _aggregate(self, condition, sign: int = 1):
+        """Agregar sub-órdenes por (tienda, día, estado), multiplicando las métricas por sign"""
+        units = select(OrderItem.sub_order_id, func.sum(OrderItem.quantity).label("units"))\
+            .join(SubOrder, SubOrder.id == OrderItem.sub_order_id)\
+            .where(condition)\
+            .group_by(OrderItem.sub_order_id)\
+            .subquery()
+        # Literal en el SQL (no parámetro) para que el GROUP BY reconozca la misma expresión
+        day = func.date(func.timezone(literal_column(f"'{SALES_TIMEZONE}'"), SubOrder.created_at))
+
+        return select(
+            SubOrder.store_id,
+            day,
+            SubOrder.status,
+            func.count() * sign,
+            func.coalesce(func.sum(units.c.units), 0) * sign,
+            func.sum(SubOrder.subtotal_cop) * sign,
+            func.sum(SubOrder.shipping_cop) * sign,
+            func.sum(SubOrder.marketplace_fee_cop) * sign,
+            func.sum(SubOrder.seller_net_cop) * sign,
+        )\
+            .select_from(SubOrder)\
+            .outerjoin(units, units.c.sub_order_id == SubOrder.id)\
+            .where(condition)\
+            .group_by(SubOrder.store_id, day, SubOrder.status)\
+            .order_by(SubOrder.store_id, day, SubOrder.status)
+
+    def apply(self, sub_order_ids: List[int], sign: int = 1) -> None:
+        """Sumar (sign=1) o restar (sign=-1) sub-órdenes en su estado actual al rollup"""
+        if not sub_order_ids:
+            return
+
+        table = StoreSalesDaily.__table__
+        statement = pg_insert(table).from_select(
+            ["store_id", "day", "status", *METRIC_COLUMNS],
+            # Ordenado por la llave para que escrituras concurrentes tomen los locks en el mismo orden
+            self._aggregate(SubOrder.id == any_(bigint_array(sub_order_ids)), sign)
+        )
+        self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["store_id", "day", "status"],
+                set_={
+                    **{column: table.c[column] + statement.excluded[column] for column in METRIC_COLUMNS},
+                    "updated_at": func.now(),
+                }
+            )
+        )
+
+    def get_sales(
+        self,
+        store_id: int,
+        date_from: date,
+        date_to: date,
+        granularity: str = "day",
+        statuses: Optional[List[str]] = None
+    ):
+        """Ventas de una tienda por periodo (day, week o month) y estado, leyendo solo el rollup"""
+        if granularity == "day":
+            period = StoreSalesDaily.day
+        else:
+            period = func.date(func.date_trunc(literal_column(f"'{granularity}'"), StoreSalesDaily.day))
+
+        query = select(
+            period.label("period"),
+            StoreSalesDaily.status,
+            *[func.sum(StoreSalesDaily.__table__.c[column]).label(column) for column in METRIC_COLUMNS]
+        ).where(
+            StoreSalesDaily.store_id == store_id,
+            StoreSalesDaily.day >= date_from,
+            StoreSalesDaily.day <= date_to
+        )
+        if statuses:
+            query = query.where(StoreSalesDaily.status.in_(statuses))
+
+        return self.db.execute(
+            query
+            .group_by(period, StoreSalesDaily.status)
+            .having(func.sum(StoreSalesDaily.sub_order_count) > 0)
+            .order_by(period, StoreSalesDaily.status)
+        ).mappings().all()
+
+    def rebuild(self, store_ids: Optional[List[int]] = None, batch_size: int = 100) -> int:
+        """Recalcular el rollup desde sub_orders, por lotes de tiendas.
+
+        Cada lote reemplaza las filas de sus tiendas en su propia transacción, así el
+        comando se puede interrumpir y volver a correr. Retorna cuántas tiendas procesó.
+        """
+        if store_ids is not None:
+            candidates = select(func.unnest(bigint_array(sorted(set(store_ids)))).label("store_id")).subquery()
+        else:
+            candidates = union(
+                select(SubOrder.store_id),
+                select(StoreSalesDaily.store_id),
+            ).subquery()
+
+        last_store_id = 0
+        rebuilt = 0
+        while True:
+            batch: List[int] = self.db.execute(
+                select(candidates.c.store_id)
+                .where(candidates.c.store_id > last_store_id)
+                .order_by(candidates.c.store_id)
+                .limit(batch_size)
+            ).scalars().all()
+
+            if not batch:
+                return rebuilt
+
+            ids = bigint_array(batch)
+            self.db.execute(delete(StoreSalesDaily).where(StoreSalesDaily.store_id == any_(ids)))
+            self.db.execute(
+                pg_insert(StoreSalesDaily).from_select(
+                    ["store_id", "day", "status", *METRIC_COLUMNS],
+                    self._aggregate(SubOrder.store_id == any_(ids))
+                )
+            )
+            self.db.commit()
+
+            rebuilt += len(batch)
+            last_store_id = batch[-1]
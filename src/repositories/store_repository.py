@@ -1,11 +1,55 @@
+import os
 from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_, desc, any_
 from uuid import uuid4
+from ..core.pagination import apply_keyset_pagination
+from ..db import bigint_array
 from ..models.stores import Store
-from ..schemas.store import StoreCreate, StoreUpdate
+from ..schemas.store import StoreCreate, StoreUpdate, StoreOut
+from ..services.cache import ReadThroughCache, register_cache, shared_backend
 from sqlalchemy.sql import func
 
+# Caché de lectura de tiendas por slug y external_id (rutas públicas del storefront)
+store_cache = register_cache(ReadThroughCache(
+    "stores",
+    serialize=lambda store: store.model_dump_json(),
+    deserialize=StoreOut.model_validate_json,
+    maxsize=int(os.getenv("STORE_CACHE_MAXSIZE", "10000")),
+    local_ttl=float(os.getenv("STORE_CACHE_LOCAL_TTL_SECONDS", "30")),
+    shared_ttl=int(os.getenv("STORE_CACHE_SHARED_TTL_SECONDS", "300")),
+    backend=shared_backend
+))
+
+def _slug_key(slug: str) -> str:
+    return f"slug:{slug}"
+
+def _external_id_key(external_id) -> str:
+    return f"external_id:{str(external_id).lower()}"
+
+def store_filters(
+    owner_user_id: Optional[int] = None,
+    plan: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    country: Optional[str] = None
+) -> list:
+    """Condiciones WHERE de los listados de tiendas (siempre excluye las eliminadas)"""
+    conditions = [Store.deleted_at.is_(None)]
+
+    if owner_user_id:
+        conditions.append(Store.owner_user_id == owner_user_id)
+
+    if plan:
+        conditions.append(Store.plan == plan)
+
+    if is_active is not None:
+        conditions.append(Store.is_active == is_active)
+
+    if country:
+        conditions.append(Store.country == country)
+
+    return conditions
+
 class StoreRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -36,7 +80,6 @@ class StoreRepository:
         return self.db.query(Store)\
             .options(
                 joinedload(Store.owner),
-                joinedload(Store.products),
                 joinedload(Store.store_users)
             )\
             .filter(Store.id == store_id)\
@@ -46,10 +89,6 @@ class StoreRepository:
     def get_store_by_external_id(self, external_id: str) -> Optional[Store]:
         """Obtener una tienda por external_id"""
         return self.db.query(Store)\
-            .options(
-                joinedload(Store.owner),
-                joinedload(Store.products)
-            )\
             .filter(Store.external_id == external_id)\
             .filter(Store.deleted_at.is_(None))\
             .first()
@@ -57,25 +96,56 @@ class StoreRepository:
     def get_store_by_slug(self, slug: str) -> Optional[Store]:
         """Obtener una tienda por slug"""
         return self.db.query(Store)\
-            .options(
-                joinedload(Store.owner),
-                joinedload(Store.products)
-            )\
             .filter(Store.slug == slug)\
             .filter(Store.deleted_at.is_(None))\
             .first()
 
-    def get_stores_by_owner(self, owner_user_id: int, limit: int = 50, offset: int = 0) -> List[Store]:
-        """Obtener tiendas de un propietario específico"""
+    def _load_store_out(self, store: Optional[Store]) -> Optional[StoreOut]:
+        return StoreOut.model_validate(store) if store else None
+
+    def get_cached_store_by_slug(self, slug: str) -> Optional[StoreOut]:
+        """Obtener una tienda por slug pasando por el caché de lectura"""
+        return store_cache.get_or_load(
+            _slug_key(slug), lambda: self._load_store_out(self.get_store_by_slug(slug))
+        )
+
+    def get_cached_store_by_external_id(self, external_id: str) -> Optional[StoreOut]:
+        """Obtener una tienda por external_id pasando por el caché de lectura"""
+        return store_cache.get_or_load(
+            _external_id_key(external_id), lambda: self._load_store_out(self.get_store_by_external_id(external_id))
+        )
+
+    def _invalidate_cache(self, store: Store, *slugs: str) -> None:
+        """Eliminar del caché las entradas de una tienda (después del commit)"""
+        store_cache.invalidate(
+            *{_slug_key(slug) for slug in (store.slug, *slugs)},
+            _external_id_key(store.external_id)
+        )
+
+    def get_stores_by_ids(self, store_ids: List[int]) -> List[Store]:
+        """Obtener varias tiendas por ID en una sola consulta (WHERE id = ANY(:ids))"""
         return self.db.query(Store)\
-            .options(joinedload(Store.owner))\
-            .filter(Store.owner_user_id == owner_user_id)\
+            .filter(Store.id == any_(bigint_array(store_ids)))\
             .filter(Store.deleted_at.is_(None))\
-            .order_by(desc(Store.created_at))\
-            .offset(offset)\
-            .limit(limit)\
             .all()
 
+    def get_stores_by_owner(
+        self,
+        owner_user_id: int,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> List[Store]:
+        """Obtener tiendas de un propietario específico"""
+        query = self.db.query(Store)\
+            .options(joinedload(Store.owner))\
+            .filter(Store.owner_user_id == owner_user_id)\
+            .filter(Store.deleted_at.is_(None))
+
+        return apply_keyset_pagination(
+            query, Store.created_at, Store.id, limit, offset=offset, cursor=cursor
+        ).all()
+
     def get_stores_by_plan(self, plan: str, limit: int = 50, offset: int = 0) -> List[Store]:
         """Obtener tiendas por plan"""
         return self.db.query(Store)\
@@ -108,12 +178,14 @@ class StoreRepository:
         if not store:
             return None
         
+        previous_slug = store.slug
         update_data = store_data.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(store, field, value)
         
         self.db.commit()
         self.db.refresh(store)
+        self._invalidate_cache(store, previous_slug)
         return store
 
     def delete_store(self, store_id: int) -> bool:
@@ -128,6 +200,7 @@ class StoreRepository:
         
         store.deleted_at = func.now()
         self.db.commit()
+        self._invalidate_cache(store)
         return True
 
     def get_stores_with_filters(
@@ -137,27 +210,14 @@ class StoreRepository:
         is_active: Optional[bool] = None,
         country: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[Store]:
-        """Obtener tiendas con filtros múltiples"""
-        query = self.db.query(Store).options(joinedload(Store.owner))
-        
-        # Siempre filtrar tiendas no eliminadas
-        query = query.filter(Store.deleted_at.is_(None))
-        
-        if owner_user_id:
-            query = query.filter(Store.owner_user_id == owner_user_id)
-        
-        if plan:
-            query = query.filter(Store.plan == plan)
-        
-        if is_active is not None:
-            query = query.filter(Store.is_active == is_active)
-        
-        if country:
-            query = query.filter(Store.country == country)
-        
-        return query.order_by(desc(Store.created_at))\
-            .offset(offset)\
-            .limit(limit)\
-            .all()
+        """Obtener tiendas con filtros múltiples (paginación por cursor sobre created_at, id)"""
+        query = self.db.query(Store)\
+            .options(joinedload(Store.owner))\
+            .filter(*store_filters(owner_user_id, plan, is_active, country))
+
+        return apply_keyset_pagination(
+            query, Store.created_at, Store.id, limit, offset=offset, cursor=cursor
+        ).all()
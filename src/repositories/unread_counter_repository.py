@@ -0,0 +1,127 @@
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from sqlalchemy import any_, delete, func, select, union, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from ..db import bigint_array
+from ..models.order import OrderMessage
+from ..models.unread_counter import UserUnreadCounter, UserOrderUnreadCounter
+
+class UnreadCounterRepository:
+    """Contadores de mensajes no leídos mantenidos de forma incremental.
+
+    Los métodos increment/decrement no confirman la transacción: se llaman dentro de la
+    misma transacción que crea o marca los mensajes.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def increment(self, user_id: int, order_id: int, amount: int = 1) -> None:
+        """Sumar mensajes no leídos al total del usuario y al de la orden"""
+        # El total del usuario primero, para que todas las escrituras tomen los locks en el mismo orden
+        for table, keys in (
+            (UserUnreadCounter.__table__, {"user_id": user_id}),
+            (UserOrderUnreadCounter.__table__, {"user_id": user_id, "order_id": order_id}),
+        ):
+            statement = pg_insert(table).values(**keys, unread_count=amount)
+            self.db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=list(keys),
+                    set_={"unread_count": table.c.unread_count + statement.excluded.unread_count, "updated_at": func.now()}
+                )
+            )
+
+    def decrement(self, user_id: int, order_id: int, amount: int = 1) -> None:
+        """Restar mensajes leídos, sin bajar de cero"""
+        if amount <= 0:
+            return
+
+        self.db.execute(
+            update(UserUnreadCounter)
+            .where(UserUnreadCounter.user_id == user_id)
+            .values(unread_count=func.greatest(UserUnreadCounter.unread_count - amount, 0))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            update(UserOrderUnreadCounter)
+            .where(UserOrderUnreadCounter.user_id == user_id, UserOrderUnreadCounter.order_id == order_id)
+            .values(unread_count=func.greatest(UserOrderUnreadCounter.unread_count - amount, 0))
+            .execution_options(synchronize_session=False)
+        )
+
+    def get_total(self, user_id: int) -> int:
+        """Total de no leídos de un usuario (lectura por llave primaria)"""
+        count = self.db.execute(
+            select(UserUnreadCounter.unread_count).where(UserUnreadCounter.user_id == user_id)
+        ).scalar()
+        return count or 0
+
+    def get_by_order(self, user_id: int) -> Dict[int, int]:
+        """No leídos por orden de un usuario (rango sobre el prefijo de la llave primaria)"""
+        rows = self.db.execute(
+            select(UserOrderUnreadCounter.order_id, UserOrderUnreadCounter.unread_count)
+            .where(UserOrderUnreadCounter.user_id == user_id, UserOrderUnreadCounter.unread_count > 0)
+            .order_by(UserOrderUnreadCounter.order_id)
+        ).all()
+        return dict(rows)
+
+    def reconcile(self, batch_size: int = 1000) -> int:
+        """Recalcular los contadores desde order_messages, por lotes de usuarios.
+
+        Cada lote reemplaza los contadores de sus usuarios en su propia transacción,
+        así el job se puede interrumpir y volver a correr. Retorna cuántos usuarios revisó.
+        """
+        candidates = union(
+            select(OrderMessage.to_user_id.label("user_id"))
+                .where(OrderMessage.to_user_id.isnot(None), OrderMessage.is_read.is_(False)),
+            select(UserUnreadCounter.user_id),
+        ).subquery()
+
+        last_user_id = 0
+        reconciled = 0
+        while True:
+            user_ids: List[int] = self.db.execute(
+                select(candidates.c.user_id)
+                .where(candidates.c.user_id > last_user_id)
+                .order_by(candidates.c.user_id)
+                .limit(batch_size)
+            ).scalars().all()
+
+            if not user_ids:
+                return reconciled
+
+            ids = bigint_array(user_ids)
+            # Mismo orden de locks que increment/decrement: primero los totales de los
+            # usuarios (por user_id), después sus contadores por orden. Al revés, un lote
+            # concurrente con mensajes nuevos o marcados como leídos puede caer en deadlock.
+            self.db.execute(
+                select(UserUnreadCounter.user_id)
+                .where(UserUnreadCounter.user_id == any_(ids))
+                .order_by(UserUnreadCounter.user_id)
+                .with_for_update()
+            )
+            self.db.execute(delete(UserUnreadCounter).where(UserUnreadCounter.user_id == any_(ids)))
+            self.db.execute(delete(UserOrderUnreadCounter).where(UserOrderUnreadCounter.user_id == any_(ids)))
+            unread = select(OrderMessage.to_user_id, OrderMessage.order_id)\
+                .where(OrderMessage.to_user_id == any_(ids), OrderMessage.is_read.is_(False))\
+                .subquery()
+            # Solo se bloquean los contadores que ya existían: un increment concurrente puede
+            # crear el de un usuario del lote, así que el recálculo lo sobrescribe en vez de fallar
+            for table, keys, counts in (
+                (UserUnreadCounter.__table__, ["user_id"],
+                 select(unread.c.to_user_id, func.count()).group_by(unread.c.to_user_id)),
+                (UserOrderUnreadCounter.__table__, ["user_id", "order_id"],
+                 select(unread.c.to_user_id, unread.c.order_id, func.count())
+                 .group_by(unread.c.to_user_id, unread.c.order_id)),
+            ):
+                statement = pg_insert(table).from_select([*keys, "unread_count"], counts)
+                self.db.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=keys,
+                        set_={"unread_count": statement.excluded.unread_count, "updated_at": func.now()}
+                    )
+                )
+            self.db.commit()
+
+            reconciled += len(user_ids)
+            last_user_id = user_ids[-1]
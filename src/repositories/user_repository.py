@@ -0,0 +1,39 @@
+import os
+from typing import Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from ..models.user import User
+from ..services.cache import ReadThroughCache, register_cache, shared_backend
+
+# auth0_user_id (claim `sub` del JWT) -> User.id, consultado en cada petición autenticada
+user_id_cache = register_cache(ReadThroughCache(
+    "users_by_auth0_id",
+    serialize=str,
+    deserialize=int,
+    maxsize=int(os.getenv("USER_ID_CACHE_MAXSIZE", "50000")),
+    local_ttl=float(os.getenv("USER_ID_CACHE_LOCAL_TTL_SECONDS", "60")),
+    shared_ttl=int(os.getenv("USER_ID_CACHE_SHARED_TTL_SECONDS", "3600")),
+    backend=shared_backend
+))
+
+class UserRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_user_id_by_auth0_id(self, auth0_user_id: str) -> Optional[int]:
+        """ID local de un usuario activo por su auth0_user_id (usa users_auth0_user_id_idx)"""
+        return self.db.execute(
+            select(User.id)
+            .where(User.auth0_user_id == auth0_user_id, User.deleted_at.is_(None))
+            .order_by(User.id)
+            .limit(1)
+        ).scalar()
+
+    def get_cached_user_id_by_auth0_id(self, auth0_user_id: str) -> Optional[int]:
+        """Igual que get_user_id_by_auth0_id pero pasando por el caché de lectura"""
+        return user_id_cache.get_or_load(auth0_user_id, lambda: self.get_user_id_by_auth0_id(auth0_user_id))
+
+    @staticmethod
+    def invalidate_auth0_id(*auth0_user_ids: Optional[str]) -> None:
+        """Eliminar del caché los auth0_user_id de un usuario borrado o modificado (después del commit)"""
+        user_id_cache.invalidate(*{auth0_user_id for auth0_user_id in auth0_user_ids if auth0_user_id})
@@ -1,16 +1,22 @@
 # src/schemas/__init__.py
-from .user import UserBase, UserCreate, UserOut
+from .user import UserBase, UserCreate, UserOut, UserBatchOut
+from .batch import BatchIdsIn, MAX_BATCH_SIZE
 from .order import (
-    OrderBase, OrderCreate, OrderUpdate, OrderOut,
+    OrderBase, OrderCreate, OrderUpdate, OrderOut, OrderSummaryOut, OrderBatchOut,
     SubOrderBase, SubOrderCreate, SubOrderUpdate, SubOrderOut,
     OrderItemBase, OrderItemCreate, OrderItemOut,
-    OrderMessageBase, OrderMessageCreate, OrderMessageUpdate, OrderMessageOut
+    OrderMessageBase, OrderMessageCreate, OrderMessageUpdate, OrderMessageOut,
+    OrderMessagesReadIn, OrderMessagesReadOut, OrderImportError, OrderImportReport,
+    BulkStatusIn, BulkStatusOut, ALLOWED_STATUS_PREDECESSORS, MAX_BULK_STATUS_SIZE
 )
 
 __all__ = [
-    "UserBase", "UserCreate", "UserOut",
-    "OrderBase", "OrderCreate", "OrderUpdate", "OrderOut",
+    "UserBase", "UserCreate", "UserOut", "UserBatchOut",
+    "BatchIdsIn", "MAX_BATCH_SIZE",
+    "OrderBase", "OrderCreate", "OrderUpdate", "OrderOut", "OrderSummaryOut", "OrderBatchOut",
     "SubOrderBase", "SubOrderCreate", "SubOrderUpdate", "SubOrderOut",
     "OrderItemBase", "OrderItemCreate", "OrderItemOut",
-    "OrderMessageBase", "OrderMessageCreate", "OrderMessageUpdate", "OrderMessageOut"
+    "OrderMessageBase", "OrderMessageCreate", "OrderMessageUpdate", "OrderMessageOut",
+    "OrderMessagesReadIn", "OrderMessagesReadOut", "OrderImportError", "OrderImportReport",
+    "BulkStatusIn", "BulkStatusOut", "ALLOWED_STATUS_PREDECESSORS", "MAX_BULK_STATUS_SIZE"
 ]
@@ -0,0 +1,16 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class Auth0OutboxStatsOut(BaseModel):
+    pending: int = Field(0, description="Eventos pendientes de enviar a Auth0")
+    due: int = Field(0, description="Pendientes cuyo próximo intento ya venció")
+    pending_users: int = Field(0, description="Usuarios con eventos pendientes")
+    failed: int = Field(0, description="Eventos que fallaron definitivamente")
+    oldest_pending_seconds: float = Field(0, description="Antigüedad del evento pendiente más viejo")
+    workers: int = Field(0, description="Hilos de sincronización en este proceso")
+    calls: int = Field(0, description="Llamadas exitosas a Auth0 desde este proceso")
+    events: int = Field(0, description="Eventos aplicados por esas llamadas")
+    coalesced: int = Field(0, description="Eventos que se combinaron con otro en vez de enviarse aparte")
+    retries: int = Field(0, description="Intentos fallidos que se reprogramaron")
+    failed_events: int = Field(0, description="Eventos que este proceso marcó como fallidos")
+    last_lag_seconds: Optional[float] = Field(None, description="Demora entre el cambio y su envío, en el último envío")
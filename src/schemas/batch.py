@@ -0,0 +1,21 @@
+# src/schemas/batch.py
+from typing import List
+from pydantic import BaseModel, Field
+
+# Máximo de IDs por consulta batch
+MAX_BATCH_SIZE = 100
+
+class BatchIdsIn(BaseModel):
+    ids: List[int] = Field(..., min_items=1, max_items=MAX_BATCH_SIZE, description="IDs a consultar")
+
+def parse_batch_ids(raw: str) -> List[int]:
+    """Convertir "1,2,3" en una lista de IDs únicos; lanza ValueError si es inválida"""
+    try:
+        ids = list(dict.fromkeys(int(part) for part in raw.split(",") if part.strip()))
+    except ValueError:
+        raise ValueError("Los IDs deben ser números enteros separados por coma")
+    if not ids:
+        raise ValueError("Debe indicar al menos un ID")
+    if len(ids) > MAX_BATCH_SIZE:
+        raise ValueError(f"Máximo {MAX_BATCH_SIZE} IDs por consulta")
+    return ids
@@ -0,0 +1,29 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+class PoolWaitBucketOut(BaseModel):
+    le_ms: Optional[float] = Field(None, description="Límite superior del bucket en ms (null = sin límite)")
+    count: int = Field(0, description="Checkouts que tardaron hasta ese límite")
+
+class DbPoolStatsOut(BaseModel):
+    size: int = Field(0, description="Conexiones base del pool")
+    max_overflow: int = Field(0, description="Conexiones extra permitidas sobre `size`")
+    checked_out: int = Field(0, description="Conexiones en uso")
+    checked_in: int = Field(0, description="Conexiones libres en el pool")
+    overflow: int = Field(0, description="Conexiones extra abiertas ahora")
+    timeout_seconds: float = Field(0, description="Espera máxima por una conexión libre")
+    waiting: int = Field(0, description="Peticiones esperando una conexión en este momento")
+    checkouts: int = Field(0, description="Conexiones entregadas desde el arranque")
+    timeouts: int = Field(0, description="Peticiones que agotaron la espera")
+    wait_avg_ms: float = Field(0, description="Espera promedio por conexión")
+    wait_max_ms: float = Field(0, description="Espera máxima observada")
+    wait_histogram: List[PoolWaitBucketOut] = Field(default_factory=list)
+
+class ReplicaStatsOut(BaseModel):
+    name: str
+    healthy: bool = Field(True, description="En la rotación de lecturas")
+    lag_seconds: Optional[float] = Field(None, description="Retraso medido en la última revisión")
+    last_error: Optional[str] = Field(None, description="Motivo por el que salió de la rotación")
+    sessions: int = Field(0, description="Sesiones de lectura atendidas desde el arranque")
+    evictions: int = Field(0, description="Veces que salió de la rotación")
+    pool: Optional[DbPoolStatsOut] = None
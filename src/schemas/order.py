@@ -49,6 +49,21 @@ class OrderOut(OrderBase):
     class Config:
         from_attributes = True
 
+class OrderSummaryOut(BaseModel):
+    """Proyección liviana de una orden para listados (historial en móvil)"""
+    id: int
+    external_id: UUID
+    user_id: int
+    status: str
+    total_amount_cop: int
+    currency: str
+    created_at: datetime
+    item_count: int = Field(0, description="Cantidad de items de la orden")
+
+class OrderBatchOut(BaseModel):
+    items: Dict[int, OrderOut] = Field(default_factory=dict, description="Órdenes encontradas, indexadas por ID")
+    missing: List[int] = Field(default_factory=list, description="IDs que no existen")
+
 # Esquemas para SubOrder
 class SubOrderBase(BaseModel):
     store_id: int = Field(..., gt=0, description="ID de la tienda")
@@ -110,6 +125,12 @@ class OrderMessageCreate(OrderMessageBase):
 class OrderMessageUpdate(BaseModel):
     is_read: Optional[bool] = None
 
+class OrderMessagesReadIn(BaseModel):
+    up_to_id: int = Field(..., gt=0, description="Marcar como leídos los mensajes hasta este ID (inclusive)")
+
+class OrderMessagesReadOut(BaseModel):
+    updated: int = Field(..., description="Cantidad de mensajes marcados como leídos")
+
 class OrderMessageOut(OrderMessageBase):
     id: int
     order_id: int
@@ -121,6 +142,52 @@ class OrderMessageOut(OrderMessageBase):
     class Config:
         from_attributes = True
 
+# Esquemas para transiciones de estado masivas
+ORDER_STATUSES = ['pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled', 'refunded']
+# Estados desde los que se permite llegar a cada estado
+ALLOWED_STATUS_PREDECESSORS = {
+    'pending': [],
+    'confirmed': ['pending'],
+    'processing': ['pending', 'confirmed'],
+    'shipped': ['confirmed', 'processing'],
+    'delivered': ['shipped'],
+    'cancelled': ['pending', 'confirmed', 'processing'],
+    'refunded': ['shipped', 'delivered'],
+}
+# Máximo de IDs por transición masiva
+MAX_BULK_STATUS_SIZE = 1000
+
+class BulkStatusIn(BaseModel):
+    ids: List[int] = Field(..., min_items=1, max_items=MAX_BULK_STATUS_SIZE, description="IDs a actualizar")
+    status: str = Field(..., description="Nuevo estado")
+
+    @validator('ids')
+    def unique_ids(cls, v):
+        return list(dict.fromkeys(v))
+
+    @validator('status')
+    def validate_status(cls, v):
+        if not ALLOWED_STATUS_PREDECESSORS.get(v):
+            allowed = [status for status in ORDER_STATUSES if ALLOWED_STATUS_PREDECESSORS[status]]
+            raise ValueError(f'Status debe ser uno de: {", ".join(allowed)}')
+        return v
+
+class BulkStatusOut(BaseModel):
+    status: str
+    updated: List[int] = Field(default_factory=list, description="IDs que cambiaron de estado")
+    skipped: List[int] = Field(default_factory=list, description="IDs inexistentes o cuyo estado actual no permite la transición")
+    orders: List[int] = Field(default_factory=list, description="Órdenes cuyo estado cambió al derivarlo de sus sub-órdenes")
+
+# Esquemas para la importación masiva
+class OrderImportError(BaseModel):
+    line: int = Field(..., description="Número de línea del documento NDJSON")
+    error: str
+
+class OrderImportReport(BaseModel):
+    imported: int = Field(0, description="Órdenes importadas")
+    failed: int = Field(0, description="Líneas rechazadas")
+    errors: List[OrderImportError] = Field(default_factory=list, description="Detalle de errores (acotado)")
+
 # Actualizar referencias forward
 OrderCreate.model_rebuild()
 SubOrderCreate.model_rebuild()
\ No newline at end of file
@@ -0,0 +1,14 @@
+from typing import List
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+class PayoutStoreTotal(BaseModel):
+    store_id: int
+    payouts: int = Field(..., description="Payouts generados para la tienda")
+    amount_cop: int = Field(..., description="Total a liquidar en centavos")
+
+class PayoutRunOut(BaseModel):
+    batch_id: UUID = Field(..., description="Identificador de la corrida")
+    payouts: int = Field(0, description="Payouts generados")
+    amount_cop: int = Field(0, description="Total a liquidar en centavos")
+    stores: List[PayoutStoreTotal] = Field(default_factory=list, description="Totales por tienda")
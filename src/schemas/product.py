@@ -0,0 +1,32 @@
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+# Ordenamientos del catálogo: columna de ordenamiento y si es descendente
+PRODUCT_SORTS = {
+    "newest": ("created_at", True),
+    "price_asc": ("price_cop", False),
+    "price_desc": ("price_cop", True),
+}
+
+class ProductOut(BaseModel):
+    id: int
+    external_id: str
+    store_id: int
+    sku: Optional[str] = None
+    title: str
+    description: Optional[str] = None
+    condition: Optional[str] = None
+    price_cop: int = Field(..., description="Precio en centavos")
+    currency: Optional[str] = None
+    is_published: bool
+    is_visible: bool
+    attributes: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ProductSearchOut(ProductOut):
+    rank: float = Field(..., description="Relevancia (ts_rank)")
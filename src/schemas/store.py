@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, validator
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime
 
 class StoreBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=255, description="Nombre de la tienda")
@@ -69,3 +69,25 @@ class StoreOut(StoreBase):
 
     class Config:
         from_attributes = True
+
+class StoreBatchOut(BaseModel):
+    items: Dict[int, StoreOut] = Field(default_factory=dict, description="Tiendas encontradas, indexadas por ID")
+    missing: List[int] = Field(default_factory=list, description="IDs que no existen o fueron eliminadas")
+
+# Agrupaciones disponibles para las ventas de una tienda
+SALES_GRANULARITIES = ['day', 'week', 'month']
+# Rango máximo de fechas por consulta de ventas
+MAX_SALES_RANGE_DAYS = 731
+
+class StoreSalesOut(BaseModel):
+    period: date = Field(..., description="Inicio del periodo (día, lunes de la semana o primer día del mes)")
+    status: str = Field(..., description="Estado de las sub-órdenes")
+    sub_order_count: int
+    units: int = Field(..., description="Unidades vendidas")
+    gmv_cop: int = Field(..., description="Suma de subtotal_cop en centavos")
+    shipping_cop: int
+    marketplace_fee_cop: int
+    seller_net_cop: int
+
+    class Config:
+        from_attributes = True
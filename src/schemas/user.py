@@ -1,6 +1,6 @@
 # src/schemas/user.py
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import Dict, List, Optional
+from pydantic import BaseModel, EmailStr, Field
 from uuid import UUID
 
 class UserBase(BaseModel):
@@ -30,4 +30,12 @@ class UserOut(UserBase):
     external_id: UUID
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class UserBatchOut(BaseModel):
+    items: Dict[int, UserOut] = Field(default_factory=dict, description="Usuarios encontrados, indexados por ID")
+    missing: List[int] = Field(default_factory=list, description="IDs que no existen o fueron eliminados")
+
+class UnreadCountsOut(BaseModel):
+    total: int = Field(0, description="Total de mensajes no leídos del usuario")
+    orders: Dict[int, int] = Field(default_factory=dict, description="Mensajes no leídos por ID de orden")
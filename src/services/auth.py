@@ -0,0 +1,262 @@
+# src/services/auth.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import jwt
+import requests
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.orm import Session
+
+from ..db import SessionLocal, get_db
+from ..repositories.user_repository import UserRepository
+from .auth0 import AUTH0_TIMEOUT, auth0_domain
+from .cache import ReadThroughCache, register_cache
+
+logger = logging.getLogger(__name__)
+
+# Audiencia de la API propia (no la de la Management API)
+AUTH0_API_AUDIENCE = os.getenv("AUTH0_API_AUDIENCE")
+AUTH0_ISSUER = os.getenv("AUTH0_ISSUER") or (f"https://{auth0_domain}/" if auth0_domain else None)
+AUTH0_JWKS_URL = os.getenv("AUTH0_JWKS_URL") or (f"{AUTH0_ISSUER}.well-known/jwks.json" if AUTH0_ISSUER else None)
+JWT_ALGORITHMS = ["RS256"]
+# Holgura para diferencias de reloj al validar exp/nbf/iat
+JWT_LEEWAY_SECONDS = int(os.getenv("JWT_LEEWAY_SECONDS", "10"))
+# Refresco de fondo de las llaves (rotación programada)
+JWKS_REFRESH_SECONDS = float(os.getenv("JWKS_REFRESH_SECONDS", "600"))
+# Mínimo entre refrescos forzados por un `kid` desconocido, para que tokens falsos no saturen Auth0
+JWKS_MIN_REFRESH_SECONDS = float(os.getenv("JWKS_MIN_REFRESH_SECONDS", "30"))
+# Tokens ya verificados: se revalida la firma a lo sumo cada TTL y `exp` en cada uso
+VERIFIED_TOKEN_CACHE_MAXSIZE = int(os.getenv("VERIFIED_TOKEN_CACHE_MAXSIZE", "10000"))
+VERIFIED_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("VERIFIED_TOKEN_CACHE_TTL_SECONDS", "300"))
+# Permiso (RBAC de Auth0) requerido para generar payouts
+PAYOUTS_RUN_PERMISSION = os.getenv("AUTH0_PAYOUTS_RUN_PERMISSION", "run:payouts")
+# Permiso requerido para la importación masiva de órdenes
+ORDERS_IMPORT_PERMISSION = os.getenv("AUTH0_ORDERS_IMPORT_PERMISSION", "import:orders")
+# Permiso requerido para cambiar en bloque el estado de órdenes y sub-órdenes
+ORDERS_BULK_STATUS_PERMISSION = os.getenv("AUTH0_ORDERS_BULK_STATUS_PERMISSION", "update:order_status")
+# Permiso requerido para exportar órdenes con sus montos
+ORDERS_EXPORT_PERMISSION = os.getenv("AUTH0_ORDERS_EXPORT_PERMISSION", "export:orders")
+
+INVALID_TOKEN_ERROR = "Token inválido o vencido"
+
+class JWKSCache:
+    """Llaves públicas de firma de Auth0 indexadas por `kid`.
+
+    Un hilo las refresca cada JWKS_REFRESH_SECONDS; un `kid` desconocido fuerza un
+    refresco inmediato (rotación no programada), limitado a uno cada
+    JWKS_MIN_REFRESH_SECONDS. Si un refresco falla se conservan las llaves anteriores.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str],
+        refresh_interval: float = JWKS_REFRESH_SECONDS,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_SECONDS,
+        timeout=AUTH0_TIMEOUT
+    ):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not self.url:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="jwks-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Error refrescando JWKS desde %s: %s", self.url, e)
+            self._stop.wait(self.refresh_interval)
+
+    def refresh(self) -> None:
+        response = self.session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            if jwk.get("use", "sig") != "sig" or "kid" not in jwk:
+                continue
+            try:
+                keys[jwk["kid"]] = jwt.PyJWK(jwk).key
+            except jwt.PyJWKError as e:
+                logger.warning("Llave %s del JWKS ignorada: %s", jwk.get("kid"), e)
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+
+    def get_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Un solo refresco forzado a la vez; los demás hilos esperan y reutilizan su resultado
+        with self._refresh_lock:
+            key = self._keys.get(kid)
+            if key is None and (
+                self._fetched_at is None or time.monotonic() - self._fetched_at >= self.min_refresh_interval
+            ):
+                self.refresh()
+                key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidKeyError(f"kid desconocido: {kid}")
+        return key
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "keys": sorted(self._keys),
+                "age_seconds": time.monotonic() - self._fetched_at if self._fetched_at is not None else None,
+            }
+
+class TokenVerifier:
+    """Verifica localmente los access tokens de Auth0 (RS256) y guarda los ya verificados.
+
+    La verificación completa (firma, emisor, audiencia, vigencia) se hace la primera vez;
+    después el token se resuelve desde un LRU acotado, comprobando solo `exp`. La llave
+    del caché es el SHA-256 del token para no retener tokens en memoria.
+    """
+
+    def __init__(
+        self,
+        jwks: JWKSCache,
+        issuer: Optional[str],
+        audience: Optional[str],
+        leeway: int = JWT_LEEWAY_SECONDS,
+        cache_maxsize: int = VERIFIED_TOKEN_CACHE_MAXSIZE,
+        cache_ttl: float = VERIFIED_TOKEN_CACHE_TTL_SECONDS
+    ):
+        self.jwks = jwks
+        self.issuer = issuer
+        self.audience = audience
+        self.leeway = leeway
+        self.cache = register_cache(ReadThroughCache(
+            "verified_tokens",
+            serialize=json.dumps,
+            deserialize=json.loads,
+            maxsize=cache_maxsize,
+            local_ttl=cache_ttl,
+            shared_ttl=0
+        ))
+
+    @classmethod
+    def from_env(cls) -> "TokenVerifier":
+        return cls(JWKSCache(AUTH0_JWKS_URL), AUTH0_ISSUER, AUTH0_API_AUDIENCE)
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") not in JWT_ALGORITHMS:
+            raise jwt.InvalidAlgorithmError(f"Algoritmo no permitido: {header.get('alg')}")
+        if not header.get("kid"):
+            raise jwt.InvalidTokenError("El token no indica `kid`")
+        return jwt.decode(
+            token,
+            self.jwks.get_key(header["kid"]),
+            algorithms=JWT_ALGORITHMS,
+            audience=self.audience,
+            issuer=self.issuer,
+            leeway=self.leeway,
+            options={"require": ["exp", "iss", "sub"]}
+        )
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Claims de un token válido; lanza jwt.PyJWTError si no lo es"""
+        if not self.jwks.url:
+            raise jwt.InvalidTokenError("Verificación de JWT no configurada (AUTH0_DOMAIN o AUTH0_JWKS_URL)")
+
+        key = hashlib.sha256(token.encode()).hexdigest()
+        claims = self.cache.get_or_load(key, lambda: self._decode(token))
+        if claims["exp"] + self.leeway <= time.time():
+            self.cache.invalidate(key)
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        return claims
+
+token_verifier = TokenVerifier.from_env()
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+def get_current_claims(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)) -> Dict[str, Any]:
+    """Dependencia: claims del JWT de la cabecera Authorization (401 si falta o no es válido)"""
+    if credentials is None:
+        raise _unauthorized("Falta el token de acceso")
+    try:
+        return token_verifier.verify(credentials.credentials)
+    except jwt.PyJWTError as e:
+        logger.info("Token rechazado: %s", e)
+        raise _unauthorized(INVALID_TOKEN_ERROR)
+    except requests.RequestException as e:
+        logger.warning("No se pudo obtener el JWKS: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="No se pudieron obtener las llaves de Auth0"
+        )
+
+def token_permissions(claims: Dict[str, Any]) -> set:
+    """Permisos del token: el claim `permissions` (RBAC de Auth0) y los scopes de `scope`"""
+    permissions = set(claims.get("permissions") or [])
+    permissions.update((claims.get("scope") or "").split())
+    return permissions
+
+def require_permission(permission: str) -> Callable[..., Dict[str, Any]]:
+    """Dependencia: claims de un token que incluye `permission` (401 sin token, 403 sin el permiso)"""
+    def dependency(claims: Dict[str, Any] = Depends(get_current_claims)) -> Dict[str, Any]:
+        if permission not in token_permissions(claims):
+            logger.warning("Token de %s sin el permiso %s", claims.get("sub"), permission)
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"El token no tiene el permiso {permission}"
+            )
+        return claims
+    return dependency
+
+def _resolve_user_id(db: Session, claims: Dict[str, Any]) -> int:
+    user_id = UserRepository(db).get_cached_user_id_by_auth0_id(claims["sub"])
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="El token no corresponde a un usuario activo")
+    return user_id
+
+def get_current_user_id(
+    claims: Dict[str, Any] = Depends(get_current_claims),
+    db: Session = Depends(get_db)
+) -> int:
+    """Dependencia: User.id local del dueño del token (403 si no tiene usuario en la BD)"""
+    return _resolve_user_id(db, claims)
+
+def get_stream_user_id(claims: Dict[str, Any] = Depends(get_current_claims)) -> int:
+    """Igual que get_current_user_id para rutas en stream: la sesión de get_db viviría lo
+    que dura la conexión, así que se usa una sesión propia que se cierra de inmediato"""
+    db = SessionLocal()
+    try:
+        return _resolve_user_id(db, claims)
+    finally:
+        db.close()
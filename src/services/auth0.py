@@ -1,14 +1,154 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+auth0_domain = os.getenv("AUTH0_DOMAIN")
+auth0_client_id = os.getenv("AUTH0_CLIENT_ID")
+auth0_client_secret = os.getenv("AUTH0_CLIENT_SECRET")
+auth0_audience = os.getenv("AUTH0_AUDIENCE")
+
+# (conexión, lectura) en segundos
+AUTH0_TIMEOUT = (
+    float(os.getenv("AUTH0_CONNECT_TIMEOUT_SECONDS", "3.05")),
+    float(os.getenv("AUTH0_READ_TIMEOUT_SECONDS", "10")),
+)
+AUTH0_POOL_SIZE = int(os.getenv("AUTH0_POOL_SIZE", "10"))
+AUTH0_MAX_RETRIES = int(os.getenv("AUTH0_MAX_RETRIES", "3"))
+# Renovar el token este tiempo antes de que venza
+AUTH0_TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("AUTH0_TOKEN_REFRESH_MARGIN_SECONDS", "60"))
+
+class Auth0Client:
+    """Cliente de la Management API de Auth0 compartido por toda la aplicación.
+
+    Reutiliza conexiones (requests.Session con pool), guarda el token de
+    client_credentials hasta poco antes de `expires_in` y reintenta con backoff
+    las respuestas 429 (respetando Retry-After) y los errores de conexión.
+    """
+
+    def __init__(
+        self,
+        domain: Optional[str],
+        client_id: Optional[str],
+        client_secret: Optional[str],
+        audience: Optional[str],
+        base_url: Optional[str] = None,
+        timeout=AUTH0_TIMEOUT,
+        pool_size: int = AUTH0_POOL_SIZE,
+        max_retries: int = AUTH0_MAX_RETRIES,
+        refresh_margin: int = AUTH0_TOKEN_REFRESH_MARGIN_SECONDS
+    ):
+        self.base_url = (base_url or f"https://{domain}").rstrip("/")
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.audience = audience
+        self.timeout = timeout
+        self.refresh_margin = refresh_margin
+
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = threading.Lock()
+
+        # Solo 429 y errores de conexión: en ambos casos Auth0 no procesó la petición,
+        # así que reintentar un POST no crea duplicados
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            status_forcelist=[429],
+            allowed_methods=frozenset({"GET", "POST", "PATCH", "DELETE"}),
+            backoff_factor=0.5,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_env(cls) -> "Auth0Client":
+        return cls(
+            auth0_domain,
+            auth0_client_id,
+            auth0_client_secret,
+            auth0_audience,
+            base_url=os.getenv("AUTH0_BASE_URL")
+        )
+
+    def get_token(self) -> str:
+        """Token de la Management API, renovado solo cuando está por vencer"""
+        if self._token and time.monotonic() < self._token_expires_at:
+            return self._token
+
+        with self._token_lock:
+            # Otro hilo pudo renovarlo mientras se esperaba el lock
+            if self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+
+            response = self.session.post(
+                f"{self.base_url}/oauth/token",
+                json={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "audience": self.audience,
+                    "grant_type": "client_credentials"
+                },
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            data = response.json()
+            self._token = data["access_token"]
+            self._token_expires_at = time.monotonic() + max(int(data.get("expires_in", 0)) - self.refresh_margin, 0)
+            return self._token
+
+    def invalidate_token(self) -> None:
+        with self._token_lock:
+            self._token = None
+            self._token_expires_at = 0.0
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Llamar a la Management API; si el token fue revocado (401) se renueva una vez"""
+        for attempt in range(2):
+            response = self.session.request(
+                method,
+                f"{self.base_url}/api/v2/{path}",
+                headers={"Authorization": f"Bearer {self.get_token()}"},
+                timeout=self.timeout,
+                **kwargs
+            )
+            if response.status_code != 401 or attempt:
+                break
+            self.invalidate_token()
+
+        response.raise_for_status()
+        return response
+
+    def create_user(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.request("POST", "users", json=payload).json()
+
+    def update_user(self, auth0_user_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.request("PATCH", f"users/{quote(auth0_user_id, safe='')}", json=payload).json()
+
+    def delete_user(self, auth0_user_id: str) -> None:
+        self.request("DELETE", f"users/{quote(auth0_user_id, safe='')}")
+
+auth0_client = Auth0Client.from_env()
+
+def get_auth0_token():
+    return auth0_client.get_token()
+
 def create_auth0_user(email, password=None, full_name=None, phone=None, is_verified=False, can_sell=False):
     """
     Crea un usuario en Auth0 y retorna el objeto de usuario creado.
     El password es opcional (Auth0 puede enviar email de invitación si no se provee).
     """
-    token = get_auth0_token()
-    url = f"https://{auth0_domain}/api/v2/users"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
     payload = {
         "connection": "Username-Password-Authentication",  # Cambia si usas otra conexión
         "email": email,
@@ -22,39 +162,10 @@ def create_auth0_user(email, password=None, full_name=None, phone=None, is_verif
     }
     if password:
         payload["password"] = password
-    response = requests.post(url, json=payload, headers=headers)
-    response.raise_for_status()
-    return response.json()
-import requests
-import os
-
-auth0_domain = os.getenv("AUTH0_DOMAIN")
-auth0_client_id = os.getenv("AUTH0_CLIENT_ID")
-auth0_client_secret = os.getenv("AUTH0_CLIENT_SECRET")
-auth0_audience = os.getenv("AUTH0_AUDIENCE")
-
-def get_auth0_token():
-    url = f"https://{auth0_domain}/oauth/token"
-    payload = {
-        "client_id": auth0_client_id,
-        "client_secret": auth0_client_secret,
-        "audience": auth0_audience,
-        "grant_type": "client_credentials"
-    }
-    response = requests.post(url, json=payload)
-    response.raise_for_status()
-    return response.json()["access_token"]
+    return auth0_client.create_user(payload)
 
 def update_auth0_user_metadata(auth0_user_id, metadata: dict):
-    token = get_auth0_token()
-    url = f"https://{auth0_domain}/api/v2/users/{auth0_user_id}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
     payload = {
         "user_metadata": metadata
     }
-    response = requests.patch(url, json=payload, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return auth0_client.update_user(auth0_user_id, payload)
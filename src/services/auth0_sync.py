@@ -0,0 +1,196 @@
+# src/services/auth0_sync.py
+import logging
+import os
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from ..db import SessionLocal
+from ..models.auth0_outbox import Auth0OutboxEvent
+from ..repositories.auth0_outbox_repository import Auth0OutboxRepository
+from .auth0 import Auth0Client, auth0_client
+
+logger = logging.getLogger(__name__)
+
+# Hilos que vacían la cola en este proceso (0 = solo con src.jobs.drain_auth0_outbox)
+AUTH0_OUTBOX_WORKERS = int(os.getenv("AUTH0_OUTBOX_WORKERS", "2"))
+# Cada cuánto se revisa la cola cuando no llegan avisos de este proceso
+AUTH0_OUTBOX_POLL_SECONDS = float(os.getenv("AUTH0_OUTBOX_POLL_SECONDS", "2"))
+AUTH0_OUTBOX_MAX_ATTEMPTS = int(os.getenv("AUTH0_OUTBOX_MAX_ATTEMPTS", "12"))
+AUTH0_OUTBOX_BACKOFF_SECONDS = float(os.getenv("AUTH0_OUTBOX_BACKOFF_SECONDS", "2"))
+AUTH0_OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("AUTH0_OUTBOX_MAX_BACKOFF_SECONDS", "900"))
+# Tiempo que un worker se reserva los eventos tomados. Debe superar la llamada a Auth0 con
+# sus reintentos (timeouts, backoff, Retry-After); si no, otro worker puede reenviarlos.
+AUTH0_OUTBOX_LEASE_SECONDS = float(os.getenv("AUTH0_OUTBOX_LEASE_SECONDS", "120"))
+
+class PermanentSyncError(Exception):
+    """Auth0 rechazó el cambio (4xx): reintentarlo no sirve"""
+
+def backoff_delay(attempts: int) -> float:
+    """Espera exponencial con jitter antes del siguiente intento"""
+    delay = min(AUTH0_OUTBOX_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0), AUTH0_OUTBOX_MAX_BACKOFF_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+def coalesce_events(events: List[Auth0OutboxEvent]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Reducir los eventos pendientes de un usuario a una sola llamada.
+
+    Una eliminación reemplaza a todo lo demás. Las actualizaciones de metadata se
+    combinan en orden; Auth0 también combina `user_metadata` por llave, así que un
+    PATCH con el resultado equivale a aplicarlas una por una.
+    """
+    if any(event.operation == "delete" for event in events):
+        return "delete", None
+
+    metadata: Dict[str, Any] = {}
+    for event in events:
+        metadata.update(event.payload or {})
+    return "update_metadata", metadata
+
+def send_to_auth0(client: Auth0Client, auth0_user_id: str, operation: str, metadata: Optional[Dict[str, Any]]) -> None:
+    try:
+        if operation == "delete":
+            client.delete_user(auth0_user_id)
+        else:
+            client.update_user(auth0_user_id, {"user_metadata": metadata})
+    except requests.HTTPError as e:
+        status_code = e.response.status_code if e.response is not None else None
+        if operation == "delete" and status_code == 404:
+            # Ya no existe: la eliminación está hecha
+            return
+        if status_code is not None and 400 <= status_code < 500 and status_code not in (408, 429):
+            raise PermanentSyncError(str(e)) from e
+        raise
+
+class Auth0SyncWorker:
+    """Vacía la tabla auth0_outbox con un pool de hilos.
+
+    Cada hilo toma todos los eventos pendientes de un usuario con un lease
+    (AUTH0_OUTBOX_LEASE_SECONDS), los combina en una sola llamada a Auth0 hecha fuera
+    de toda transacción y luego los elimina en una transacción corta. Así una llamada
+    lenta no retiene una conexión del pool ni locks. Las fallas transitorias se
+    reintentan con backoff exponencial; los 4xx y los eventos que agotan
+    AUTH0_OUTBOX_MAX_ATTEMPTS quedan como `failed` para revisarlos.
+    """
+
+    def __init__(self, workers: int = AUTH0_OUTBOX_WORKERS, poll_interval: float = AUTH0_OUTBOX_POLL_SECONDS, client: Auth0Client = auth0_client):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.client = client
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "events": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "failed_events": 0,
+            "last_lag_seconds": None,
+        }
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"auth0-outbox-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    def wake(self) -> None:
+        """Avisar que hay eventos nuevos, para no esperar al siguiente sondeo"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.process_one():
+                    continue
+            except Exception as e:
+                logger.warning("Error procesando auth0_outbox: %s", e)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def process_one(self) -> bool:
+        """Sincronizar un usuario; retorna False si no había eventos vencidos"""
+        claimed = self._claim()
+        if claimed is None:
+            return False
+
+        auth0_user_id, events = claimed
+        event_ids = [event.id for event in events]
+        operation, metadata = coalesce_events(events)
+        try:
+            send_to_auth0(self.client, auth0_user_id, operation, metadata)
+        except PermanentSyncError as e:
+            self._record(lambda repo: repo.mark_failed(event_ids, str(e), None))
+            self._count(failed_events=len(events))
+            logger.error("Auth0 rechazó %s de %s: %s", operation, auth0_user_id, e)
+        except Exception as e:
+            attempts = max(event.attempts for event in events) + 1
+            if attempts >= AUTH0_OUTBOX_MAX_ATTEMPTS:
+                self._record(lambda repo: repo.mark_failed(event_ids, str(e), None))
+                self._count(failed_events=len(events))
+                logger.error("Se agotaron los reintentos de %s para %s: %s", operation, auth0_user_id, e)
+            else:
+                retry_at = datetime.now(timezone.utc) + timedelta(seconds=backoff_delay(attempts))
+                self._record(lambda repo: repo.mark_failed(event_ids, str(e), retry_at))
+                self._count(retries=1)
+        else:
+            self._record(lambda repo: repo.mark_sent(event_ids))
+            lag = (datetime.now(timezone.utc) - min(event.created_at for event in events)).total_seconds()
+            self._count(calls=1, events=len(events), coalesced=len(events) - 1, last_lag_seconds=lag)
+        return True
+
+    def _claim(self) -> Optional[Tuple[str, List[Auth0OutboxEvent]]]:
+        """Tomar los eventos de un usuario con un lease y hacer commit de inmediato"""
+        db = SessionLocal()
+        try:
+            claimed = Auth0OutboxRepository(db).claim_user(AUTH0_OUTBOX_LEASE_SECONDS)
+            # Los eventos se leen después del commit: se desacoplan para que no expiren
+            db.expunge_all()
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+    def _record(self, update: Callable[[Auth0OutboxRepository], None]) -> None:
+        """Registrar el resultado de la llamada en una transacción propia"""
+        db = SessionLocal()
+        try:
+            update(Auth0OutboxRepository(db))
+            db.commit()
+        finally:
+            db.close()
+
+    def drain(self, max_users: Optional[int] = None) -> int:
+        """Procesar hasta vaciar la cola (o `max_users` usuarios); retorna los usuarios procesados"""
+        processed = 0
+        while (max_users is None or processed < max_users) and self.process_one():
+            processed += 1
+        return processed
+
+    def _count(self, **values) -> None:
+        with self._stats_lock:
+            for key, value in values.items():
+                if key == "last_lag_seconds":
+                    self._stats[key] = value
+                else:
+                    self._stats[key] += value
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {"workers": len(self._threads), **self._stats}
+
+auth0_sync_worker = Auth0SyncWorker()
@@ -0,0 +1,248 @@
+# src/services/cache.py
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# "none" (solo caché en proceso), "local" (stand-in en memoria para pruebas) o "redis"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "none")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+class CacheStats:
+    """Contadores de un caché (thread-safe)"""
+
+    FIELDS = ("local_hits", "shared_hits", "misses", "evictions", "expirations", "invalidations", "shared_errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[field] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+class TTLCache:
+    """LRU acotado con expiración por entrada, para un solo proceso"""
+
+    def __init__(self, maxsize: int, ttl: float, stats: Optional[CacheStats] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = stats or CacheStats()
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.stats.incr("expirations")
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.incr("evictions")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class LocalCacheBackend:
+    """Backend compartido en memoria: reemplaza a Redis en pruebas y desarrollo"""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._data[key]
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+class RedisCacheBackend:
+    """Backend compartido entre procesos sobre Redis (requiere el paquete redis)"""
+
+    def __init__(self, url: str = REDIS_URL):
+        import redis  # Dependencia opcional: solo se necesita con CACHE_BACKEND=redis
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.1)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self._client.set(key, value, ex=ttl)
+
+    def delete(self, *keys: str) -> None:
+        self._client.delete(*keys)
+
+def build_shared_backend():
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend()
+    if CACHE_BACKEND == "local":
+        return LocalCacheBackend()
+    return None
+
+shared_backend = build_shared_backend()
+
+class ReadThroughCache:
+    """Caché de lectura en dos niveles: LRU en proceso y backend compartido opcional.
+
+    Las entradas en proceso viven poco (local_ttl) porque las invalidaciones de otros
+    workers solo llegan al backend compartido. Un error del backend compartido nunca
+    hace fallar la lectura: se cuenta y se consulta la base de datos.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        serialize: Callable[[Any], str],
+        deserialize: Callable[[str], Any],
+        maxsize: int,
+        local_ttl: float,
+        shared_ttl: int,
+        backend=None
+    ):
+        self.name = name
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.shared_ttl = shared_ttl
+        self.backend = backend
+        self.stats = CacheStats()
+        self.local = TTLCache(maxsize, local_ttl, self.stats)
+
+    def _shared_key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def _get_shared(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.backend.get(self._shared_key(key))
+        except Exception as e:
+            self.stats.incr("shared_errors")
+            logger.warning("Error leyendo el caché %s: %s", self.name, e)
+            return None
+        if raw is None:
+            return None
+        self.stats.incr("shared_hits")
+        value = self.deserialize(raw)
+        self.local.set(key, value)
+        return value
+
+    def _set_shared(self, key: str, value: Any) -> None:
+        try:
+            self.backend.set(self._shared_key(key), self.serialize(value), self.shared_ttl)
+        except Exception as e:
+            self.stats.incr("shared_errors")
+            logger.warning("Error escribiendo el caché %s: %s", self.name, e)
+
+    def get_or_load(self, key: str, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            self.stats.incr("local_hits")
+            return value
+
+        if self.backend is not None:
+            value = self._get_shared(key)
+            if value is not None:
+                return value
+
+        self.stats.incr("misses")
+        value = loader()
+        if value is None:
+            return None
+
+        self.local.set(key, value)
+        if self.backend is not None:
+            self._set_shared(key, value)
+        return value
+
+    async def get_or_load_async(self, key: str, loader: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """Igual que get_or_load con un loader async; el backend compartido se usa desde el threadpool"""
+        value = self.local.get(key)
+        if value is not None:
+            self.stats.incr("local_hits")
+            return value
+
+        if self.backend is not None:
+            value = await run_in_threadpool(self._get_shared, key)
+            if value is not None:
+                return value
+
+        self.stats.incr("misses")
+        value = await loader()
+        if value is None:
+            return None
+
+        self.local.set(key, value)
+        if self.backend is not None:
+            await run_in_threadpool(self._set_shared, key, value)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self.local.delete(key)
+        self.stats.incr("invalidations", len(keys))
+        if self.backend is not None and keys:
+            try:
+                self.backend.delete(*[self._shared_key(key) for key in keys])
+            except Exception as e:
+                self.stats.incr("shared_errors")
+                logger.warning("Error invalidando el caché %s: %s", self.name, e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats.snapshot(),
+            "size": len(self.local),
+            "maxsize": self.local.maxsize,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+        }
+
+_caches: Dict[str, ReadThroughCache] = {}
+
+def register_cache(cache: ReadThroughCache) -> ReadThroughCache:
+    _caches[cache.name] = cache
+    return cache
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Contadores de todos los cachés registrados"""
+    return {name: cache.get_stats() for name, cache in _caches.items()}
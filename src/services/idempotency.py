@@ -0,0 +1,198 @@
+# src/services/idempotency.py
+import asyncio
+import hashlib
+import logging
+import os
+from datetime import timedelta
+from typing import Iterable, List, Tuple
+
+import anyio
+import jwt
+import requests
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from ..db import SessionLocal
+from ..repositories.idempotency_repository import IdempotencyRepository
+from .auth import token_verifier
+
+logger = logging.getLogger(__name__)
+
+# Constantes
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_TTL = timedelta(seconds=int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")))
+# Tiempo sin renovar la reserva tras el cual una petición en curso se considera abandonada
+IDEMPOTENCY_LOCK_TIMEOUT = timedelta(seconds=int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", "60")))
+# Mientras la petición sigue en curso la reserva se renueva con esta frecuencia, así una
+# petición lenta no se vence y un reintento no ejecuta el handler por segunda vez
+IDEMPOTENCY_LOCK_REFRESH_SECONDS = IDEMPOTENCY_LOCK_TIMEOUT.total_seconds() / 3
+# Cuánto espera un duplicado concurrente a que termine la petición original
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+MAX_KEY_LENGTH = 255
+
+def _with_session(operation, *args):
+    db = SessionLocal()
+    try:
+        return operation(IdempotencyRepository(db), *args)
+    finally:
+        db.close()
+
+def _claim(repo: IdempotencyRepository, key: str, method: str, path: str, request_hash: str) -> bool:
+    return repo.claim(key, method, path, request_hash, IDEMPOTENCY_TTL, IDEMPOTENCY_LOCK_TIMEOUT)
+
+def _extend(repo: IdempotencyRepository, key: str) -> bool:
+    return repo.extend(key, IDEMPOTENCY_LOCK_TIMEOUT)
+
+async def _keep_locked(key: str) -> None:
+    """Renovar la reserva de la llave hasta que se cancele esta tarea"""
+    while True:
+        await asyncio.sleep(IDEMPOTENCY_LOCK_REFRESH_SECONDS)
+        try:
+            if not await run_in_threadpool(_with_session, _extend, key):
+                return
+        except Exception as e:
+            # Se reintenta en la siguiente vuelta; la reserva aún tiene margen
+            logger.warning("No se pudo renovar la llave de idempotencia: %s", e)
+
+async def _release(key: str) -> None:
+    # Protegido de la cancelación: si el cliente se desconecta, la llave se libera igual
+    with anyio.CancelScope(shield=True):
+        await run_in_threadpool(_with_session, IdempotencyRepository.release, key)
+
+async def _key_owner(request: Request) -> str:
+    """Dueño de la llave: el `sub` del token si es válido; si no, la IP del cliente.
+
+    Las rutas que exigen token lo validan igual después; aquí solo separa las llaves de
+    distintos usuarios. La verificación cacheada de TokenVerifier cuesta microsegundos.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            claims = await run_in_threadpool(token_verifier.verify, token)
+            return f"sub:{claims['sub']}"
+        except (jwt.PyJWTError, requests.RequestException):
+            pass
+    return f"client:{request.client.host if request.client else ''}"
+
+def _scoped_key(owner: str, method: str, path: str, key: str) -> str:
+    """La misma Idempotency-Key de otro usuario o en otra ruta es otra llave"""
+    return hashlib.sha256("\n".join([owner, method, path, key]).encode()).hexdigest()
+
+def _encode_headers(raw_headers: List[Tuple[bytes, bytes]]) -> List[List[str]]:
+    return [[name.decode("latin-1"), value.decode("latin-1")] for name, value in raw_headers]
+
+def _snapshot(repo: IdempotencyRepository, key: str):
+    record = repo.get(key)
+    if record is None:
+        return None
+    return {
+        "status": record.status,
+        "request_hash": record.request_hash,
+        "response_status": record.response_status,
+        "response_content_type": record.response_content_type,
+        "response_headers": record.response_headers,
+        "response_body": record.response_body,
+    }
+
+def _replay(record: dict) -> Response:
+    if record["response_headers"] is None:
+        # Guardada antes de que se guardaran los headers
+        return Response(
+            content=record["response_body"] or "",
+            status_code=record["response_status"],
+            media_type=record["response_content_type"],
+            headers={REPLAYED_HEADER: "true"}
+        )
+    response = Response(content=record["response_body"] or "", status_code=record["response_status"])
+    # Los headers guardados ya traen el content-length del mismo cuerpo
+    response.raw_headers = [
+        (name.encode("latin-1"), value.encode("latin-1")) for name, value in record["response_headers"]
+    ] + [(REPLAYED_HEADER.lower().encode("latin-1"), b"true")]
+    return response
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    """Repite la respuesta guardada cuando un POST llega de nuevo con la misma Idempotency-Key.
+
+    El primer request reserva la llave; los duplicados concurrentes esperan a que termine
+    y reciben la misma respuesta, sin volver a ejecutar la escritura. La llave vale por
+    usuario (o cliente), método y ruta. Las respuestas 5xx
+    no se guardan: la llave se libera para que el cliente pueda reintentar.
+    """
+
+    def __init__(self, app, paths: Iterable[str]):
+        super().__init__(app)
+        self.paths = set(paths)
+
+    async def dispatch(self, request: Request, call_next):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if request.method != "POST" or not key or request.url.path not in self.paths:
+            return await call_next(request)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return JSONResponse(status_code=400, content={"detail": f"{IDEMPOTENCY_HEADER} demasiado larga"})
+
+        key = _scoped_key(await _key_owner(request), request.method, request.url.path, key)
+        body = await request.body()
+        request_hash = hashlib.sha256(
+            b"\n".join([request.method.encode(), request.url.path.encode(), request.url.query.encode(), body])
+        ).hexdigest()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + IDEMPOTENCY_WAIT_SECONDS
+        delay = 0.05
+        while True:
+            if await run_in_threadpool(_with_session, _claim, key, request.method, request.url.path, request_hash):
+                return await self._process(request, call_next, key)
+
+            record = await run_in_threadpool(_with_session, _snapshot, key)
+            if record is not None:
+                if record["request_hash"] != request_hash:
+                    return JSONResponse(
+                        status_code=422,
+                        content={"detail": f"La {IDEMPOTENCY_HEADER} ya se usó con una petición distinta"}
+                    )
+                if record["status"] == "completed":
+                    return _replay(record)
+
+            # Otra petición con la misma llave está en curso: esperar su resultado
+            if loop.time() >= deadline:
+                return JSONResponse(
+                    status_code=409,
+                    content={"detail": "Una petición con la misma Idempotency-Key sigue en proceso"}
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    async def _process(self, request: Request, call_next, key: str) -> Response:
+        heartbeat = asyncio.create_task(_keep_locked(key))
+        try:
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        except BaseException:
+            # También CancelledError (cliente desconectado): sin liberarla, la llave
+            # quedaría bloqueada hasta IDEMPOTENCY_LOCK_TIMEOUT
+            heartbeat.cancel()
+            await _release(key)
+            raise
+        heartbeat.cancel()
+
+        if response.status_code >= 500:
+            await _release(key)
+        else:
+            await run_in_threadpool(
+                _with_session,
+                IdempotencyRepository.complete,
+                key,
+                response.status_code,
+                response.headers.get("content-type"),
+                _encode_headers(response.raw_headers),
+                body.decode()
+            )
+
+        # raw_headers conserva los headers repetidos (p. ej. varios Set-Cookie)
+        buffered = Response(content=body, status_code=response.status_code)
+        buffered.raw_headers = list(response.raw_headers)
+        return buffered
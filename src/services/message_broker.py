@@ -0,0 +1,211 @@
+# src/services/message_broker.py
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import Request
+from sqlalchemy import func
+from sqlalchemy import select as sa_select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..db import engine
+from ..models.order import OrderMessage
+from ..schemas.order import OrderMessageOut
+
+logger = logging.getLogger(__name__)
+
+# "memory" para un solo nodo / pruebas, "postgres" para LISTEN/NOTIFY entre workers
+MESSAGE_BROKER = os.getenv("MESSAGE_BROKER", "memory")
+NOTIFY_CHANNEL = "order_messages"
+# Postgres limita el payload de NOTIFY a 8000 bytes
+MAX_NOTIFY_PAYLOAD_BYTES = 7500
+SUBSCRIBER_QUEUE_SIZE = 256
+KEEPALIVE_SECONDS = 15
+RECONNECT_RETRY_MS = 3000
+
+def order_channel(order_id: int) -> str:
+    return f"order:{order_id}"
+
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def message_event(message: OrderMessage) -> Dict[str, Any]:
+    """Serializar un mensaje como evento"""
+    return OrderMessageOut.model_validate(message).model_dump(mode="json")
+
+def _offer(queue: asyncio.Queue, event: Optional[Dict[str, Any]]) -> None:
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # Cliente atrasado: se vacía la cola y se cierra el stream; al reconectar
+        # con Last-Event-ID recupera desde la base de datos lo que se perdió.
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+class InProcessBroker:
+    """Distribuye eventos de mensajes a los suscriptores SSE de este proceso"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[channel].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if not subscribers:
+                return
+            subscribers.difference_update({entry for entry in subscribers if entry[1] is queue})
+            if not subscribers:
+                del self._subscribers[channel]
+
+    def dispatch(self, event: Dict[str, Any]) -> None:
+        """Entregar un evento a los suscriptores de la orden y del destinatario (thread-safe)"""
+        channels = [order_channel(event["order_id"])]
+        if event.get("to_user_id"):
+            channels.append(user_channel(event["to_user_id"]))
+
+        with self._lock:
+            targets = [entry for channel in channels for entry in self._subscribers.get(channel, ())]
+
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(_offer, queue, event)
+
+    def publish(self, db: Session, message: OrderMessage) -> None:
+        """Publicar un mensaje ya confirmado en la base de datos"""
+        self.dispatch(message_event(message))
+
+class PostgresBroker(InProcessBroker):
+    """Publica con NOTIFY y reparte localmente lo que llega por LISTEN"""
+
+    def __init__(self):
+        super().__init__()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="order-messages-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def publish(self, db: Session, message: OrderMessage) -> None:
+        event = message_event(message)
+        payload = json.dumps(event, separators=(",", ":"))
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD_BYTES:
+            # Los suscriptores cargan el mensaje completo desde la base de datos
+            payload = json.dumps({
+                "id": event["id"],
+                "order_id": event["order_id"],
+                "to_user_id": event["to_user_id"],
+                "truncated": True
+            })
+        db.execute(sa_select(func.pg_notify(NOTIFY_CHANNEL, payload)))
+        db.commit()
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                # Conexión dedicada fuera del pool, en autocommit para recibir notificaciones
+                connection = engine.raw_connection()
+                driver_connection = connection.driver_connection
+                connection.detach()
+                driver_connection.autocommit = True
+                with driver_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+
+                while not self._stop.is_set():
+                    if select.select([driver_connection], [], [], 1.0) == ([], [], []):
+                        continue
+                    driver_connection.poll()
+                    while driver_connection.notifies:
+                        notify = driver_connection.notifies.pop(0)
+                        self.dispatch(json.loads(notify.payload))
+            except Exception as e:
+                logger.warning("Error escuchando %s, reconectando: %s", NOTIFY_CHANNEL, e)
+                self._stop.wait(1.0)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+def _build_broker() -> InProcessBroker:
+    if MESSAGE_BROKER == "postgres":
+        return PostgresBroker()
+    return InProcessBroker()
+
+message_broker = _build_broker()
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    return f"id: {event['id']}\nevent: message\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+async def stream_message_events(
+    request: Request,
+    channel: str,
+    last_event_id: Optional[int],
+    backfill: Callable[[int], List[Dict[str, Any]]],
+    load_message: Callable[[int], Optional[Dict[str, Any]]]
+) -> AsyncIterator[str]:
+    """Generar el stream SSE de un canal.
+
+    Se suscribe antes de consultar el historial para no perder mensajes entre ambos
+    pasos; si el cliente reconecta con un Last-Event-ID, primero recibe (por páginas)
+    los mensajes posteriores a ese ID y luego los eventos en vivo, sin duplicados.
+    """
+    queue = message_broker.subscribe(channel)
+    try:
+        yield f"retry: {RECONNECT_RETRY_MS}\n\n"
+
+        last_id = last_event_id or 0
+        if last_event_id is not None:
+            while True:
+                events = await run_in_threadpool(backfill, last_id)
+                for event in events:
+                    yield _format_sse(event)
+                    last_id = event["id"]
+                if not events:
+                    break
+
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            if event is None:
+                # Cola desbordada: cerrar para que el cliente reconecte y recupere
+                break
+            if event["id"] <= last_id:
+                continue
+            if event.get("truncated"):
+                event = await run_in_threadpool(load_message, event["id"])
+                if event is None:
+                    continue
+
+            yield _format_sse(event)
+            last_id = event["id"]
+    finally:
+        message_broker.unsubscribe(channel, queue)
@@ -0,0 +1,148 @@
+# src/services/order_export.py
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from ..db import SessionLocal
+from ..repositories.order_repository import EXPORT_COLUMNS, OrderRepository
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet es opcional: pip install pyarrow
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+EXPORT_COLUMN_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+def parquet_available() -> bool:
+    return pa is not None
+
+def _parquet_schema():
+    return pa.schema([
+        ("order_id", pa.int64()),
+        ("order_external_id", pa.string()),
+        ("user_id", pa.int64()),
+        ("order_status", pa.string()),
+        ("currency", pa.string()),
+        ("total_amount_cop", pa.int64()),
+        ("order_created_at", pa.timestamp("us", tz="UTC")),
+        ("sub_order_id", pa.int64()),
+        ("store_id", pa.int64()),
+        ("sub_order_status", pa.string()),
+        ("subtotal_cop", pa.int64()),
+        ("shipping_cop", pa.int64()),
+        ("marketplace_fee_cop", pa.int64()),
+        ("seller_net_cop", pa.int64()),
+        ("order_item_id", pa.int64()),
+        ("product_id", pa.int64()),
+        ("product_variant_id", pa.int64()),
+        ("title", pa.string()),
+        ("unit_price_cop", pa.int64()),
+        ("quantity", pa.int64()),
+        ("total_price_cop", pa.int64()),
+    ])
+
+def _csv_chunks(batches: Iterator[List]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMN_NAMES)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def _ndjson_chunks(batches: Iterator[List]) -> Iterator[bytes]:
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMN_NAMES, row)), default=_json_default, separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode()
+
+class _ChunkSink(io.RawIOBase):
+    """Destino de escritura para ParquetWriter que acumula lo escrito para enviarlo por partes"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def _parquet_chunks(batches: Iterator[List]) -> Iterator[bytes]:
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for rows in batches:
+            columns = list(zip(*rows))
+            columns[1] = [str(value) for value in columns[1]]  # UUID como texto
+            # Un row group por lote: la memoria queda acotada por el tamaño del lote
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+_WRITERS = {
+    "csv": _csv_chunks,
+    "ndjson": _ndjson_chunks,
+    "parquet": _parquet_chunks,
+}
+
+def export_orders(
+    export_format: str,
+    user_id: Optional[int] = None,
+    status: Optional[str] = None,
+    store_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> Iterator[bytes]:
+    """Generar el export de órdenes por partes, con su propia sesión.
+
+    Pensado para StreamingResponse: la sesión vive mientras se envía la respuesta
+    y se cierra al terminar o si el cliente se desconecta.
+    """
+    db = SessionLocal()
+    try:
+        batches = OrderRepository(db).stream_order_export_rows(
+            user_id=user_id,
+            status=status,
+            store_id=store_id,
+            created_from=created_from,
+            created_to=created_to
+        )
+        yield from _WRITERS[export_format](batches)
+    finally:
+        db.close()
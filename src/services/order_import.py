@@ -0,0 +1,218 @@
+# src/services/order_import.py
+import io
+import json
+from typing import Any, AsyncIterable, Iterable, List, Tuple
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..db import engine
+from ..models.order import Order, SubOrder, OrderItem
+from ..repositories.sales_rollup_repository import SalesRollupRepository
+from ..schemas.order import OrderCreate, OrderImportError, OrderImportReport
+
+# Órdenes validadas y cargadas por transacción
+CHUNK_SIZE = 5000
+# Máximo de errores detallados en el reporte (el conteo total sigue en `failed`)
+MAX_REPORTED_ERRORS = 1000
+MAX_LINE_BYTES = 1024 * 1024
+
+ORDER_COLUMNS = [
+    "id", "external_id", "user_id", "total_amount_cop", "currency", "status",
+    "shipping_address", "billing_address", "metadata"
+]
+SUB_ORDER_COLUMNS = [
+    "id", "external_id", "order_id", "store_id", "subtotal_cop", "shipping_cop",
+    "marketplace_fee_cop", "seller_net_cop", "status"
+]
+ORDER_ITEM_COLUMNS = [
+    "sub_order_id", "product_id", "product_variant_id", "title", "unit_price_cop",
+    "quantity", "total_price_cop"
+]
+
+ParsedOrder = Tuple[int, OrderCreate]
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+def _copy_value(value: Any) -> str:
+    """Formatear un valor para COPY en formato texto"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (int, Decimal, UUID)):
+        # Sin caracteres especiales: no hace falta escapar
+        return str(value)
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, separators=(",", ":"))
+    return str(value).translate(_COPY_ESCAPES)
+
+def _copy_rows(cursor, table, columns: List[str], rows: List[List[Any]]) -> None:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    column_names = ", ".join(table.c[column].name for column in columns)
+    cursor.copy_expert(f"COPY {table.name} ({column_names}) FROM STDIN", buffer)
+
+def _reserve_ids(cursor, table, count: int) -> List[int]:
+    """Reservar IDs de la secuencia de la tabla para poder enlazar filas antes del COPY"""
+    if count == 0:
+        return []
+    cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+        (table.name, count)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+class OrderImporter:
+    """Importa órdenes NDJSON por lotes: valida con OrderCreate y carga con COPY.
+
+    Cada lote es una transacción. Si la base de datos rechaza los datos de un lote (por
+    ejemplo una llave foránea inexistente), se divide a la mitad hasta aislar las líneas
+    culpables, de modo que el reporte queda por línea y el resto del lote se importa.
+    Cualquier otro error (conexión caída, timeout) se propaga sin reintentar por línea.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.report = OrderImportReport()
+
+    def _add_error(self, line: int, error: str) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(OrderImportError(line=line, error=error))
+
+    def import_chunk(self, lines: List[Tuple[int, bytes]]) -> None:
+        """Validar y cargar un lote de líneas (número de línea, contenido)"""
+        parsed: List[ParsedOrder] = []
+        for line_number, raw in lines:
+            if not raw.strip():
+                continue
+            try:
+                parsed.append((line_number, OrderCreate.model_validate_json(raw)))
+            except ValidationError as e:
+                self._add_error(line_number, "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ))
+
+        if parsed:
+            self._load(parsed)
+
+    def _load(self, orders: List[ParsedOrder]) -> None:
+        with engine.connect() as connection:
+            try:
+                with connection.begin():
+                    self._copy_orders(connection, orders)
+                self.report.imported += len(orders)
+                return
+            except (
+                DataError, IntegrityError, engine.dialect.dbapi.DataError, engine.dialect.dbapi.IntegrityError
+            ) as e:
+                if len(orders) == 1:
+                    error = e.orig if isinstance(e, DBAPIError) else e
+                    self._add_error(orders[0][0], str(error).strip().splitlines()[0])
+                    return
+
+        middle = len(orders) // 2
+        self._load(orders[:middle])
+        self._load(orders[middle:])
+
+    def _copy_orders(self, connection: Connection, orders: List[ParsedOrder]) -> None:
+        cursor = connection.connection.cursor()
+        try:
+            order_ids = _reserve_ids(cursor, Order.__table__, len(orders))
+            sub_order_ids = iter(_reserve_ids(
+                cursor, SubOrder.__table__, sum(len(order.sub_orders) for _, order in orders)
+            ))
+
+            order_rows, sub_order_rows, item_rows = [], [], []
+            for order_id, (_, order) in zip(order_ids, orders):
+                order_rows.append([
+                    order_id, uuid4(), order.user_id, order.total_amount_cop, order.currency,
+                    order.status, order.shipping_address, order.billing_address, order.order_metadata
+                ])
+                for sub_order in order.sub_orders:
+                    sub_order_id = next(sub_order_ids)
+                    sub_order_rows.append([
+                        sub_order_id, uuid4(), order_id, sub_order.store_id, sub_order.subtotal_cop,
+                        sub_order.shipping_cop, sub_order.marketplace_fee_cop, sub_order.seller_net_cop,
+                        sub_order.status
+                    ])
+                    for item in sub_order.order_items:
+                        item_rows.append([
+                            sub_order_id, item.product_id, item.product_variant_id, item.title,
+                            item.unit_price_cop, item.quantity, item.unit_price_cop * item.quantity
+                        ])
+
+            _copy_rows(cursor, Order.__table__, ORDER_COLUMNS, order_rows)
+            _copy_rows(cursor, SubOrder.__table__, SUB_ORDER_COLUMNS, sub_order_rows)
+            _copy_rows(cursor, OrderItem.__table__, ORDER_ITEM_COLUMNS, item_rows)
+
+            SalesRollupRepository(Session(bind=connection)).apply([row[0] for row in sub_order_rows])
+        finally:
+            cursor.close()
+
+def import_ndjson_lines(lines: Iterable[bytes], chunk_size: int = CHUNK_SIZE) -> OrderImportReport:
+    """Importar desde un iterable de líneas (archivo o stdin)"""
+    importer = OrderImporter(chunk_size)
+    chunk: List[Tuple[int, bytes]] = []
+    for line_number, line in enumerate(lines, start=1):
+        chunk.append((line_number, line))
+        if len(chunk) >= chunk_size:
+            importer.import_chunk(chunk)
+            chunk = []
+    if chunk:
+        importer.import_chunk(chunk)
+    return importer.report
+
+async def import_ndjson_stream(stream: AsyncIterable[bytes], chunk_size: int = CHUNK_SIZE) -> OrderImportReport:
+    """Importar desde el cuerpo de una petición, sin cargarlo completo en memoria.
+
+    Una línea de más de MAX_LINE_BYTES se reporta como error y se descarta hasta el
+    siguiente salto de línea: los lotes anteriores ya están confirmados, así que el
+    reporte debe llegar completo al cliente.
+    """
+    importer = OrderImporter(chunk_size)
+    chunk: List[Tuple[int, bytes]] = []
+    pending = b""
+    line_number = 0
+    # Descartando el resto de una línea demasiado larga
+    skipping = False
+
+    def oversized(line: int) -> None:
+        importer._add_error(line, f"La línea supera el máximo de {MAX_LINE_BYTES} bytes")
+
+    async for data in stream:
+        if skipping:
+            newline = data.find(b"\n")
+            if newline == -1:
+                continue
+            data = data[newline + 1:]
+            skipping = False
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if len(line) > MAX_LINE_BYTES:
+                oversized(line_number)
+                continue
+            chunk.append((line_number, line))
+            if len(chunk) >= chunk_size:
+                await run_in_threadpool(importer.import_chunk, chunk)
+                chunk = []
+        if len(pending) > MAX_LINE_BYTES:
+            line_number += 1
+            oversized(line_number)
+            pending = b""
+            skipping = True
+
+    if pending:
+        chunk.append((line_number + 1, pending))
+    if chunk:
+        await run_in_threadpool(importer.import_chunk, chunk)
+    return importer.report
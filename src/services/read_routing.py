@@ -0,0 +1,50 @@
+# src/services/read_routing.py
+import math
+import time
+from typing import Iterable
+
+from starlette.datastructures import MutableHeaders
+
+from ..core.config import settings
+from ..db import STICKY_PRIMARY_COOKIE, replica_set
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+class ReadYourWritesMiddleware:
+    """Después de una escritura, manda las lecturas del mismo cliente al primario.
+
+    Cada respuesta a POST/PUT/PATCH/DELETE lleva la cookie STICKY_PRIMARY_COOKIE con el
+    instante hasta el que get_read_db debe evitar las réplicas, que pueden no tener aún lo
+    recién escrito. Solo actúa si hay réplicas configuradas. Es ASGI puro para no cargar
+    en memoria las respuestas en stream.
+    """
+
+    def __init__(self, app, read_only_paths: Iterable[str] = (), window: float = settings.DB_STICKY_PRIMARY_SECONDS):
+        self.app = app
+        # POST que solo leen (p. ej. consultas batch con el cuerpo como filtro)
+        self.read_only_paths = set(read_only_paths)
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in WRITE_METHODS
+            or scope["path"] in self.read_only_paths
+            or not replica_set
+            or self.window <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start":
+                # También en errores: una escritura fallida pudo confirmar una parte
+                until = time.time() + self.window
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{STICKY_PRIMARY_COOKIE}={until:.3f}; Max-Age={math.ceil(self.window)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,103 @@
+# src/services/sql_instrumentation.py
+import json
+import logging
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+from ..core.config import settings
+from ..core.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+def route_query_budget(scope) -> Optional[int]:
+    """Máximo de sentencias para la ruta de la petición (None = sin límite)"""
+    route = scope.get("route")
+    budget = settings.SQL_ROUTE_QUERY_BUDGETS.get(route.name) if route is not None else None
+    if budget is None:
+        budget = settings.SQL_QUERY_BUDGET
+    return budget or None
+
+class SQLInstrumentationMiddleware:
+    """Cuenta las sentencias SQL de cada petición (ver src/core/query_stats.py).
+
+    Agrega `Server-Timing: db;dur=...;desc="sentencias: N, filas: M", app;dur=...` y registra
+    un log JSON por petición: INFO normalmente, WARNING si hay sentencias repetidas
+    (posible N+1) o se excede el presupuesto de la ruta. En modo strict una petición que
+    excede el presupuesto responde 500 con el detalle. Las sentencias que corren después
+    de enviar los headers (respuestas en stream) solo quedan en el log.
+    """
+
+    def __init__(
+        self,
+        app,
+        mode: str = settings.SQL_BUDGET_MODE,
+        repeated_threshold: int = settings.SQL_REPEATED_STATEMENT_THRESHOLD,
+    ):
+        self.app = app
+        self.strict = mode == "strict"
+        self.repeated_threshold = repeated_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started_at = time.perf_counter()
+        status = None
+        rejected = False
+
+        async def send_with_timing(message):
+            nonlocal status, rejected
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                budget = route_query_budget(scope)
+                if self.strict and budget is not None and stats.statements > budget:
+                    rejected = True
+                    status = 500
+                    response = JSONResponse(status_code=500, content={
+                        "detail": f"La petición ejecutó {stats.statements} sentencias SQL (presupuesto: {budget})",
+                        "sql": stats.get_stats(repeated_threshold=2),
+                    })
+                    await response(scope, receive, send)
+                    return
+                status = message["status"]
+                app_ms = (time.perf_counter() - started_at) * 1000
+                MutableHeaders(scope=message).append(
+                    SERVER_TIMING_HEADER,
+                    f'db;dur={stats.db_seconds * 1000:.3f};desc="sentencias: {stats.statements}, filas: {stats.rows}", '
+                    f"app;dur={app_ms:.3f}"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self._log(scope, status, stats, (time.perf_counter() - started_at) * 1000)
+
+    def _log(self, scope, status: Optional[int], stats: QueryStats, app_ms: float) -> None:
+        if not stats.statements:
+            return
+        route = scope.get("route")
+        # Se evalúa al final: incluye las sentencias de las respuestas en stream
+        budget = route_query_budget(scope)
+        over_budget = budget is not None and stats.statements > budget
+        summary = stats.get_stats(self.repeated_threshold)
+        summary.update({
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route.name if route is not None else None,
+            "status": status,
+            "app_ms": round(app_ms, 3),
+            "over_budget": over_budget,
+        })
+        level = logging.WARNING if over_budget or summary["repeated"] else logging.INFO
+        logger.log(level, "sql %s", json.dumps(summary, separators=(",", ":")))
@@ -0,0 +1,146 @@
+# tests/conftest.py
+import json
+import os
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+import jwt
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import src.models  # noqa: F401  (registra todas las tablas en Base.metadata)
+import src.models.stores  # noqa: F401
+from src.db import Base
+
+# Postgres para las pruebas que lo necesitan; sin esta variable se omiten
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+class FakeServer:
+    """Servidor HTTP local para reemplazar servicios externos (Auth0, JWKS) en las pruebas.
+
+    `routes` mapea (método, ruta) a un handler que recibe la petición registrada y
+    retorna (status, body JSON) o (status, body JSON, headers). Todas las peticiones
+    quedan en `requests`.
+    """
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], Callable] = {}
+        self.requests: List[dict] = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                request = {
+                    "method": self.command,
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "json": json.loads(body) if body else None,
+                }
+                with server._lock:
+                    server.requests.append(request)
+                handler = server.routes.get((self.command, self.path.split("?")[0]))
+                result = handler(request) if handler else (404, {"error": "not found"})
+                status, payload, headers = result if len(result) == 3 else (*result, {})
+                data = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def count(self, method: str, path: str) -> int:
+        with self._lock:
+            return sum(1 for r in self.requests if r["method"] == method and r["path"].split("?")[0] == path)
+
+    def start(self) -> "FakeServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+@pytest.fixture
+def fake_server():
+    server = FakeServer().start()
+    yield server
+    server.stop()
+
+class FakeTokenVerifier:
+    """Reemplazo de auth.token_verifier: cada token es una llave de `tokens` con sus claims"""
+
+    def __init__(self):
+        self.tokens: Dict[str, dict] = {}
+
+    def verify(self, token: str) -> dict:
+        if token not in self.tokens:
+            raise jwt.InvalidTokenError("token desconocido")
+        return self.tokens[token]
+
+@pytest.fixture
+def fake_tokens(monkeypatch):
+    """Tokens de prueba sin JWKS; el verificador real se prueba en test_auth.py"""
+    from src.services import auth
+
+    verifier = FakeTokenVerifier()
+    monkeypatch.setattr(auth, "token_verifier", verifier)
+    return verifier.tokens
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL no configurada")
+    engine = create_engine(TEST_DATABASE_URL)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def pg_session(pg_engine):
+    """Sesión sobre un esquema temporal creado con los modelos; todo se revierte al terminar"""
+    with pg_engine.connect() as connection:
+        transaction = connection.begin()
+        schema = f"test_{uuid.uuid4().hex[:12]}"
+        connection.exec_driver_sql(f"CREATE SCHEMA {schema}")
+        # Solo el esquema temporal: con public en el path, create_all omitiría las tablas
+        # que ya existen allí y las pruebas correrían sobre ellas
+        connection.exec_driver_sql(f"SET LOCAL search_path TO {schema}")
+        Base.metadata.create_all(connection)
+        session = Session(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+@pytest.fixture
+def pg_schema_engine(pg_engine):
+    """Motor cuyas conexiones usan un esquema temporal ya confirmado, para pruebas con
+    varias transacciones concurrentes; el esquema se elimina al terminar"""
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    with pg_engine.begin() as connection:
+        connection.exec_driver_sql(f"CREATE SCHEMA {schema}")
+    engine = create_engine(TEST_DATABASE_URL, connect_args={"options": f"-c search_path={schema}"})
+    try:
+        Base.metadata.create_all(engine)
+        yield engine
+    finally:
+        engine.dispose()
+        with pg_engine.begin() as connection:
+            connection.exec_driver_sql(f"DROP SCHEMA {schema} CASCADE")
@@ -0,0 +1,47 @@
+# tests/test_admin.py
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.db import get_db
+from src.main import app
+from src.repositories.payout_repository import PayoutRepository
+from src.schemas.payout import PayoutRunOut
+from src.services import auth
+
+@pytest.fixture
+def client(monkeypatch, fake_tokens):
+    fake_tokens.update({
+        "sin-permisos": {"sub": "auth0|1", "scope": "openid profile"},
+        "rbac": {"sub": "auth0|2", "permissions": [auth.PAYOUTS_RUN_PERMISSION]},
+        "scope": {"sub": "auth0|3", "scope": f"openid {auth.PAYOUTS_RUN_PERMISSION}"},
+    })
+    runs = []
+    monkeypatch.setattr(
+        PayoutRepository, "run_payouts",
+        lambda self, **kwargs: runs.append(kwargs) or PayoutRunOut(batch_id=uuid.uuid4())
+    )
+    app.dependency_overrides[get_db] = lambda: None
+    client = TestClient(app)
+    client.runs = runs
+    yield client
+    app.dependency_overrides.clear()
+
+def _run(client, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return client.post("/api/v1/admin/payouts/run", headers=headers)
+
+def test_run_payouts_requires_token(client):
+    assert _run(client).status_code == 401
+    assert _run(client, "falso").status_code == 401
+    assert client.runs == []
+
+def test_run_payouts_requires_permission(client):
+    assert _run(client, "sin-permisos").status_code == 403
+    assert client.runs == []
+
+@pytest.mark.parametrize("token", ["rbac", "scope"])
+def test_run_payouts_with_permission(client, token):
+    assert _run(client, token).status_code == 200
+    assert client.runs == [{"batch_size": 1000, "max_batches": None}]
@@ -0,0 +1,142 @@
+# tests/test_auth.py
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from src.db import get_db
+from src.repositories.user_repository import UserRepository
+from src.services import auth
+from src.services.auth import JWKSCache, TokenVerifier
+
+ISSUER = "https://lum.test.auth0.com/"
+AUDIENCE = "https://api.lum.test"
+
+def _private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+def _jwk(key, kid):
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return jwk
+
+def _token(key, kid, **overrides):
+    now = int(time.time())
+    claims = {"iss": ISSUER, "aud": AUDIENCE, "sub": "auth0|123", "iat": now, "exp": now + 600}
+    claims.update(overrides)
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+@pytest.fixture
+def signing_key():
+    return _private_key()
+
+@pytest.fixture
+def jwks(fake_server, signing_key):
+    """JWKS local con la llave "k1"; se cambia reasignando fake_server.jwks"""
+    fake_server.jwks = [_jwk(signing_key, "k1")]
+    fake_server.routes[("GET", "/.well-known/jwks.json")] = lambda request: (200, {"keys": fake_server.jwks})
+    return fake_server
+
+@pytest.fixture
+def verifier(jwks):
+    cache = JWKSCache(f"{jwks.url}/.well-known/jwks.json", min_refresh_interval=30, timeout=5)
+    return TokenVerifier(cache, ISSUER, AUDIENCE, leeway=0)
+
+def test_valid_token_returns_claims(verifier, signing_key):
+    claims = verifier.verify(_token(signing_key, "k1"))
+    assert claims["sub"] == "auth0|123"
+
+def test_verified_token_is_served_from_cache(verifier, signing_key, jwks):
+    token = _token(signing_key, "k1")
+    verifier.verify(token)
+    verifier.verify(token)
+    stats = verifier.cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["local_hits"] == 1
+    assert jwks.count("GET", "/.well-known/jwks.json") == 1
+
+@pytest.mark.parametrize("overrides, error", [
+    ({"exp": int(time.time()) - 5}, jwt.ExpiredSignatureError),
+    ({"aud": "https://otra.api"}, jwt.InvalidAudienceError),
+    ({"iss": "https://otro.auth0.com/"}, jwt.InvalidIssuerError),
+])
+def test_invalid_claims_are_rejected(verifier, signing_key, overrides, error):
+    with pytest.raises(error):
+        verifier.verify(_token(signing_key, "k1", **overrides))
+
+def test_forged_signature_is_rejected(verifier):
+    with pytest.raises(jwt.InvalidSignatureError):
+        verifier.verify(_token(_private_key(), "k1"))
+
+def test_hs256_token_is_rejected(verifier):
+    token = jwt.encode({"iss": ISSUER, "aud": AUDIENCE, "sub": "x", "exp": int(time.time()) + 60}, "k1" * 16, headers={"kid": "k1"})
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        verifier.verify(token)
+
+def test_cached_token_expires(verifier, signing_key):
+    token = _token(signing_key, "k1", exp=int(time.time()) + 1)
+    verifier.verify(token)
+    time.sleep(1.1)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(token)
+
+def test_rotated_key_is_fetched_once(verifier, signing_key, jwks):
+    verifier.verify(_token(signing_key, "k1"))
+    rotated = _private_key()
+    jwks.jwks = [_jwk(signing_key, "k1"), _jwk(rotated, "k2")]
+    # Simular que ya pasó min_refresh_interval desde el primer fetch
+    verifier.jwks._fetched_at -= 30
+
+    assert verifier.verify(_token(rotated, "k2"))["sub"] == "auth0|123"
+    assert jwks.count("GET", "/.well-known/jwks.json") == 2
+
+def test_unknown_kids_do_not_flood_jwks(verifier, signing_key, jwks):
+    verifier.verify(_token(signing_key, "k1"))
+    for i in range(20):
+        with pytest.raises(jwt.InvalidKeyError):
+            verifier.verify(_token(signing_key, f"falso{i}"))
+    assert jwks.count("GET", "/.well-known/jwks.json") == 1
+
+@pytest.fixture
+def client(verifier, monkeypatch):
+    """App mínima con una ruta protegida; usuarios locales reemplazados por un dict"""
+    users = {"auth0|123": 7}
+    monkeypatch.setattr(auth, "token_verifier", verifier)
+    monkeypatch.setattr(UserRepository, "get_cached_user_id_by_auth0_id", lambda self, sub: users.get(sub))
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = lambda: None
+
+    @app.get("/me")
+    def me(user_id: int = Depends(auth.get_current_user_id)):
+        return {"user_id": user_id}
+
+    return TestClient(app)
+
+def test_dependency_resolves_local_user(client, signing_key):
+    response = client.get("/me", headers={"Authorization": f"Bearer {_token(signing_key, 'k1')}"})
+    assert response.status_code == 200
+    assert response.json() == {"user_id": 7}
+
+def test_dependency_requires_token(client):
+    response = client.get("/me")
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+def test_dependency_rejects_invalid_token(client):
+    response = client.get("/me", headers={"Authorization": f"Bearer {_token(_private_key(), 'k1')}"})
+    assert response.status_code == 401
+
+def test_dependency_rejects_unknown_user(client, signing_key):
+    token = _token(signing_key, "k1", sub="auth0|desconocido")
+    response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+def test_dependency_reports_unreachable_jwks(client, signing_key, jwks):
+    jwks.routes[("GET", "/.well-known/jwks.json")] = lambda request: (500, {"error": "caído"})
+    response = client.get("/me", headers={"Authorization": f"Bearer {_token(signing_key, 'k1')}"})
+    assert response.status_code == 503
@@ -0,0 +1,109 @@
+# tests/test_auth0_client.py
+import itertools
+import threading
+import time
+
+import pytest
+import requests
+
+from src.services.auth0 import Auth0Client
+
+@pytest.fixture
+def auth0(fake_server):
+    """Auth0 local: /oauth/token entrega t1, t2, ... y POST /api/v2/users responde 201"""
+    tokens = itertools.count(1)
+    fake_server.expires_in = 86400
+    fake_server.routes[("POST", "/oauth/token")] = lambda request: (
+        200, {"access_token": f"t{next(tokens)}", "expires_in": fake_server.expires_in, "token_type": "Bearer"}
+    )
+    fake_server.routes[("POST", "/api/v2/users")] = lambda request: (201, {"user_id": "auth0|nuevo"})
+    return fake_server
+
+def _client(server, **kwargs) -> Auth0Client:
+    return Auth0Client(None, "client-id", "secret", "https://lum.test/api/v2/", base_url=server.url, timeout=5, **kwargs)
+
+def _authorizations(server, path="/api/v2/users"):
+    return [r["headers"]["Authorization"] for r in server.requests if r["path"] == path]
+
+def test_token_is_reused_across_calls(auth0):
+    client = _client(auth0)
+    for _ in range(3):
+        assert client.create_user({"email": "a@lum.test"}) == {"user_id": "auth0|nuevo"}
+
+    assert auth0.count("POST", "/oauth/token") == 1
+    assert _authorizations(auth0) == ["Bearer t1"] * 3
+    token_request = auth0.requests[0]["json"]
+    assert token_request["grant_type"] == "client_credentials"
+    assert token_request["audience"] == "https://lum.test/api/v2/"
+
+def test_token_is_renewed_within_refresh_margin(auth0):
+    auth0.expires_in = 60
+    client = _client(auth0, refresh_margin=60)
+    client.create_user({})
+    client.create_user({})
+    assert auth0.count("POST", "/oauth/token") == 2
+    assert _authorizations(auth0) == ["Bearer t1", "Bearer t2"]
+
+def test_concurrent_callers_fetch_one_token(auth0):
+    token_route = auth0.routes[("POST", "/oauth/token")]
+
+    def slow_token(request):
+        time.sleep(0.2)
+        return token_route(request)
+
+    auth0.routes[("POST", "/oauth/token")] = slow_token
+    client = _client(auth0)
+    barrier = threading.Barrier(10)
+    tokens = []
+
+    def worker():
+        barrier.wait()
+        tokens.append(client.get_token())
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["t1"] * 10
+    assert auth0.count("POST", "/oauth/token") == 1
+
+def test_rate_limited_request_is_retried(auth0):
+    responses = iter([(429, {"error": "too_many_requests"}, {"Retry-After": "0"})])
+    auth0.routes[("POST", "/api/v2/users")] = lambda request: next(responses, (201, {"user_id": "auth0|nuevo"}))
+
+    assert _client(auth0).create_user({}) == {"user_id": "auth0|nuevo"}
+    assert auth0.count("POST", "/api/v2/users") == 2
+
+def test_rate_limit_gives_up_after_max_retries(auth0):
+    auth0.routes[("POST", "/api/v2/users")] = lambda request: (429, {"error": "too_many_requests"}, {"Retry-After": "0"})
+
+    with pytest.raises(requests.HTTPError) as error:
+        _client(auth0, max_retries=2).create_user({})
+    assert error.value.response.status_code == 429
+    assert auth0.count("POST", "/api/v2/users") == 3
+
+def test_revoked_token_is_renewed_once(auth0):
+    # Solo t2 es válido: t1 fue revocado
+    auth0.routes[("POST", "/api/v2/users")] = lambda request: (
+        (201, {"user_id": "auth0|nuevo"}) if request["headers"]["Authorization"] == "Bearer t2" else (401, {})
+    )
+    client = _client(auth0)
+
+    assert client.create_user({}) == {"user_id": "auth0|nuevo"}
+    assert _authorizations(auth0) == ["Bearer t1", "Bearer t2"]
+    assert client.get_token() == "t2"
+
+def test_unauthorized_after_renewal_is_raised(auth0):
+    auth0.routes[("POST", "/api/v2/users")] = lambda request: (401, {})
+
+    with pytest.raises(requests.HTTPError):
+        _client(auth0).create_user({})
+    assert auth0.count("POST", "/oauth/token") == 2
+    assert auth0.count("POST", "/api/v2/users") == 2
+
+def test_user_ids_are_quoted_in_paths(auth0):
+    auth0.routes[("DELETE", "/api/v2/users/auth0%7C123")] = lambda request: (204, None)
+    _client(auth0).delete_user("auth0|123")
+    assert auth0.count("DELETE", "/api/v2/users/auth0%7C123") == 1
@@ -0,0 +1,159 @@
+# tests/test_auth0_outbox.py
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+import requests
+from sqlalchemy import text
+
+from src.models.auth0_outbox import Auth0OutboxEvent
+from src.repositories.auth0_outbox_repository import Auth0OutboxRepository
+from src.services import auth0_sync
+from src.services.auth0_sync import Auth0SyncWorker
+
+# --- Lease en la base ---
+
+def _enqueue(db, auth0_user_id, **metadata):
+    Auth0OutboxRepository(db).enqueue_metadata(auth0_user_id, metadata)
+    db.flush()
+
+def test_claimed_events_are_leased(pg_session):
+    db = pg_session
+    _enqueue(db, "auth0|a", plan="pro")
+    _enqueue(db, "auth0|a", pais="CO")
+    repo = Auth0OutboxRepository(db)
+
+    auth0_user_id, events = repo.claim_user(lease_seconds=60)
+    assert auth0_user_id == "auth0|a"
+    assert [event.payload for event in events] == [{"plan": "pro"}, {"pais": "CO"}]
+    leased = db.execute(text("SELECT bool_and(next_attempt_at > now()) FROM auth0_outbox")).scalar()
+    assert leased
+    # Mientras dura el lease nadie más los toma
+    assert repo.claim_user(lease_seconds=60) is None
+
+def test_new_events_wait_for_the_lease(pg_session):
+    db = pg_session
+    repo = Auth0OutboxRepository(db)
+    _enqueue(db, "auth0|a", plan="pro")
+    repo.claim_user(lease_seconds=60)
+    _enqueue(db, "auth0|a", plan="free")
+    _enqueue(db, "auth0|b", plan="pro")
+
+    # auth0|a tiene una llamada en curso: se toma solo a auth0|b
+    auth0_user_id, _ = repo.claim_user(lease_seconds=60)
+    assert auth0_user_id == "auth0|b"
+    assert repo.claim_user(lease_seconds=60) is None
+
+def test_expired_lease_is_claimed_again(pg_session):
+    db = pg_session
+    repo = Auth0OutboxRepository(db)
+    _enqueue(db, "auth0|a", plan="pro")
+    repo.claim_user(lease_seconds=60)
+    _enqueue(db, "auth0|a", plan="free")
+    # El worker murió: el lease vence
+    db.execute(text("UPDATE auth0_outbox SET next_attempt_at = now() - interval '1 second'"))
+
+    auth0_user_id, events = repo.claim_user(lease_seconds=60)
+    assert auth0_user_id == "auth0|a"
+    assert len(events) == 2
+
+def test_mark_sent_and_failed(pg_session):
+    db = pg_session
+    repo = Auth0OutboxRepository(db)
+    _enqueue(db, "auth0|a", plan="pro")
+    _enqueue(db, "auth0|b", plan="pro")
+    _, sent = repo.claim_user(lease_seconds=60)
+    _, failed = repo.claim_user(lease_seconds=60)
+
+    repo.mark_sent([event.id for event in sent])
+    repo.mark_failed([event.id for event in failed], "400 Bad Request", None)
+    rows = db.execute(text("SELECT auth0_user_id, status, attempts FROM auth0_outbox")).all()
+    assert [tuple(row) for row in rows] == [("auth0|b", "failed", 1)]
+
+# --- Worker: la llamada a Auth0 ocurre sin sesión abierta ---
+
+class FakeSession:
+    open = 0
+
+    def __init__(self):
+        FakeSession.open += 1
+        self.committed = False
+
+    def expunge_all(self):
+        pass
+
+    def commit(self):
+        self.committed = True
+
+    def close(self):
+        FakeSession.open -= 1
+
+class FakeOutboxRepository:
+    """Cola en memoria con la interfaz de Auth0OutboxRepository que usa el worker"""
+    events = []
+    log = []
+
+    def __init__(self, db):
+        self.db = db
+
+    def claim_user(self, lease_seconds):
+        FakeOutboxRepository.log.append(("claim", lease_seconds))
+        if not self.events:
+            return None
+        return self.events[0].auth0_user_id, list(self.events)
+
+    def mark_sent(self, event_ids):
+        FakeOutboxRepository.log.append(("sent", event_ids))
+        FakeOutboxRepository.events = [event for event in self.events if event.id not in event_ids]
+
+    def mark_failed(self, event_ids, error, retry_at):
+        FakeOutboxRepository.log.append(("failed", event_ids, retry_at is not None))
+        FakeOutboxRepository.events = [event for event in self.events if event.id not in event_ids]
+
+class FakeAuth0Client:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def update_user(self, auth0_user_id, payload):
+        self.calls.append((auth0_user_id, payload, FakeSession.open))
+        if self.error:
+            raise self.error
+
+@pytest.fixture
+def outbox(monkeypatch):
+    FakeSession.open = 0
+    FakeOutboxRepository.log = []
+    FakeOutboxRepository.events = [
+        SimpleNamespace(
+            id=i, auth0_user_id="auth0|a", operation="update_metadata", payload=payload,
+            attempts=0, created_at=datetime.now(timezone.utc)
+        )
+        for i, payload in enumerate([{"plan": "pro"}, {"pais": "CO"}], start=1)
+    ]
+    monkeypatch.setattr(auth0_sync, "SessionLocal", FakeSession)
+    monkeypatch.setattr(auth0_sync, "Auth0OutboxRepository", FakeOutboxRepository)
+    return FakeOutboxRepository
+
+def test_auth0_is_called_outside_any_session(outbox):
+    client = FakeAuth0Client()
+    assert Auth0SyncWorker(workers=0, client=client).process_one()
+
+    assert client.calls == [("auth0|a", {"user_metadata": {"plan": "pro", "pais": "CO"}}, 0)]
+    assert outbox.log == [("claim", auth0_sync.AUTH0_OUTBOX_LEASE_SECONDS), ("sent", [1, 2])]
+    assert FakeSession.open == 0
+
+@pytest.mark.parametrize("status_code, retried", [(503, True), (400, False)])
+def test_failed_call_is_recorded_in_its_own_session(outbox, status_code, retried):
+    response = requests.Response()
+    response.status_code = status_code
+    client = FakeAuth0Client(error=requests.HTTPError(response=response))
+
+    assert Auth0SyncWorker(workers=0, client=client).process_one()
+    assert client.calls[0][2] == 0
+    assert outbox.log[1] == ("failed", [1, 2], retried)
+    assert FakeSession.open == 0
+
+def test_empty_queue(outbox):
+    outbox.events = []
+    assert not Auth0SyncWorker(workers=0, client=FakeAuth0Client()).process_one()
@@ -0,0 +1,73 @@
+# tests/test_bulk_status.py
+import threading
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models import Order, SubOrder, User
+from src.models.stores import Store
+from src.repositories.order_repository import OrderRepository
+
+ORDERS = 4
+ROUNDS = 30
+
+def _seed(engine):
+    """Órdenes con dos sub-órdenes cada una; retorna (ids de órdenes, ids de sub-órdenes)"""
+    with Session(engine) as db:
+        user = User(external_id=uuid.uuid4(), email="comprador@lum.test")
+        db.add(user)
+        db.flush()
+        store = Store(external_id=uuid.uuid4(), owner_user_id=user.id, name="Tienda", slug="tienda")
+        db.add(store)
+        db.flush()
+        orders = [Order(external_id=uuid.uuid4(), user_id=user.id, total_amount_cop=2000) for _ in range(ORDERS)]
+        db.add_all(orders)
+        db.flush()
+        sub_orders = [
+            SubOrder(external_id=uuid.uuid4(), order_id=order.id, store_id=store.id, subtotal_cop=1000, seller_net_cop=900)
+            for order in orders for _ in range(2)
+        ]
+        db.add_all(sub_orders)
+        db.commit()
+        return [order.id for order in orders], [sub_order.id for sub_order in sub_orders]
+
+def test_concurrent_bulk_transitions_do_not_deadlock(pg_schema_engine):
+    order_ids, sub_order_ids = _seed(pg_schema_engine)
+    errors = []
+
+    def run(barrier, operation):
+        with Session(pg_schema_engine) as db:
+            barrier.wait()
+            try:
+                operation(OrderRepository(db))
+            except Exception as e:
+                errors.append(e)
+
+    for _ in range(ROUNDS):
+        with pg_schema_engine.begin() as connection:
+            connection.execute(text("UPDATE orders SET status = 'confirmed'"))
+            connection.execute(text("UPDATE sub_orders SET status = 'confirmed'"))
+
+        barrier = threading.Barrier(2)
+        threads = [
+            # IDs en orden opuesto: sin un orden de locks fijo, las dos se bloquean mutuamente
+            threading.Thread(target=run, args=(barrier, lambda repo: repo.bulk_update_order_status(order_ids, "processing"))),
+            threading.Thread(target=run, args=(
+                barrier, lambda repo: repo.bulk_update_sub_order_status(sub_order_ids[::-1], "cancelled")
+            )),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+
+def test_sub_order_transition_derives_order_status(pg_schema_engine):
+    order_ids, sub_order_ids = _seed(pg_schema_engine)
+    with Session(pg_schema_engine) as db:
+        result = OrderRepository(db).bulk_update_sub_order_status(sub_order_ids[:2], "cancelled")
+        assert result.updated == sub_order_ids[:2]
+        assert result.orders == [order_ids[0]]
+        assert db.get(Order, order_ids[0]).status == "cancelled"
@@ -0,0 +1,141 @@
+# tests/test_cache.py
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from src.models import User
+from src.models.stores import Store
+from src.repositories import store_repository
+from src.repositories.store_repository import StoreRepository
+from src.schemas.store import StoreOut, StoreUpdate
+from src.services import cache
+from src.services.cache import LocalCacheBackend, ReadThroughCache, TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+def _cache(backend, maxsize=10):
+    return ReadThroughCache(
+        "prueba", serialize=str, deserialize=str, maxsize=maxsize, local_ttl=5, shared_ttl=60, backend=backend
+    )
+
+def test_ttl_cache_evicts_least_recently_used():
+    local = TTLCache(maxsize=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1  # "b" queda como la menos usada
+    local.set("c", 3)
+
+    assert local.get("b") is None
+    assert (local.get("a"), local.get("c")) == (1, 3)
+    assert local.stats.snapshot()["evictions"] == 1
+
+def test_ttl_cache_expires_entries(clock):
+    local = TTLCache(maxsize=2, ttl=5)
+    local.set("a", 1)
+    clock.now += 4.9
+    assert local.get("a") == 1
+    clock.now += 0.1
+
+    assert local.get("a") is None
+    assert len(local) == 0
+    assert local.stats.snapshot()["expirations"] == 1
+
+def test_local_backend_expires_entries(clock):
+    backend = LocalCacheBackend()
+    backend.set("a", "1", ttl=60)
+    clock.now += 59
+    assert backend.get("a") == "1"
+    clock.now += 1
+    assert backend.get("a") is None
+
+def test_read_through_counts_local_and_shared_hits(clock):
+    backend = LocalCacheBackend()
+    worker, other_worker = _cache(backend), _cache(backend)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return "valor"
+
+    assert worker.get_or_load("k", loader) == "valor"
+    assert worker.get_or_load("k", loader) == "valor"
+    # Otro worker lo encuentra en el backend compartido sin ir a la base de datos
+    assert other_worker.get_or_load("k", loader) == "valor"
+
+    assert len(loads) == 1
+    assert worker.get_stats()["misses"] == 1
+    assert worker.get_stats()["local_hits"] == 1
+    assert other_worker.get_stats()["shared_hits"] == 1
+
+    # Invalidado en un worker, el otro lo vuelve a cargar cuando vence su copia local
+    worker.invalidate("k")
+    clock.now += 5
+    assert other_worker.get_or_load("k", loader) == "valor"
+    assert len(loads) == 2
+    assert worker.get_stats()["invalidations"] == 1
+
+def test_read_through_counts_evictions():
+    store_cache = _cache(LocalCacheBackend(), maxsize=1)
+    store_cache.get_or_load("a", lambda: "1")
+    store_cache.get_or_load("b", lambda: "2")
+
+    stats = store_cache.get_stats()
+    assert (stats["size"], stats["evictions"], stats["misses"]) == (1, 1, 2)
+    # "a" ya no está en proceso, pero sigue en el backend compartido
+    assert store_cache.get_or_load("a", lambda: "otro") == "1"
+    assert store_cache.get_stats()["shared_hits"] == 1
+
+@pytest.fixture
+def store_cache(monkeypatch):
+    store_cache = ReadThroughCache(
+        "stores", serialize=lambda store: store.model_dump_json(), deserialize=StoreOut.model_validate_json,
+        maxsize=10, local_ttl=30, shared_ttl=300, backend=LocalCacheBackend()
+    )
+    monkeypatch.setattr(store_repository, "store_cache", store_cache)
+    return store_cache
+
+@pytest.fixture
+def store(pg_session):
+    user = User(external_id=uuid.uuid4(), email="duena@lum.test")
+    pg_session.add(user)
+    pg_session.flush()
+    store = Store(external_id=uuid.uuid4(), owner_user_id=user.id, name="Tienda", slug="tienda")
+    pg_session.add(store)
+    pg_session.commit()
+    return store
+
+def test_update_store_invalidates_previous_slug(pg_session, store_cache, store):
+    repo = StoreRepository(pg_session)
+    assert repo.get_cached_store_by_slug("tienda").name == "Tienda"
+    assert repo.get_cached_store_by_external_id(str(store.external_id)).name == "Tienda"
+
+    repo.update_store(store.id, StoreUpdate(name="Nueva", slug="nueva"))
+
+    assert repo.get_cached_store_by_slug("tienda") is None
+    assert repo.get_cached_store_by_slug("nueva").name == "Nueva"
+    assert repo.get_cached_store_by_external_id(str(store.external_id)).name == "Nueva"
+    # Slug anterior, slug nuevo y external_id
+    assert store_cache.get_stats()["invalidations"] == 3
+
+def test_delete_store_invalidates_cache(pg_session, store_cache, store):
+    repo = StoreRepository(pg_session)
+    assert repo.get_cached_store_by_slug("tienda") is not None
+    assert repo.get_cached_store_by_external_id(str(store.external_id)) is not None
+
+    assert repo.delete_store(store.id) is True
+
+    assert repo.get_cached_store_by_slug("tienda") is None
+    assert repo.get_cached_store_by_external_id(str(store.external_id)) is None
+    assert store_cache.get_stats()["size"] == 0
@@ -0,0 +1,157 @@
+# tests/test_idempotency.py
+import asyncio
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from src.services import idempotency
+from src.services.idempotency import IdempotencyMiddleware
+
+class FakeIdempotencyRepository:
+    """Stand-in en memoria de IdempotencyRepository (sin Postgres)"""
+
+    def __init__(self):
+        self.records = {}
+        self.extensions = 0
+
+    def claim(self, key, method, path, request_hash, ttl, lock_timeout):
+        if key in self.records:
+            return False
+        self.records[key] = SimpleNamespace(
+            status="in_progress", request_hash=request_hash, response_status=None,
+            response_content_type=None, response_headers=None, response_body=None
+        )
+        return True
+
+    def extend(self, key, lock_timeout):
+        record = self.records.get(key)
+        if record is None or record.status != "in_progress":
+            return False
+        self.extensions += 1
+        return True
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def complete(self, key, response_status, content_type, headers, body):
+        record = self.records[key]
+        record.status = "completed"
+        record.response_status = response_status
+        record.response_content_type = content_type
+        record.response_headers = headers
+        record.response_body = body
+
+    def release(self, key):
+        self.records.pop(key, None)
+
+@pytest.fixture
+def client(monkeypatch):
+    repo = FakeIdempotencyRepository()
+
+    def with_fake_session(operation, *args):
+        # IdempotencyRepository.complete/release se redirigen al método del fake; _claim y
+        # _snapshot reciben el fake como repositorio
+        method = getattr(FakeIdempotencyRepository, operation.__name__, operation)
+        return method(repo, *args)
+
+    monkeypatch.setattr(idempotency, "_with_session", with_fake_session)
+    tokens = {"token-ana": "auth0|ana", "token-luis": "auth0|luis"}
+
+    def verify(token):
+        if token not in tokens:
+            raise jwt.InvalidTokenError("desconocido")
+        return {"sub": tokens[token]}
+
+    monkeypatch.setattr(idempotency.token_verifier, "verify", verify)
+
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, paths=["/things", "/other", "/slow"])
+    app.state.calls = 0
+
+    @app.post("/things", status_code=201)
+    @app.post("/other", status_code=201)
+    def create_thing(payload: dict, response: Response):
+        app.state.calls += 1
+        response.set_cookie("a", "1")
+        response.set_cookie("b", "2")
+        return {"n": app.state.calls, **payload}
+
+    @app.post("/slow", status_code=201)
+    def slow(payload: dict):
+        time.sleep(0.3)
+        return payload
+
+    client = TestClient(app)
+    client.app_state = app.state
+    client.repo = repo
+    return client
+
+def _post(client, path="/things", key="k1", token=None, body=None):
+    headers = {"Idempotency-Key": key}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return client.post(path, json=body or {"x": 1}, headers=headers)
+
+def test_repeated_headers_survive_first_response_and_replay(client):
+    first = _post(client)
+    replay = _post(client)
+
+    for response in (first, replay):
+        assert response.status_code == 201
+        assert response.json() == {"n": 1, "x": 1}
+        assert len(response.headers.get_list("set-cookie")) == 2
+    assert "idempotent-replayed" not in first.headers
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert client.app_state.calls == 1
+
+def test_key_is_scoped_by_user(client):
+    ana = _post(client, token="token-ana", body={"x": 1})
+    luis = _post(client, token="token-luis", body={"x": 2})
+
+    assert ana.status_code == luis.status_code == 201
+    assert luis.json() == {"n": 2, "x": 2}
+    assert _post(client, token="token-ana", body={"x": 1}).json() == {"n": 1, "x": 1}
+    assert client.app_state.calls == 2
+
+def test_key_is_scoped_by_path(client):
+    assert _post(client, path="/things").json()["n"] == 1
+    assert _post(client, path="/other").json()["n"] == 2
+
+def test_same_owner_and_key_with_other_body_is_rejected(client):
+    _post(client, token="token-ana", body={"x": 1})
+    assert _post(client, token="token-ana", body={"x": 3}).status_code == 422
+
+def test_lease_is_renewed_while_request_runs(client, monkeypatch):
+    monkeypatch.setattr(idempotency, "IDEMPOTENCY_LOCK_REFRESH_SECONDS", 0.05)
+
+    assert _post(client, path="/slow").status_code == 201
+    assert client.repo.extensions >= 2
+
+    # Completada la petición la reserva ya no se renueva
+    extensions = client.repo.extensions
+    time.sleep(0.2)
+    assert client.repo.extensions == extensions
+
+def test_cancelled_request_releases_key(client):
+    started = asyncio.Event()
+
+    async def call_next(request):
+        started.set()
+        await asyncio.Event().wait()
+
+    async def run():
+        middleware = IdempotencyMiddleware(None, paths=["/things"])
+        assert client.repo.claim("k", "POST", "/things", "hash", None, None)
+        task = asyncio.create_task(middleware._process(None, call_next, "k"))
+        await started.wait()
+        # El cliente se desconecta mientras el handler sigue en curso
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert client.repo.records == {}
@@ -0,0 +1,68 @@
+# tests/test_message_streams.py
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.v1 import orders as orders_api
+from src.main import app
+from src.models import Order, StoreUser, SubOrder, User
+from src.models.stores import Store
+from src.repositories.order_repository import OrderRepository
+from src.services.auth import get_current_user_id, get_stream_user_id
+
+@pytest.fixture
+def client():
+    # Sin `with`: no corre el lifespan (broker, verificación de esquema)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+@pytest.mark.parametrize("path", ["/api/v1/orders/messages/stream", "/api/v1/orders/1/messages/stream"])
+def test_streams_require_token(client, path):
+    assert client.get(path).status_code == 401
+
+def test_mark_messages_as_read_requires_token(client):
+    assert client.post("/api/v1/orders/1/messages/read", json={"up_to_id": 10}).status_code == 401
+
+def test_mark_messages_as_read_uses_token_user(client, monkeypatch):
+    app.dependency_overrides[get_current_user_id] = lambda: 7
+    calls = []
+    monkeypatch.setattr(OrderRepository, "mark_messages_as_read", lambda self, *args: calls.append(args) or 2)
+
+    # Un to_user_id en el cuerpo ya no decide de quién son los mensajes
+    response = client.post("/api/v1/orders/1/messages/read", json={"to_user_id": 99, "up_to_id": 10})
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2}
+    assert calls == [(1, 7, 10)]
+
+@pytest.mark.parametrize("participation, expected", [(None, 404), (False, 403)])
+def test_order_stream_only_for_participants(client, monkeypatch, participation, expected):
+    app.dependency_overrides[get_stream_user_id] = lambda: 7
+    calls = []
+    monkeypatch.setattr(orders_api, "_order_participation", lambda *args: calls.append(args) or participation)
+
+    assert client.get("/api/v1/orders/1/messages/stream").status_code == expected
+    assert calls == [(1, 7)]
+
+def test_order_participants(pg_session):
+    db = pg_session
+    buyer, owner, member, stranger = users = [
+        User(external_id=uuid.uuid4(), email=f"{name}@lum.test") for name in ("buyer", "owner", "member", "stranger")
+    ]
+    db.add_all(users)
+    db.flush()
+    store = Store(external_id=uuid.uuid4(), owner_user_id=owner.id, name="Tienda", slug="tienda")
+    db.add(store)
+    db.flush()
+    order = Order(external_id=uuid.uuid4(), user_id=buyer.id, total_amount_cop=1000)
+    db.add_all([order, StoreUser(store_id=store.id, user_id=member.id, role="staff")])
+    db.flush()
+    db.add(SubOrder(external_id=uuid.uuid4(), order_id=order.id, store_id=store.id, subtotal_cop=1000, seller_net_cop=900))
+    db.flush()
+
+    repo = OrderRepository(db)
+    assert repo.is_order_participant(order.id, buyer.id) is True
+    assert repo.is_order_participant(order.id, owner.id) is True
+    assert repo.is_order_participant(order.id, member.id) is True
+    assert repo.is_order_participant(order.id, stranger.id) is False
+    assert repo.is_order_participant(order.id + 1, buyer.id) is None
@@ -0,0 +1,78 @@
+# tests/test_order_import.py
+import asyncio
+import json
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine
+
+from src.services import order_import
+from src.services.order_import import OrderImporter, import_ndjson_stream
+
+# user_id que la base "rechaza" (como una llave foránea inexistente)
+BAD_USER_ID = 666
+
+def _line(user_id: int = 1) -> bytes:
+    return json.dumps({
+        "user_id": user_id,
+        "total_amount_cop": 1000,
+        "sub_orders": [{
+            "store_id": 1, "subtotal_cop": 1000, "seller_net_cop": 900,
+            "order_items": [{"product_id": 1, "title": "Producto", "unit_price_cop": 1000, "quantity": 1}],
+        }],
+    }).encode()
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Motor en memoria en lugar de Postgres; _copy_orders registra cada intento de carga"""
+    attempts = []
+
+    def copy_orders(self, connection, orders):
+        attempts.append([line for line, _ in orders])
+        if any(order.user_id == BAD_USER_ID for _, order in orders):
+            raise sqlite3.IntegrityError("violates foreign key constraint")
+
+    monkeypatch.setattr(order_import, "engine", create_engine("sqlite://"))
+    monkeypatch.setattr(OrderImporter, "_copy_orders", copy_orders)
+    return attempts
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+def _import(*chunks: bytes, chunk_size: int = 100):
+    return asyncio.run(import_ndjson_stream(_chunks(*chunks), chunk_size=chunk_size))
+
+def test_data_errors_are_isolated_by_bisection(loads):
+    report = _import(b"\n".join([_line(), _line(BAD_USER_ID), _line(), _line()]))
+    assert report.imported == 3
+    assert [(error.line, error.error) for error in report.errors] == [(2, "violates foreign key constraint")]
+
+def test_other_database_errors_are_not_bisected(loads, monkeypatch):
+    def copy_orders(self, connection, orders):
+        loads.append([line for line, _ in orders])
+        raise sqlite3.OperationalError("server closed the connection unexpectedly")
+
+    monkeypatch.setattr(OrderImporter, "_copy_orders", copy_orders)
+    with pytest.raises(sqlite3.OperationalError):
+        _import(b"\n".join([_line(), _line(), _line()]))
+    assert loads == [[1, 2, 3]]
+
+def test_oversized_line_is_reported_and_import_continues(loads, monkeypatch):
+    monkeypatch.setattr(order_import, "MAX_LINE_BYTES", 1024)
+    long_line = b'{"user_id": 1, "relleno": "' + b"x" * 2000 + b'"}'
+    # La línea larga llega repartida en varios chunks del cuerpo
+    report = _import(
+        _line() + b"\n" + long_line[:700], long_line[700:1400], long_line[1400:] + b"\n" + _line() + b"\n",
+        _line(), chunk_size=1
+    )
+    assert report.imported == 3
+    assert [error.line for error in report.errors] == [2]
+    assert "supera el máximo" in report.errors[0].error
+    assert loads == [[1], [3], [4]]
+
+def test_oversized_line_within_a_single_chunk(loads, monkeypatch):
+    monkeypatch.setattr(order_import, "MAX_LINE_BYTES", 1024)
+    report = _import(b"\n".join([_line(), b"{" + b" " * 2000 + b"}", _line()]))
+    assert report.imported == 2
+    assert [error.line for error in report.errors] == [2]
@@ -0,0 +1,85 @@
+# tests/test_order_loading.py
+import uuid
+
+import pytest
+
+from src.core.query_stats import QueryStats, current_query_stats
+from src.models import Order, OrderItem, OrderMessage, Product, SubOrder, User
+from src.models.stores import Store
+from src.repositories.order_repository import OrderRepository
+from src.schemas.order import OrderOut
+
+SUB_ORDERS = 2
+ITEMS_PER_SUB_ORDER = 5
+MESSAGES = 200
+
+@pytest.fixture
+def large_order(pg_session):
+    """Orden con 2 sub-órdenes, 10 items y 200 mensajes"""
+    db = pg_session
+    user = User(external_id=uuid.uuid4(), email="comprador@lum.test")
+    db.add(user)
+    db.flush()
+    store = Store(external_id=uuid.uuid4(), owner_user_id=user.id, name="Tienda", slug="tienda")
+    db.add(store)
+    db.flush()
+    product = Product(external_id="p-1", store_id=store.id, title="Producto", price_cop=1000)
+    order = Order(external_id=uuid.uuid4(), user_id=user.id, total_amount_cop=10000)
+    db.add_all([product, order])
+    db.flush()
+    for _ in range(SUB_ORDERS):
+        sub_order = SubOrder(
+            external_id=uuid.uuid4(), order_id=order.id, store_id=store.id,
+            subtotal_cop=5000, seller_net_cop=4500
+        )
+        db.add(sub_order)
+        db.flush()
+        db.add_all([
+            OrderItem(
+                sub_order_id=sub_order.id, product_id=product.id, title="Producto",
+                unit_price_cop=1000, quantity=1, total_price_cop=1000
+            )
+            for _ in range(ITEMS_PER_SUB_ORDER)
+        ])
+    db.add_all([
+        OrderMessage(order_id=order.id, from_user_id=user.id, to_user_id=user.id, body=f"mensaje {i}")
+        for i in range(MESSAGES)
+    ])
+    db.commit()
+    db.expunge_all()
+    return order
+
+def _load(db, order, loading):
+    # El SAVEPOINT de la sesión de prueba no cuenta como consulta de la ruta
+    db.connection()
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        loaded = OrderRepository(db, loading=loading).get_order_by_id(order.id)
+        OrderOut.model_validate(loaded)
+    finally:
+        current_query_stats.reset(token)
+    return loaded, stats
+
+def test_large_order_loads_without_cartesian_rows(pg_session, large_order):
+    loaded, stats = _load(pg_session, large_order, None)
+
+    assert len(loaded.sub_orders) == SUB_ORDERS
+    assert sum(len(sub_order.order_items) for sub_order in loaded.sub_orders) == SUB_ORDERS * ITEMS_PER_SUB_ORDER
+    # Orden, sub-órdenes e items: una consulta cada una, una fila por entidad
+    assert stats.statements == 3
+    assert stats.rows == 1 + SUB_ORDERS + SUB_ORDERS * ITEMS_PER_SUB_ORDER
+
+def test_response_does_not_load_messages_or_user(pg_session, large_order):
+    loaded, stats = _load(pg_session, large_order, None)
+
+    assert "order_messages" not in loaded.__dict__
+    assert "user" not in loaded.__dict__
+    assert not any("order_messages" in shape or "FROM users" in shape for shape in stats.shapes)
+
+@pytest.mark.parametrize("strategy", ["selectin", "subquery", "joined"])
+def test_loading_strategy_is_configurable(pg_session, large_order, strategy):
+    loaded, stats = _load(pg_session, large_order, {"sub_orders": strategy, "order_items": strategy})
+
+    assert sum(len(sub_order.order_items) for sub_order in loaded.sub_orders) == SUB_ORDERS * ITEMS_PER_SUB_ORDER
+    assert stats.rows <= 1 + SUB_ORDERS + SUB_ORDERS * ITEMS_PER_SUB_ORDER
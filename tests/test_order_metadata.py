@@ -0,0 +1,45 @@
+# tests/test_order_metadata.py
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from src.models import Order, Product, User
+from src.models.stores import Store
+from src.repositories.order_repository import OrderRepository
+from src.schemas.order import OrderCreate
+
+def test_order_metadata_maps_to_metadata_column():
+    # El esquema real (migrations/sql/0001_baseline.sql) llama a la columna `metadata`
+    assert Order.__table__.c["metadata"] is Order.order_metadata.property.columns[0]
+
+@pytest.fixture
+def buyer_and_product(pg_session):
+    db = pg_session
+    user = User(external_id=uuid.uuid4(), email="comprador@lum.test")
+    db.add(user)
+    db.flush()
+    store = Store(external_id=uuid.uuid4(), owner_user_id=user.id, name="Tienda", slug="tienda")
+    db.add(store)
+    db.flush()
+    product = Product(external_id="p-1", store_id=store.id, title="Producto", price_cop=1000)
+    db.add(product)
+    db.flush()
+    return user, store, product
+
+def _order_create(user, store, product) -> OrderCreate:
+    return OrderCreate(
+        user_id=user.id, total_amount_cop=1000, order_metadata={"canal": "app"},
+        sub_orders=[{
+            "store_id": store.id, "subtotal_cop": 1000, "seller_net_cop": 900,
+            "order_items": [{"product_id": product.id, "title": "Producto", "unit_price_cop": 1000, "quantity": 1}],
+        }]
+    )
+
+@pytest.mark.parametrize("create", ["create_order", "create_order_bulk"])
+def test_created_order_stores_metadata(pg_session, buyer_and_product, create):
+    order = getattr(OrderRepository(pg_session), create)(_order_create(*buyer_and_product))
+
+    assert order.order_metadata == {"canal": "app"}
+    stored = pg_session.execute(text("SELECT metadata FROM orders WHERE id = :id"), {"id": order.id}).scalar_one()
+    assert stored == {"canal": "app"}
@@ -0,0 +1,83 @@
+# tests/test_order_permissions.py
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.v1 import orders as orders_api
+from src.db import get_db
+from src.main import app
+from src.repositories.order_repository import OrderRepository
+from src.schemas.order import BulkStatusOut, OrderImportReport
+from src.services import auth
+
+# (método, ruta, cuerpo, permiso) de cada endpoint masivo protegido
+ENDPOINTS = {
+    "import": ("post", "/api/v1/orders/import", {"content": b"{}\n"}, auth.ORDERS_IMPORT_PERMISSION),
+    "bulk-status": (
+        "post", "/api/v1/orders/bulk-status",
+        {"json": {"ids": [1], "status": "cancelled"}}, auth.ORDERS_BULK_STATUS_PERMISSION
+    ),
+    "sub-orders-bulk-status": (
+        "post", "/api/v1/orders/sub-orders/bulk-status",
+        {"json": {"ids": [1], "status": "cancelled"}}, auth.ORDERS_BULK_STATUS_PERMISSION
+    ),
+    "export": ("get", "/api/v1/orders/export", {"params": {"format": "csv"}}, auth.ORDERS_EXPORT_PERMISSION),
+}
+
+@pytest.fixture
+def client(monkeypatch, fake_tokens):
+    fake_tokens["sin-permisos"] = {"sub": "auth0|1", "scope": "openid profile"}
+    for name, (_, _, _, permission) in ENDPOINTS.items():
+        fake_tokens[name] = {"sub": "auth0|2", "permissions": [permission]}
+
+    calls = []
+
+    async def fake_import(stream):
+        calls.append("import")
+        return OrderImportReport(imported=1)
+
+    def fake_bulk_status(name):
+        def update(self, ids, status):
+            calls.append(name)
+            return BulkStatusOut(status=status, updated=ids)
+        return update
+
+    def fake_export(export_format, **filters):
+        calls.append("export")
+        yield b"order_id\n"
+
+    monkeypatch.setattr(orders_api, "import_ndjson_stream", fake_import)
+    monkeypatch.setattr(orders_api, "export_orders", fake_export)
+    monkeypatch.setattr(OrderRepository, "bulk_update_order_status", fake_bulk_status("bulk-status"))
+    monkeypatch.setattr(
+        OrderRepository, "bulk_update_sub_order_status", fake_bulk_status("sub-orders-bulk-status")
+    )
+    app.dependency_overrides[get_db] = lambda: None
+    client = TestClient(app)
+    client.calls = calls
+    yield client
+    app.dependency_overrides.clear()
+
+def _call(client, endpoint, token=None):
+    method, path, body, _ = ENDPOINTS[endpoint]
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return client.request(method, path, headers=headers, **body)
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_bulk_endpoint_requires_token(client, endpoint):
+    assert _call(client, endpoint).status_code == 401
+    assert _call(client, endpoint, "falso").status_code == 401
+    assert client.calls == []
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_bulk_endpoint_requires_its_permission(client, endpoint):
+    assert _call(client, endpoint, "sin-permisos").status_code == 403
+    # El permiso de otro endpoint masivo no basta
+    for other, (_, _, _, permission) in ENDPOINTS.items():
+        if permission != ENDPOINTS[endpoint][3]:
+            assert _call(client, endpoint, other).status_code == 403
+    assert client.calls == []
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_bulk_endpoint_with_permission(client, endpoint):
+    assert _call(client, endpoint, endpoint).status_code == 200
+    assert client.calls == [endpoint]
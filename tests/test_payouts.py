@@ -0,0 +1,47 @@
+# tests/test_payouts.py
+import uuid
+
+from sqlalchemy import select
+
+from src.models import Order, SubOrder, User
+from src.models.payout import Payout
+from src.models.refund import Refund
+from src.models.stores import Store
+from src.repositories.payout_repository import PayoutRepository
+
+def _order(db, user, store, sub_orders, refunded_cop):
+    """Orden entregada con sub-órdenes (subtotal_cop, seller_net_cop) y un reembolso"""
+    order = Order(external_id=uuid.uuid4(), user_id=user.id, total_amount_cop=0, status="delivered")
+    db.add(order)
+    db.flush()
+    rows = [
+        SubOrder(
+            external_id=uuid.uuid4(), order_id=order.id, store_id=store.id,
+            subtotal_cop=subtotal_cop, seller_net_cop=seller_net_cop, status="delivered"
+        )
+        for subtotal_cop, seller_net_cop in sub_orders
+    ]
+    db.add_all(rows)
+    db.add(Refund(external_id=uuid.uuid4(), order_id=order.id, amount_cop=refunded_cop, status="processed"))
+    db.flush()
+    return [row.id for row in rows]
+
+def test_run_payouts_prorates_refunds_and_tolerates_zero_subtotals(pg_session):
+    db = pg_session
+    user = User(external_id=uuid.uuid4(), email="vendedor@lum.test")
+    db.add(user)
+    db.flush()
+    store = Store(external_id=uuid.uuid4(), owner_user_id=user.id, name="Tienda", slug="tienda")
+    db.add(store)
+    db.flush()
+    # Sub-órdenes sin subtotal (p. ej. solo envío): el reembolso no se puede prorratear
+    free = _order(db, user, store, [(0, 500), (0, 300)], refunded_cop=100)
+    prorated = _order(db, user, store, [(1000, 900), (3000, 2700)], refunded_cop=400)
+    db.commit()
+
+    summary = PayoutRepository(db).run_payouts(batch_size=1)
+
+    amounts = dict(db.execute(select(Payout.sub_order_id, Payout.amount_cop)).all())
+    assert amounts == {free[0]: 500, free[1]: 300, prorated[0]: 800, prorated[1]: 2400}
+    assert summary.payouts == 4
+    assert summary.amount_cop == 4000
@@ -0,0 +1,50 @@
+# tests/test_product_search.py
+import re
+import uuid
+from pathlib import Path
+
+from sqlalchemy import text
+
+from src.jobs.check_search_index import SEARCH_INDEX, search_plan
+from src.models import User
+from src.models.product import Product
+from src.models.stores import Store
+from src.repositories.product_repository import ProductRepository
+
+BASELINE_SQL = Path(__file__).resolve().parent.parent / "migrations" / "sql" / "0001_baseline.sql"
+
+def _baseline_index_definition() -> str:
+    """Definición de products_to_tsvector_idx en el esquema real, desde USING"""
+    match = re.search(rf"CREATE INDEX {SEARCH_INDEX} ON public\.products (USING .+);", BASELINE_SQL.read_text())
+    return match.group(1)
+
+def test_model_index_matches_production(pg_session):
+    definition = pg_session.execute(
+        text("SELECT pg_get_indexdef(to_regclass(:name))"), {"name": SEARCH_INDEX}
+    ).scalar_one()
+    assert definition.endswith(_baseline_index_definition())
+
+def test_search_uses_gin_index(pg_session):
+    plan = search_plan(pg_session, "zapatos de cuero")
+    assert SEARCH_INDEX in plan, plan
+
+def test_search_finds_products_without_description(pg_session):
+    db = pg_session
+    owner = User(external_id=uuid.uuid4(), email="owner@lum.test")
+    db.add(owner)
+    db.flush()
+    store = Store(external_id=uuid.uuid4(), owner_user_id=owner.id, name="Tienda", slug="tienda")
+    db.add(store)
+    db.flush()
+    db.add_all([
+        Product(external_id=str(uuid.uuid4()), store_id=store.id, title="Zapatos de cuero", price_cop=1000, is_published=True),
+        Product(
+            external_id=str(uuid.uuid4()), store_id=store.id, title="Bolso", description="Cuero curtido",
+            price_cop=2000, is_published=True
+        ),
+        Product(external_id=str(uuid.uuid4()), store_id=store.id, title="Camisa", price_cop=3000, is_published=True),
+    ])
+    db.flush()
+
+    results = ProductRepository(db).search_products("cuero")
+    assert sorted(result["title"] for result in results) == ["Bolso", "Zapatos de cuero"]
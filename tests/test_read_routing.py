@@ -0,0 +1,132 @@
+# tests/test_read_routing.py
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from src import db as db_module
+from src.core.replicas import Replica, ReplicaSet
+from src.db import STICKY_PRIMARY_COOKIE, get_db, get_read_db
+from src.services import read_routing
+from src.services.read_routing import ReadYourWritesMiddleware
+
+def _tagged_engine(name: str, served: list, url: str = "sqlite://"):
+    """Motor de reemplazo que anota su nombre en `served` por cada sentencia ejecutada"""
+    engine = create_engine(url)
+    event.listen(engine, "before_cursor_execute", lambda *args: served.append(name))
+    return engine
+
+@pytest.fixture
+def served():
+    return []
+
+@pytest.fixture
+def replicas(served, monkeypatch):
+    """Primario y dos réplicas de reemplazo (SQLite en memoria), cada uno etiquetado"""
+    replica_set = ReplicaSet(
+        [Replica(name, _tagged_engine(name, served)) for name in ("replica0", "replica1")],
+        max_lag=2, check_interval=0
+    )
+    monkeypatch.setattr(db_module, "replica_set", replica_set)
+    monkeypatch.setattr(read_routing, "replica_set", replica_set)
+    monkeypatch.setattr(db_module, "SessionLocal", sessionmaker(bind=_tagged_engine("primary", served)))
+    return replica_set
+
+@pytest.fixture
+def client(replicas):
+    app = FastAPI()
+
+    @app.get("/read")
+    def read(db: Session = Depends(get_read_db)):
+        db.execute(text("SELECT 1"))
+        return {}
+
+    @app.post("/write")
+    def write(db: Session = Depends(get_db)):
+        db.execute(text("SELECT 1"))
+        return {}
+
+    @app.post("/batch")
+    def batch(db: Session = Depends(get_read_db)):
+        db.execute(text("SELECT 1"))
+        return {}
+
+    return TestClient(ReadYourWritesMiddleware(app, read_only_paths=["/batch"], window=5))
+
+def test_reads_rotate_between_replicas(client, served):
+    for _ in range(4):
+        client.get("/read")
+    assert served == ["replica0", "replica1", "replica0", "replica1"]
+
+def test_writes_use_primary(client, served):
+    client.post("/write")
+    assert served == ["primary"]
+
+def test_reads_after_a_write_use_primary(client, served):
+    response = client.post("/write")
+    assert STICKY_PRIMARY_COOKIE in response.cookies
+    client.get("/read")
+    client.get("/read")
+    assert served == ["primary", "primary", "primary"]
+
+def test_expired_sticky_cookie_goes_back_to_replicas(client, served):
+    client.cookies.set(STICKY_PRIMARY_COOKIE, f"{time.time() - 1:.3f}")
+    client.get("/read")
+    assert served == ["replica0"]
+
+def test_malformed_sticky_cookie_is_ignored(client, served):
+    client.cookies.set(STICKY_PRIMARY_COOKIE, "manana")
+    client.get("/read")
+    assert served == ["replica0"]
+
+def test_read_only_posts_do_not_stick(client, served):
+    response = client.post("/batch")
+    assert STICKY_PRIMARY_COOKIE not in response.cookies
+    client.get("/read")
+    assert served == ["replica0", "replica1"]
+
+def test_failed_replica_is_evicted(client, replicas, served, tmp_path):
+    # Una réplica que no acepta conexiones
+    down = replicas.replicas[0]
+    down.engine = _tagged_engine(down.name, served, f"sqlite:///{tmp_path}/no-existe/db.sqlite")
+
+    for _ in range(3):
+        assert client.get("/read").status_code == 200
+    assert served == ["replica1", "replica1", "replica1"]
+    assert not down.healthy
+    assert down.evictions == 1
+    assert [replica["sessions"] for replica in replicas.get_stats()] == [0, 3]
+
+def test_no_healthy_replicas_falls_back_to_primary(client, replicas, served):
+    for replica in replicas.replicas:
+        replicas.mark_down(replica, "caída")
+    client.get("/read")
+    assert served == ["primary"]
+
+def test_without_replicas_reads_use_primary(client, monkeypatch, served):
+    empty = ReplicaSet([], max_lag=2, check_interval=0)
+    monkeypatch.setattr(db_module, "replica_set", empty)
+    monkeypatch.setattr(read_routing, "replica_set", empty)
+    response = client.post("/write")
+    client.get("/read")
+    assert STICKY_PRIMARY_COOKIE not in response.cookies
+    assert served == ["primary", "primary"]
+
+def test_health_check_readmits_replica(pg_engine):
+    # El primario no está en recuperación: retraso 0
+    replica = Replica("replica0", pg_engine)
+    replica_set = ReplicaSet([replica], max_lag=2, check_interval=0)
+    replica_set.mark_down(replica, "caída")
+
+    assert replica_set.check(replica)
+    assert replica.healthy and replica.lag_seconds == 0
+
+def test_health_check_evicts_unreachable_replica(tmp_path):
+    replica = Replica("replica0", create_engine(f"sqlite:///{tmp_path}/no-existe/db.sqlite"))
+    replica_set = ReplicaSet([replica], max_lag=2, check_interval=0)
+
+    assert not replica_set.check(replica)
+    assert not replica.healthy and replica.last_error
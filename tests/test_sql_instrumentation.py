@@ -0,0 +1,66 @@
+# tests/test_sql_instrumentation.py
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src.core.config import settings
+from src.services.sql_instrumentation import SERVER_TIMING_HEADER, SQLInstrumentationMiddleware
+
+STATEMENTS = 5
+
+def _app(mode: str) -> FastAPI:
+    # Los listeners van sobre la clase Engine: un SQLite en memoria también se cuenta
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware, mode=mode, repeated_threshold=3)
+
+    @app.get("/chatty")
+    def chatty():
+        # Misma forma de sentencia con distintos parámetros, como un N+1
+        with engine.connect() as connection:
+            return [connection.execute(text("SELECT :n"), {"n": n}).scalar() for n in range(STATEMENTS)]
+
+    return app
+
+@pytest.fixture
+def budgets(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_ROUTE_QUERY_BUDGETS", {"chatty": STATEMENTS - 1})
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET", 0)
+
+def test_strict_mode_rejects_route_over_budget(budgets):
+    response = TestClient(_app("strict")).get("/chatty")
+
+    assert response.status_code == 500
+    body = response.json()
+    assert body["detail"] == f"La petición ejecutó {STATEMENTS} sentencias SQL (presupuesto: {STATEMENTS - 1})"
+    assert body["sql"]["statements"] == STATEMENTS
+    assert body["sql"]["repeated"][0]["statement"] == "SELECT ?"
+    assert body["sql"]["repeated"][0]["count"] == STATEMENTS
+
+def test_strict_mode_allows_route_within_budget(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_ROUTE_QUERY_BUDGETS", {"chatty": STATEMENTS})
+    response = TestClient(_app("strict")).get("/chatty")
+
+    assert response.status_code == 200
+    assert response.json() == list(range(STATEMENTS))
+
+def test_warn_mode_reports_timing_and_repeated_statements(budgets, caplog):
+    with caplog.at_level(logging.INFO, logger="src.services.sql_instrumentation"):
+        response = TestClient(_app("warn")).get("/chatty")
+
+    assert response.status_code == 200
+    timing = response.headers[SERVER_TIMING_HEADER]
+    assert timing.startswith("db;dur=")
+    assert f'desc="sentencias: {STATEMENTS}, filas: ' in timing
+    assert ", app;dur=" in timing
+
+    [record] = caplog.records
+    assert record.levelno == logging.WARNING
+    summary = json.loads(record.getMessage().removeprefix("sql "))
+    assert summary["route"] == "chatty"
+    assert summary["over_budget"] is True
+    assert [(shape["statement"], shape["count"]) for shape in summary["repeated"]] == [("SELECT ?", STATEMENTS)]
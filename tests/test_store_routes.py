@@ -0,0 +1,42 @@
+# tests/test_store_routes.py
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.db import get_db, get_read_db
+from src.main import app
+from src.repositories.product_repository import ProductRepository
+from src.repositories.sales_rollup_repository import SalesRollupRepository
+from src.repositories.store_repository import StoreRepository
+from src.schemas.store import StoreOut
+
+@pytest.fixture
+def client(monkeypatch):
+    def store_by_slug(self, slug):
+        now = datetime.now(timezone.utc)
+        return StoreOut(
+            id=1, external_id=uuid.uuid4(), owner_user_id=1, name="Tienda", slug=slug,
+            created_at=now, updated_at=now
+        )
+
+    monkeypatch.setattr(StoreRepository, "get_cached_store_by_slug", store_by_slug)
+    monkeypatch.setattr(ProductRepository, "get_store_products", lambda self, store_id, **kwargs: [])
+    monkeypatch.setattr(SalesRollupRepository, "get_sales", lambda self, *args: [])
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_read_db] = lambda: None
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+@pytest.mark.parametrize("slug", ["products", "sales"])
+def test_slug_named_like_a_store_subresource(client, slug):
+    response = client.get(f"/api/v1/stores/slug/{slug}")
+    assert response.status_code == 200
+    assert response.json()["slug"] == slug
+
+@pytest.mark.parametrize("path", ["/api/v1/stores/1/products", "/api/v1/stores/1/sales"])
+def test_store_subresources_still_resolve(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.json() == []
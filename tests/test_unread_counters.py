@@ -0,0 +1,93 @@
+# tests/test_unread_counters.py
+import threading
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models import Order, OrderMessage, User
+from src.repositories.unread_counter_repository import UnreadCounterRepository
+
+def test_reconcile_rebuilds_counters_from_messages(pg_session):
+    db = pg_session
+    buyer, seller = users = [User(external_id=uuid.uuid4(), email=f"{name}@lum.test") for name in ("buyer", "seller")]
+    db.add_all(users)
+    db.flush()
+    orders = [Order(external_id=uuid.uuid4(), user_id=buyer.id, total_amount_cop=1000) for _ in range(2)]
+    db.add_all(orders)
+    db.flush()
+    db.add_all(
+        [OrderMessage(order_id=orders[0].id, from_user_id=seller.id, to_user_id=buyer.id, body="hola") for _ in range(3)]
+        + [OrderMessage(order_id=orders[1].id, from_user_id=seller.id, to_user_id=buyer.id, body="leído", is_read=True)]
+    )
+    repo = UnreadCounterRepository(db)
+    # Contadores desfasados: uno de más en la orden 2 y uno de un usuario sin mensajes
+    repo.increment(buyer.id, orders[1].id, 5)
+    repo.increment(seller.id, orders[0].id)
+    db.commit()
+
+    assert repo.reconcile(batch_size=1) == 2
+
+    assert repo.get_total(buyer.id) == 3
+    assert repo.get_by_order(buyer.id) == {orders[0].id: 3}
+    assert repo.get_total(seller.id) == 0
+    assert repo.get_by_order(seller.id) == {}
+
+def _wait_for_lock_wait(engine, timeout: float = 10.0):
+    """Esperar a que alguna conexión quede bloqueada esperando un lock"""
+    deadline = time.monotonic() + timeout
+    with engine.connect() as connection:
+        while time.monotonic() < deadline:
+            waiting = connection.execute(
+                text("SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock'")
+            ).scalar()
+            if waiting:
+                return
+            connection.rollback()
+            time.sleep(0.05)
+    raise AssertionError("ninguna conexión quedó esperando un lock")
+
+def test_reconcile_tolerates_concurrent_increment_of_missing_counter(pg_schema_engine):
+    with Session(pg_schema_engine) as db:
+        buyer, seller = users = [User(external_id=uuid.uuid4(), email=f"{name}@lum.test") for name in ("buyer", "seller")]
+        db.add_all(users)
+        db.flush()
+        order = Order(external_id=uuid.uuid4(), user_id=buyer.id, total_amount_cop=1000)
+        db.add(order)
+        db.flush()
+        # Mensajes sin contadores, como en la primera corrida después del deploy
+        db.add(OrderMessage(order_id=order.id, from_user_id=seller.id, to_user_id=buyer.id, body="hola"))
+        db.commit()
+        buyer_id, seller_id, order_id = buyer.id, seller.id, order.id
+
+    with Session(pg_schema_engine) as writer:
+        # Un mensaje nuevo crea los contadores del comprador sin confirmar todavía
+        writer.add(OrderMessage(order_id=order_id, from_user_id=seller_id, to_user_id=buyer_id, body="otro"))
+        UnreadCounterRepository(writer).increment(buyer_id, order_id)
+        writer.flush()
+
+        errors = []
+
+        def run_reconcile():
+            with Session(pg_schema_engine) as db:
+                try:
+                    UnreadCounterRepository(db).reconcile()
+                except Exception as e:
+                    errors.append(e)
+
+        thread = threading.Thread(target=run_reconcile)
+        thread.start()
+        # El INSERT de reconcile espera la fila sin confirmar; al confirmarla hay conflicto
+        _wait_for_lock_wait(pg_schema_engine)
+        writer.commit()
+        thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert errors == []
+
+    with Session(pg_schema_engine) as db:
+        repo = UnreadCounterRepository(db)
+        repo.reconcile()
+        assert repo.get_total(buyer_id) == 2
+        assert repo.get_by_order(buyer_id) == {order_id: 2}